@@ -0,0 +1,264 @@
+"""
+Bulk update EDS Excel sheet in place from a CSV or JSON mapping of hostname to field updates
+
+Cells are edited with openpyxl on the existing workbook, so every other sheet,
+the formatting and the column widths are kept. All updates are applied in one
+pass over the hostname column and the workbook is saved once.
+
+Update file formats:
+    CSV:  a 'Server Name' (or 'hostname') column plus one column per EDS field;
+          empty cells leave the field unchanged
+    JSON: {"hostname": {"IP Assignment": "10.0.0.1", ...}, ...}
+          or a list of objects with a 'Server Name' (or 'hostname') key;
+          null clears the field
+
+Usage:
+    python eds_bulk_update.py updates.csv
+    python eds_bulk_update.py updates.json --eds-file EDS_Itential_DRAFT_v0.01.xlsx --add-missing --dry-run
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+
+# Set UTF-8 encoding for Windows console
+if os.name == 'nt' and __name__ == "__main__":
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
+
+# Configuration
+EDS_FILE = "EDS_Itential_DRAFT_v0.01.xlsx"
+SHEET_NAME = "Server Requirements"
+HOSTNAME_COLUMN = "Server Name"
+HOSTNAME_ALIASES = [HOSTNAME_COLUMN, 'hostname', 'Hostname']
+
+INTEGER_PATTERN = re.compile(r'^-?(0|[1-9]\d*)$')
+FLOAT_PATTERN = re.compile(r'^-?\d+\.\d+$')
+
+
+def normalize_hostname(hostname):
+    """Normalize a hostname the same way EDSLookup does (trimmed, case-insensitive)"""
+    return str(hostname).strip().lower()
+
+
+def coerce_value(value):
+    """Convert numeric strings from CSV files to numbers so Excel keeps numeric cells numeric"""
+    if not isinstance(value, str):
+        return value
+    text = value.strip()
+    if INTEGER_PATTERN.match(text):
+        return int(text)
+    if FLOAT_PATTERN.match(text):
+        return float(text)
+    return value
+
+
+def load_updates(path):
+    """
+    Read a CSV or JSON update file
+
+    Args:
+        path: Path to a .csv or .json file
+
+    Returns:
+        dict: Hostname -> {column: new value}, in file order
+    """
+    if path.lower().endswith('.json'):
+        with open(path, encoding='utf-8') as f:
+            content = json.load(f)
+        records = content.items() if isinstance(content, dict) else [(None, record) for record in content]
+
+        updates = {}
+        for hostname, fields in records:
+            fields = dict(fields)
+            if hostname is None:
+                hostname = _pop_hostname(fields)
+            if not hostname:
+                raise ValueError(f"Update without a hostname in {path}: {fields}")
+            updates.setdefault(str(hostname).strip(), {}).update(fields)
+        return updates
+
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.DictReader(f)
+        updates = {}
+        for line_number, record in enumerate(reader, start=2):
+            hostname = _pop_hostname(record)
+            if not hostname:
+                raise ValueError(f"Row {line_number} of {path} has no hostname")
+            fields = {col: coerce_value(value) for col, value in record.items() if value not in (None, '')}
+            updates.setdefault(hostname, {}).update(fields)
+        return updates
+
+
+def _pop_hostname(record):
+    """Remove and return the hostname field of an update record"""
+    for alias in HOSTNAME_ALIASES:
+        if alias in record:
+            value = record.pop(alias)
+            return str(value).strip() if value is not None else None
+    return None
+
+
+def apply_updates(eds_file, updates, sheet_name=SHEET_NAME, add_missing=False, new_row_defaults=None,
+                  output_file=None, dry_run=False, backup=False):
+    """
+    Apply hostname -> field updates to an EDS workbook in place
+
+    Args:
+        eds_file: Path to the EDS workbook
+        updates: Dict of hostname -> {column: new value}
+        sheet_name: Sheet holding the hosts (default: Server Requirements)
+        add_missing: Append a row for hostnames not in the sheet instead of reporting them
+        new_row_defaults: Extra fields for appended rows; updates take precedence
+        output_file: Save to this path instead of overwriting eds_file, even when nothing changed
+        dry_run: Compute the changes without saving
+        backup: Copy the original workbook to <eds_file>.bak before saving
+
+    Returns:
+        dict: Summary with updated_hosts, changed_cells, added_hosts, missing_hosts and changes
+    """
+    from openpyxl import load_workbook
+
+    if not os.path.exists(eds_file):
+        raise FileNotFoundError(f"EDS file not found: {eds_file}")
+
+    workbook = load_workbook(eds_file)
+    if sheet_name not in workbook.sheetnames:
+        raise ValueError(f"Sheet '{sheet_name}' not found in {eds_file}")
+    worksheet = workbook[sheet_name]
+
+    header = next(worksheet.iter_rows(min_row=1, max_row=1, values_only=True), ())
+    columns = {str(name).strip(): position + 1 for position, name in enumerate(header) if name is not None}
+    if HOSTNAME_COLUMN not in columns:
+        raise ValueError(f"'{HOSTNAME_COLUMN}' column not found in sheet '{sheet_name}'")
+
+    requested = {col for fields in updates.values() for col in fields}
+    requested.update(new_row_defaults or {})
+    unknown = sorted(col for col in requested if col not in columns)
+    if unknown:
+        raise ValueError(f"Unknown EDS column(s): {', '.join(unknown)}")
+
+    # One pass over the hostname column; the first row of a host holds its host fields
+    hostname_col = columns[HOSTNAME_COLUMN]
+    host_rows = {}
+    name_cells = worksheet.iter_rows(min_row=2, min_col=hostname_col, max_col=hostname_col, values_only=True)
+    for row_number, (name,) in enumerate(name_cells, start=2):
+        if name is not None and str(name).strip():
+            host_rows.setdefault(normalize_hostname(name), row_number)
+
+    summary = {'updated_hosts': [], 'changed_cells': 0, 'added_hosts': [], 'missing_hosts': [], 'changes': []}
+    next_row = None
+
+    for hostname, fields in updates.items():
+        row_number = host_rows.get(normalize_hostname(hostname))
+
+        if row_number is None:
+            if not add_missing:
+                summary['missing_hosts'].append(hostname)
+                continue
+            if next_row is None:
+                next_row = _last_data_row(worksheet) + 1
+            row_number = next_row
+            next_row += 1
+            fields = {**(new_row_defaults or {}), HOSTNAME_COLUMN: hostname, **fields}
+            host_rows[normalize_hostname(hostname)] = row_number
+            summary['added_hosts'].append(hostname)
+
+        changed = False
+        for col, value in fields.items():
+            cell = worksheet.cell(row=row_number, column=columns[col])
+            if cell.value == value:
+                continue
+            summary['changes'].append({
+                'hostname': hostname, 'row': row_number, 'column': col, 'old': cell.value, 'new': value
+            })
+            cell.value = value
+            summary['changed_cells'] += 1
+            changed = True
+        if changed and hostname not in summary['added_hosts']:
+            summary['updated_hosts'].append(hostname)
+
+    # An in-place run without changes leaves the EDS untouched; an --output run always writes its file
+    if not dry_run and (summary['changed_cells'] or output_file):
+        target = output_file or eds_file
+        if backup and os.path.exists(target):
+            shutil.copy2(target, f"{target}.bak")
+        if summary['changed_cells']:
+            _save_atomically(workbook, target)
+        elif os.path.abspath(target) != os.path.abspath(eds_file):
+            shutil.copy2(eds_file, target)
+    workbook.close()
+    return summary
+
+
+def _last_data_row(worksheet):
+    """Return the last row holding a value, ignoring formatting-only rows at the end of the sheet"""
+    for row_number in range(worksheet.max_row, 1, -1):
+        if any(cell.value not in (None, '') for cell in worksheet[row_number]):
+            return row_number
+    return 1
+
+
+def _save_atomically(workbook, target):
+    """Save next to the target and swap it in, so an interrupted save never truncates the EDS"""
+    directory = os.path.dirname(os.path.abspath(target))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.xlsx')
+    os.close(fd)
+    try:
+        workbook.save(tmp_path)
+        os.replace(tmp_path, target)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def print_summary(summary, dry_run=False):
+    """Print the result of apply_updates"""
+    for change in summary['changes'][:50]:
+        print(f"   {change['hostname']} (row {change['row']}) {change['column']}: {change['old']} -> {change['new']}")
+    if len(summary['changes']) > 50:
+        print(f"   ... {len(summary['changes']) - 50} more changes")
+
+    action = "Would update" if dry_run else "Updated"
+    print(f"✅ {action} {len(summary['updated_hosts'])} host(s), "
+          f"{summary['changed_cells']} cell(s), added {len(summary['added_hosts'])} host(s)")
+    if summary['missing_hosts']:
+        print(f"⚠️  {len(summary['missing_hosts'])} hostname(s) not found: {', '.join(summary['missing_hosts'][:20])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk update EDS hosts in place from a CSV or JSON file')
+    parser.add_argument('updates', help='CSV or JSON file mapping hostnames to field updates')
+    parser.add_argument('--eds-file', default=EDS_FILE, help=f"EDS workbook (default: {EDS_FILE})")
+    parser.add_argument('--sheet', default=SHEET_NAME, help=f"Sheet holding the hosts (default: {SHEET_NAME})")
+    parser.add_argument('--output', help='Write the updated workbook here instead of overwriting the EDS')
+    parser.add_argument('--add-missing', action='store_true', help='Append rows for hostnames not in the EDS')
+    parser.add_argument('--dry-run', action='store_true', help='Show the changes without saving')
+    parser.add_argument('--backup', action='store_true', help='Keep a .bak copy of the original workbook')
+    args = parser.parse_args()
+
+    try:
+        print(f"📖 Reading updates from {args.updates}...")
+        updates = load_updates(args.updates)
+        print(f"💾 Applying updates for {len(updates)} host(s) to {args.eds_file}...")
+        summary = apply_updates(
+            args.eds_file, updates, sheet_name=args.sheet, add_missing=args.add_missing,
+            output_file=args.output, dry_run=args.dry_run, backup=args.backup
+        )
+        print_summary(summary, args.dry_run)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"❌ Error: {str(e)}")
+        sys.exit(1)
+
+    if summary['missing_hosts']:
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
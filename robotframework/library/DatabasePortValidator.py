@@ -0,0 +1,297 @@
+"""
+Database Port Validator Library for Robot Framework
+Indexed lookup of the EDS "Database Considerations" sheet and concurrent reachability checks of DB CNAME / port pairs
+"""
+
+import re
+import time
+from robot.api.logger import info, warn, error
+from async_probe import DEFAULT_CONCURRENCY, DEFAULT_TIMEOUT, run_probe_series
+from eds_cache import load_sheet
+from eds_linter import is_placeholder_name
+from eds_reader import EDSTable, SheetNotFoundError, is_missing, read_sheet
+from EDSLookup import EDSLookup
+from library_logging import get_logger
+
+
+DB_SHEET_NAME = "Database Considerations"
+
+# The sheet has title rows above its header; the header is the row holding this column
+DB_HEADER_MARKER = 'Component Name'
+
+DB_COLUMNS = [
+    'Component Name', 'Type', 'Function', 'DB Ports Assignment', 'Service Account(s)',
+    'Named Instance', 'CNAME for DB', 'Maps To', 'DB Version'
+]
+
+# Connect attempts per endpoint, for its latency percentiles
+DEFAULT_ATTEMPTS = 3
+
+log = get_logger('DatabasePortValidator')
+
+
+class DatabasePortValidator:
+    """Library to look up database instances from the EDS and check their ports concurrently"""
+
+    ROBOT_LIBRARY_SCOPE = 'GLOBAL'
+
+    def __init__(self, eds_files=None, use_cache=True):
+        """
+        Args:
+            eds_files: EDS workbook sources, as for EDSLookup (default: EDS_FILES or the Itential EDS)
+            use_cache: Load the database sheet through the compiled EDS cache (default: True)
+        """
+        self.eds = EDSLookup(eds_files=eds_files, use_cache=use_cache)
+        self.use_cache = use_cache
+        self.instances = []
+        self.instance_index = {}
+        self.component_index = {}
+        self._load_db_data()
+
+    def _load_db_data(self):
+        """Read the database sheet of every EDS workbook and build the CNAME / instance / component indexes"""
+        instances = []
+        for path in self.eds.eds_files:
+            try:
+                if self.use_cache:
+                    table = EDSTable.from_payload(load_sheet(path, DB_SHEET_NAME, self._parse_db_sheet, columns=DB_COLUMNS))
+                else:
+                    table = read_sheet(path, DB_SHEET_NAME, DB_COLUMNS, header_marker=DB_HEADER_MARKER)
+            except SheetNotFoundError:
+                # EDS workbooks for components without a database have no database sheet
+                warn(f"Sheet '{DB_SHEET_NAME}' not found in {path} - no database instances loaded from it")
+                continue
+            except Exception as e:
+                error(f"Error loading database sheet from {path}: {str(e)}")
+                raise RuntimeError(f"Failed to load database sheet from {path}: {str(e)}")
+
+            instances.extend(self._build_instances(table, path))
+
+        self.instances = instances
+        self.instance_index = {}
+        self.component_index = {}
+        for number, instance in enumerate(instances):
+            for key in (instance['cname'], instance['named_instance']):
+                if key:
+                    self.instance_index.setdefault(key.lower(), number)
+            if instance['component']:
+                self.component_index.setdefault(instance['component'].lower(), []).append(number)
+
+        log.record('load_db_data', workbooks=len(self.eds.eds_files), instances=len(instances),
+                   components=len(self.component_index))
+
+    @staticmethod
+    def _parse_db_sheet(path, sheet_name, columns):
+        """Parse the database sheet into the columnar payload stored in the EDS cache"""
+        return read_sheet(path, sheet_name, columns, header_marker=DB_HEADER_MARKER).to_payload()
+
+    def _build_instances(self, table, path):
+        """Turn database sheet rows into instances; a row without a Component Name belongs to the component above"""
+        def cell(position, column):
+            value = table.column(column)[position] if column in table.columns else None
+            if isinstance(value, float) and value.is_integer():
+                value = int(value)
+            return '' if is_missing(value) else str(value).strip()
+
+        instances = []
+        component = ''
+        for position in range(len(table)):
+            component = cell(position, 'Component Name') or component
+            if not (cell(position, 'CNAME for DB') or cell(position, 'Named Instance') or cell(position, 'DB Ports Assignment')):
+                continue
+            instances.append({
+                'component': component,
+                'type': cell(position, 'Type'),
+                'function': cell(position, 'Function'),
+                'ports': self._parse_ports(cell(position, 'DB Ports Assignment')),
+                'service_accounts': cell(position, 'Service Account(s)'),
+                'named_instance': cell(position, 'Named Instance'),
+                'cname': cell(position, 'CNAME for DB'),
+                'maps_to': cell(position, 'Maps To'),
+                'version': cell(position, 'DB Version'),
+                'file': path,
+                'row': table.row_numbers[position]
+            })
+        return instances
+
+    @staticmethod
+    def _parse_ports(value):
+        """Parse a DB Ports Assignment cell such as '1984', '1433, 1434' or '5432/tcp' into a list of ints"""
+        ports = []
+        for port in re.findall(r'\d+', value):
+            port = int(port)
+            if 0 < port < 65536 and port not in ports:
+                ports.append(port)
+        return ports
+
+    def _require_instance(self, name):
+        """Return the instance for a DB CNAME or named instance, or raise"""
+        number = self.instance_index.get(str(name).strip().lower())
+        if number is None:
+            error(f"Database '{name}' not found in EDS sheet '{DB_SHEET_NAME}'")
+            raise ValueError(f"CRITICAL: Database '{name}' not found in EDS sheet '{DB_SHEET_NAME}'. Cannot proceed with validation.")
+        return self.instances[number]
+
+    def reload_db_data(self):
+        """
+        Reload the EDS workbooks and rebuild the database instance indexes
+
+        Returns:
+            int: Number of database instances loaded
+        """
+        self.eds.reload_eds_data()
+        self._load_db_data()
+        info(f"Reloaded database data: {len(self.instances)} instances")
+        return len(self.instances)
+
+    def get_database_instances(self, component=None):
+        """
+        Get the database instances defined in the EDS
+
+        Args:
+            component: Only return the instances of this Component Name (case-insensitive; default: all)
+
+        Returns:
+            list: One dict per instance with component, type, function, ports, service_accounts,
+                  named_instance, cname, maps_to, version, file and row
+        """
+        if component is None:
+            instances = self.instances
+        else:
+            instances = [self.instances[number] for number in self.component_index.get(str(component).strip().lower(), [])]
+        return [dict(instance, ports=list(instance['ports'])) for instance in instances]
+
+    def get_database_instance(self, name):
+        """
+        Get one database instance
+
+        Args:
+            name: DB CNAME or named instance (case-insensitive)
+
+        Returns:
+            dict: Instance fields, as returned by Get Database Instances
+        """
+        instance = self._require_instance(name)
+        log.record('get_database_instance', name=name, cname=instance['cname'], ports=len(instance['ports']))
+        return dict(instance, ports=list(instance['ports']))
+
+    def check_database_ports(self, names=None, attempts=DEFAULT_ATTEMPTS, concurrency=DEFAULT_CONCURRENCY,
+                             timeout=DEFAULT_TIMEOUT, domain=None, fail_on_unreachable=False):
+        """
+        Check every DB CNAME / port pair with concurrent TCP connects
+
+        Each endpoint gets `attempts` connects in a row, so its latency
+        percentiles come from its own samples; all endpoints are checked at
+        once under the concurrency limit and every connect is bounded by the
+        timeout. Instances whose CNAME or ports are still placeholders
+        ('TBD') are reported instead of probed.
+
+        Args:
+            names: DB CNAMEs or named instances to check, list or comma-separated (default: all)
+            attempts: Connects per endpoint (default: 3)
+            concurrency: Maximum connects in flight at once (default: 50)
+            timeout: Seconds allowed per connect (default: 3)
+            domain: DNS domain appended to CNAMEs without one (default: none)
+            fail_on_unreachable: Raise instead of returning when an endpoint is unreachable
+
+        Returns:
+            dict: Validation results with endpoints list (each with status and latency
+                  percentiles), violations list, total_endpoints, reachable_count,
+                  violations_count and elapsed_ms
+        """
+        if names is None:
+            instances = self.instances
+        else:
+            if isinstance(names, str):
+                names = [name for name in names.split(',') if name.strip()]
+            instances = [self._require_instance(name) for name in names]
+
+        probes = []
+        violations = []
+        for instance in instances:
+            cname = instance['cname']
+            if not cname or is_placeholder_name(cname):
+                violations.append(self._violation(instance, None, None, 'unassigned',
+                                                  f"CNAME for DB not assigned ('{cname}')", 'warning'))
+                continue
+            if not instance['ports']:
+                violations.append(self._violation(instance, cname, None, 'unassigned',
+                                                  'DB Ports Assignment has no port', 'warning'))
+                continue
+
+            host = f"{cname}.{domain.strip('.')}" if domain and '.' not in cname else cname
+            for port in instance['ports']:
+                probes.append({
+                    'component': instance['component'],
+                    'named_instance': instance['named_instance'],
+                    'cname': cname,
+                    'host': host,
+                    'port': port,
+                    'kind': 'tcp'
+                })
+
+        if not probes and not violations:
+            warn(f"No database endpoints to check in sheet '{DB_SHEET_NAME}'")
+
+        try:
+            start = time.perf_counter()
+            results = run_probe_series(probes, int(attempts), int(concurrency), float(timeout))
+            elapsed_ms = round((time.perf_counter() - start) * 1000, 2)
+        except Exception as e:
+            error(f"Error checking database ports: {str(e)}")
+            raise RuntimeError(f"Failed to check database ports: {str(e)}")
+
+        for result in results:
+            if result['ok']:
+                result['status'] = 'reachable'
+            elif result['successes']:
+                result['status'] = 'intermittent'
+                violations.append(self._violation(
+                    result, result['host'], result['port'], 'intermittent',
+                    f"{result['successes']}/{result['attempts']} connects succeeded - last error: {result['error']}",
+                    'warning'))
+            else:
+                result['status'] = 'unreachable'
+                violations.append(self._violation(result, result['host'], result['port'], 'unreachable',
+                                                  result['error'], 'critical'))
+            log.detail('db_probe', "{} {}:{} {} p50={}ms p95={}ms", result['cname'], result['host'], result['port'],
+                       result['status'], result['latency']['p50_ms'], result['latency']['p95_ms'])
+
+        reachable = sum(1 for result in results if result['ok'])
+        summary = {
+            'endpoints': results,
+            'violations': violations,
+            'total_instances': len(instances),
+            'total_endpoints': len(results),
+            'reachable_count': reachable,
+            'violations_count': len(violations),
+            'elapsed_ms': elapsed_ms
+        }
+        log.record('check_database_ports', instances=len(instances), endpoints=len(results),
+                   reachable=reachable, violations=len(violations), attempts=attempts, elapsed_ms=elapsed_ms)
+
+        unreachable = [v for v in violations if v['severity'] == 'critical']
+        if violations:
+            warn(f"Database port check found {len(violations)} issues "
+                 f"({len(unreachable)} unreachable) across {len(results)} endpoints")
+            if fail_on_unreachable and unreachable:
+                details = '; '.join(f"{v['cname']} ({v['host']}:{v['port']}): {v['reason']}" for v in unreachable)
+                raise ValueError(f"CRITICAL: Database endpoints unreachable - {details}")
+        else:
+            info(f"All {len(results)} database endpoints reachable in {elapsed_ms}ms")
+
+        return summary
+
+    @staticmethod
+    def _violation(source, host, port, check, reason, severity):
+        """Build one violation entry for an instance or endpoint result"""
+        return {
+            'component': source['component'],
+            'named_instance': source['named_instance'],
+            'cname': source['cname'],
+            'host': host,
+            'port': port,
+            'check': check,
+            'reason': reason,
+            'severity': severity
+        }
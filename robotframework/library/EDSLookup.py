@@ -1,118 +1,592 @@
 """
 EDS Lookup Library for Robot Framework
-Provides hostname-based configuration lookup from EDS_Itential_DRAFT_v0.01.xlsx
+Provides hostname-based configuration lookup from one or more EDS workbooks
+(default: EDS_Itential_DRAFT_v0.01.xlsx)
 """
 
-import pandas as pd
+import difflib
+import fnmatch
+import glob
 import os
 import re
+import site
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from robot.api.logger import info, warn, error
+from eds_cache import cached_payload, file_hash, file_signature, store_sheet
+from eds_linter import lint_network
+from eds_reader import EDSTable, is_missing, read_sheet
+from library_logging import get_logger
+
+
+LIBRARY_DIR = os.path.dirname(os.path.abspath(__file__))
+ROBOTFRAMEWORK_ROOT = os.path.dirname(LIBRARY_DIR)
+DEFAULT_EDS_FILE = "EDS_Itential_DRAFT_v0.01.xlsx"
+
+EDS_SHEET_NAME = "Server Requirements"
+HOSTNAME_COLUMN = "Server Name"
+IP_COLUMN = "IP Assignment"
+CNAME_COLUMN = "CNAME"
+CLUSTER_COLUMN = "Cluster Name"
+IP_PATTERN = re.compile(r'(\d+\.\d+\.\d+\.\d+)')
+
+# Provenance columns added to the merged table for every row
+SOURCE_FILE_COLUMN = "EDS Source File"
+SOURCE_ROW_COLUMN = "EDS Source Row"
+# Columns used to build server configurations; the loader parses only these
+EDS_COLUMNS = [
+    HOSTNAME_COLUMN, 'IP Assignment', 'Subnet', 'Mask', 'Gateway', 'CNAME', 'DOMAIN',
+    'VLAN Number', 'VLAN ID (Description of VLAN)', 'Teaming Bonding (Y/N)',
+    'Host Description', 'Cluster Name', 'Container Type', 'Type', 'Purpose',
+    'Classification', 'Site', 'Environment', 'Trust Level', 'OS Type',
+    'Number of CPU Cores (recom)', 'RAM', 'Storage Type', 'Storage Total TB',
+    'Drive or Volume Group', 'Files System', 'Logical Volume Name/Partition (Mounted On)',
+    'Storage Allocation (GB)', 'Recommended Storage Allocation (GB)', 'Drive Purpose',
+    'VxRail Cluster', 'vCenter Host', 'VM Hardware Version', 'VM Memory Reservation',
+    'VM CPU Reservation'
+]
+
+# Per-mount storage fields; a host owns one EDS row per drive / volume group / mount
+STORAGE_FIELDS = {
+    'drive_volume_group': 'Drive or Volume Group',
+    'file_system': 'Files System',
+    'logical_volume_partition': 'Logical Volume Name/Partition (Mounted On)',
+    'storage_allocation_gb': 'Storage Allocation (GB)',
+    'recommended_storage_gb': 'Recommended Storage Allocation (GB)',
+    'drive_purpose': 'Drive Purpose'
+}
+
+# Parsed EDS data shared by every EDSLookup instance and suite in this process, keyed by
+# the configured workbook sources: {'workbooks': {path: {'signature', 'sha256', 'table'}},
+# 'generation': int, 'server_data': merged EDSTable, plus the indexes built by _build_indexes}
+_EDS_STORE = {}
+_EDS_STORE_LOCK = threading.Lock()
+
+log = get_logger('EDSLookup')
 
 
 class EDSLookup:
     """Library to lookup server configuration from EDS sheet based on hostname"""
 
-    def __init__(self):
+    ROBOT_LIBRARY_SCOPE = 'GLOBAL'
+
+    def __init__(self, eds_files=None, use_cache=True, max_workers=0):
+        """
+        Args:
+            eds_files: Comma-separated workbook paths, glob patterns or directories, relative to
+                       the robotframework root (default: EDS_FILES environment variable, else
+                       EDS_Itential_DRAFT_v0.01.xlsx)
+            use_cache: Load each workbook through its compiled on-disk EDS cache (default: True)
+            max_workers: Processes used to parse several changed workbooks (default: CPU count)
+        """
+        self.eds_sources = eds_files or os.environ.get('EDS_FILES') or DEFAULT_EDS_FILE
+        self.eds_files = []
         self.eds_file = None
         self.server_data = None
+        self.hostname_index = None
+        self.host_rows = None
+        self.storage_totals = None
+        self.changed_hosts = None
+        self.ip_index = None
+        self.cname_index = None
+        self.cluster_index = None
+        self.use_cache = use_cache
+        self.max_workers = int(max_workers) or os.cpu_count() or 1
+        self._store_key = ','.join(source.strip() for source in str(self.eds_sources).split(','))
         self._load_eds_data()
 
-    def _load_eds_data(self):
-        """Load EDS sheet data"""
-        try:
-            # Look for EDS file in the robotframework root directory
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            robotframework_root = os.path.dirname(current_dir)
-            self.eds_file = os.path.join(robotframework_root, "EDS_Itential_DRAFT_v0.01.xlsx")
-
-            if os.path.exists(self.eds_file):
-                # Read the Server Requirements sheet
-                self.server_data = pd.read_excel(self.eds_file, sheet_name="Server Requirements")
-                info(f"Loaded EDS data from {self.eds_file}")
-                info(f"Available columns: {list(self.server_data.columns)}")
+    def _resolve_eds_files(self):
+        """Expand the configured sources into an ordered, de-duplicated list of workbook paths"""
+        files = []
+        for source in str(self.eds_sources).split(','):
+            source = source.strip()
+            if not source:
+                continue
+
+            path = source if os.path.isabs(source) else os.path.join(ROBOTFRAMEWORK_ROOT, source)
+            if os.path.isdir(path):
+                matches = sorted(glob.glob(os.path.join(path, '*.xlsx')))
+            elif any(char in path for char in '*?['):
+                matches = sorted(glob.glob(path))
             else:
-                error(f"EDS file not found at {self.eds_file}")
-                raise FileNotFoundError(f"EDS file not found: {self.eds_file}")
+                matches = [path]
+
+            for match in matches:
+                match = os.path.abspath(match)
+                # Skip Excel lock files of workbooks that are open in Excel
+                if os.path.basename(match).startswith('~$') or match in files:
+                    continue
+                files.append(match)
+        return files
+
+    def _load_eds_data(self, force_reload=False):
+        """Load EDS sheet data, reusing the process-wide store and reloading incrementally when stale"""
+        try:
+            files = self._resolve_eds_files()
+            missing = [path for path in files if not os.path.exists(path)]
+            if missing or not files:
+                error(f"EDS file not found at {missing or self.eds_sources}")
+                raise FileNotFoundError(f"EDS file not found: {', '.join(missing) or self.eds_sources}")
+
+            self.eds_files = files
+            self.eds_file = files[0]
+
+            with _EDS_STORE_LOCK:
+                entry = _EDS_STORE.get(self._store_key)
+                if entry is None:
+                    entry = self._build_entry(files)
+                    info(f"Loaded EDS data from {', '.join(files)}")
+                    info(f"Available columns: {list(entry['server_data'].columns)}")
+                elif force_reload or self._is_entry_stale(entry, files):
+                    entry = self._build_entry(files, previous=entry, force_reload=force_reload)
+                _EDS_STORE[self._store_key] = entry
+            self._bind_entry(entry)
         except Exception as e:
             error(f"Error loading EDS data: {str(e)}")
             raise
 
-    def lookup_server_config(self, hostname):
-        """Lookup server configuration from EDS sheet based on hostname"""
+    def _build_entry(self, files, previous=None, force_reload=False):
+        """
+        Build a store entry for the workbooks on disk
+
+        With a previous entry, workbooks whose signature or content hash is
+        unchanged keep their loaded table and only changed workbooks are read
+        again. The merged rows are then diffed by Server Name and per-host
+        data is rebuilt only for changed hosts.
+        """
+        previous_workbooks = previous['workbooks'] if previous else {}
+        workbooks = {}
+        changed_files = {}
+
+        for path in files:
+            signature = file_signature(path)
+            known = previous_workbooks.get(path)
+            if known is not None and not force_reload:
+                if known['signature'] == signature:
+                    workbooks[path] = known
+                    continue
+                content_hash = file_hash(path)
+                if known['sha256'] == content_hash:
+                    info(f"EDS workbook {path} touched but content unchanged - keeping loaded data")
+                    workbooks[path] = dict(known, signature=signature)
+                    continue
+            else:
+                content_hash = file_hash(path)
+            changed_files[path] = {'signature': signature, 'sha256': content_hash}
+
+        if previous is not None and not changed_files and list(previous_workbooks) == files:
+            return dict(previous, workbooks=workbooks)
+
+        tables = self._read_workbooks(changed_files)
+        for path, state in changed_files.items():
+            workbooks[path] = dict(state, table=tables[path])
+        workbooks = {path: workbooks[path] for path in files}
+
+        server_data = self._merge_workbooks(files, workbooks)
+        entry = {
+            'workbooks': workbooks,
+            'generation': previous['generation'] + 1 if previous else 1,
+            'server_data': server_data
+        }
+        entry.update(self._build_indexes(server_data, previous))
+
+        if previous is not None:
+            changed = entry['changed_hosts']
+            log.record('reload_eds_data', generation=entry['generation'], rows=len(server_data),
+                       workbooks_read=len(changed_files), added=len(changed['added']),
+                       removed=len(changed['removed']), modified=len(changed['modified']))
+        return entry
+
+    def _read_workbooks(self, changed_files):
+        """
+        Read the Server Requirements sheet of changed workbooks
+
+        Workbooks with a valid compiled cache are loaded from it. The rest are
+        parsed in a process pool when there is more than one, and each result
+        is written back to that workbook's own cache.
+
+        Args:
+            changed_files: Dict of path -> {'signature', 'sha256'} taken before reading
+
+        Returns:
+            dict: Path -> EDSTable
+        """
+        tables = {}
+        to_parse = []
+        for path in changed_files:
+            payload = cached_payload(path, EDS_SHEET_NAME, columns=EDS_COLUMNS) if self.use_cache else None
+            if payload is not None:
+                tables[path] = EDSTable.from_payload(payload)
+            else:
+                to_parse.append(path)
+
+        parsed = {}
+        if len(to_parse) > 1 and self.max_workers > 1:
+            try:
+                info(f"Parsing {len(to_parse)} EDS workbooks in parallel")
+                workers = min(len(to_parse), self.max_workers)
+                # Workers import eds_reader by name, so put the library directory on their path
+                with ProcessPoolExecutor(max_workers=workers, initializer=site.addsitedir,
+                                         initargs=(LIBRARY_DIR,)) as pool:
+                    futures = {path: pool.submit(read_sheet, path, EDS_SHEET_NAME, EDS_COLUMNS) for path in to_parse}
+                    parsed = {path: future.result() for path, future in futures.items()}
+            except Exception as e:
+                warn(f"Parallel EDS parse failed ({str(e)}) - parsing sequentially")
+                parsed = {}
+
+        for path in to_parse:
+            if path not in parsed:
+                parsed[path] = read_sheet(path, EDS_SHEET_NAME, columns=EDS_COLUMNS)
+            if self.use_cache:
+                state = changed_files[path]
+                store_sheet(path, EDS_SHEET_NAME, parsed[path].to_payload(), columns=EDS_COLUMNS,
+                            signature=state['signature'], content_hash=state['sha256'])
+            tables[path] = parsed[path]
+
+        return tables
+
+    def _merge_workbooks(self, files, workbooks):
+        """
+        Merge workbook tables into one table with per-row source file and row number
+
+        A host listed in several workbooks is kept from the first workbook
+        (in configured order) and its rows in later workbooks are dropped.
+        """
+        columns = []
+        for path in files:
+            columns.extend(col for col in workbooks[path]['table'].columns if col not in columns)
+        columns.extend([SOURCE_FILE_COLUMN, SOURCE_ROW_COLUMN])
+        data = {col: [] for col in columns}
+
+        host_sources = {}
+        duplicates = []
+        for path in files:
+            table = workbooks[path]['table']
+            if HOSTNAME_COLUMN not in table.columns:
+                warn(f"Column '{HOSTNAME_COLUMN}' not found in {path} - workbook skipped")
+                continue
+
+            keep = []
+            for host, positions in self._group_host_rows(table).items():
+                if host in host_sources:
+                    duplicates.append(f"{host} ({os.path.basename(path)}, kept {os.path.basename(host_sources[host])})")
+                    continue
+                host_sources[host] = path
+                keep.extend(positions)
+
+            if len(keep) == len(table):
+                for col in columns[:-2]:
+                    data[col].extend(table.data[col] if col in table.data else [None] * len(table))
+                data[SOURCE_ROW_COLUMN].extend(table.row_numbers)
+            else:
+                keep.sort()
+                for col in columns[:-2]:
+                    values = table.data.get(col)
+                    data[col].extend([values[position] for position in keep] if values else [None] * len(keep))
+                data[SOURCE_ROW_COLUMN].extend(table.row_numbers[position] for position in keep)
+            data[SOURCE_FILE_COLUMN].extend([path] * len(keep))
+
+        if duplicates:
+            warn(f"{len(duplicates)} hosts appear in more than one EDS workbook, first kept: {duplicates[:10]}")
+
+        return EDSTable(columns, data, data[SOURCE_ROW_COLUMN])
+
+    def _is_entry_stale(self, entry, files=None):
+        """Check whether a stored entry no longer matches the workbooks on disk"""
+        try:
+            files = files if files is not None else self._resolve_eds_files()
+            if list(entry['workbooks']) != files:
+                return True
+            return any(entry['workbooks'][path]['signature'] != file_signature(path) for path in files)
+        except OSError:
+            return True
+
+    def _ensure_current(self):
+        """Reload the shared EDS data if a workbook changed since it was loaded"""
+        entry = _EDS_STORE.get(self._store_key)
+        if entry is None or self._is_entry_stale(entry):
+            info("EDS workbook changed on disk - reloading")
+            self._load_eds_data()
+        else:
+            self._bind_entry(entry)
+
+    def _bind_entry(self, entry):
+        """Point this instance at a shared store entry"""
+        self.server_data = entry['server_data']
+        self.hostname_index = entry['hostname_index']
+        self.host_rows = entry['host_rows']
+        self.storage_totals = entry['storage_totals']
+        self.changed_hosts = entry['changed_hosts']
+        self.ip_index = entry['ip_index']
+        self.cname_index = entry['cname_index']
+        self.cluster_index = entry['cluster_index']
+
+    def reload_eds_data(self):
+        """
+        Force a reload of the EDS workbooks into the process-wide store
+
+        Rows are diffed by Server Name against the loaded data; use
+        Get Changed EDS Hosts to see which hosts were added, removed or modified.
+
+        Returns:
+            int: Number of rows loaded
+        """
+        self._load_eds_data(force_reload=True)
+        info(f"Reloaded EDS data: {len(self.server_data)} rows")
+        return len(self.server_data)
+
+    def eds_data_is_stale(self):
+        """
+        Check whether a workbook changed since the EDS data was loaded
+
+        Returns:
+            bool: True if the loaded EDS data no longer matches the workbooks
+        """
+        entry = _EDS_STORE.get(self._store_key)
+        return entry is None or self._is_entry_stale(entry)
+
+    def get_changed_eds_hosts(self):
+        """
+        Get the hosts whose EDS rows changed in the most recent load or reload
+
+        Hostnames are normalized (lower case) and can be passed straight back
+        to the lookup keywords. On the first load every host is reported as added.
+
+        Returns:
+            dict: 'added', 'removed' and 'modified' hostname lists and the store 'generation'
+        """
+        self._ensure_current()
+        entry = _EDS_STORE[self._store_key]
+        changed = {key: list(hosts) for key, hosts in self.changed_hosts.items()}
+        changed['generation'] = entry['generation']
+        return changed
+
+    def get_eds_host_source(self, hostname):
+        """
+        Get the workbook and worksheet row a host was loaded from
+
+        Args:
+            hostname: Server hostname
+
+        Returns:
+            dict: 'file' (workbook path) and 'row' (first Server Requirements row of the host)
+        """
+        index = self._require_hostname_index()
+        position = index.get(self._normalize_hostname(hostname))
+        if position is None:
+            raise self._hostname_not_found(hostname)
+
+        return {
+            'file': self.server_data.column(SOURCE_FILE_COLUMN)[position],
+            'row': self.server_data.column(SOURCE_ROW_COLUMN)[position]
+        }
+
+    def get_eds_dataframe(self):
+        """
+        Get the loaded Server Requirements columns as a pandas DataFrame
+
+        pandas is only imported when this keyword is used.
+
+        Returns:
+            DataFrame: Copy of the loaded EDS columns
+        """
+        self._ensure_current()
+        return self.server_data.to_dataframe()
+
+    @staticmethod
+    def _normalize_hostname(hostname):
+        """Normalize a hostname for index lookups (case and surrounding whitespace)"""
+        return str(hostname).strip().lower()
+
+    def _build_indexes(self, server_data, previous=None):
+        """
+        Build the hostname, per-host row group and storage aggregate indexes for a table
+
+        When the previous store entry is given, hosts are diffed by their row
+        signatures and storage aggregates are reused for unchanged hosts.
+        """
+        if HOSTNAME_COLUMN not in server_data.columns:
+            warn(f"Column '{HOSTNAME_COLUMN}' not found in EDS sheet - hostname index not built")
+            host_rows = {}
+            hostname_index = None
+        else:
+            host_rows = self._group_host_rows(server_data)
+            hostname_index = {host: positions[0] for host, positions in host_rows.items()}
+
+        host_signatures = self._host_signatures(server_data, host_rows)
+        old_signatures = previous['host_signatures'] if previous else {}
+        changed_hosts = {
+            'added': sorted(host for host in host_signatures if host not in old_signatures),
+            'removed': sorted(host for host in old_signatures if host not in host_signatures),
+            'modified': sorted(host for host, signature in host_signatures.items()
+                               if host in old_signatures and old_signatures[host] != signature)
+        }
+
+        # Swap in freshly aggregated storage only for hosts whose rows changed
+        rebuild = set(changed_hosts['added']) | set(changed_hosts['modified'])
+        storage_totals = {}
+        if previous:
+            storage_totals = {host: totals for host, totals in previous['storage_totals'].items()
+                              if host in host_signatures and host not in rebuild}
+        storage_totals.update(self._aggregate_storage(server_data, {host: host_rows[host] for host in rebuild}))
+
+        indexes = {
+            'hostname_index': hostname_index,
+            'host_rows': host_rows,
+            'host_signatures': host_signatures,
+            'storage_totals': storage_totals,
+            'changed_hosts': changed_hosts
+        }
+        indexes.update(self._build_secondary_indexes(server_data, hostname_index or {}))
+        return indexes
+
+    def _build_secondary_indexes(self, server_data, hostname_index):
+        """
+        Build the IP, CNAME and cluster indexes, each mapping a normalized key to hostnames
+
+        CNAME cells may list several names; each name and its short (first label)
+        form is indexed. Clusters are indexed by full name and by the name without
+        a trailing qualifier, e.g. 'alhqanncc03 (Linux)' and 'alhqanncc03'. When
+        two hosts share an IP or CNAME the first one in the sheet wins.
+        """
+        empty_column = [None] * len(server_data)
+        ips, cnames, clusters = [
+            server_data.column(col) if col in server_data.columns else empty_column
+            for col in (IP_COLUMN, CNAME_COLUMN, CLUSTER_COLUMN)
+        ]
+
+        ip_index = {}
+        cname_index = {}
+        short_cnames = {}
+        cluster_index = {}
+        for host, position in hostname_index.items():
+            ip = ips[position]
+            if not is_missing(ip):
+                match = IP_PATTERN.search(str(ip))
+                if match:
+                    ip_index.setdefault(match.group(1), host)
+
+            cname = cnames[position]
+            if not is_missing(cname):
+                for name in re.split(r'[\s,;]+', str(cname).strip().lower()):
+                    if name:
+                        cname_index.setdefault(name, host)
+                        short_cnames.setdefault(name.split('.')[0], host)
+
+            cluster = clusters[position]
+            if not is_missing(cluster) and str(cluster).strip():
+                full_name = self._normalize_hostname(cluster)
+                base_name = full_name.split(' (')[0].strip()
+                for key in {full_name, base_name}:
+                    cluster_index.setdefault(key, []).append(host)
+
+        # Short names never shadow a full CNAME
+        for name, host in short_cnames.items():
+            cname_index.setdefault(name, host)
+
+        return {'ip_index': ip_index, 'cname_index': cname_index, 'cluster_index': cluster_index}
+
+    def _host_signatures(self, server_data, host_rows):
+        """Hash the rows of every host so reloads can tell which hosts changed"""
+        columns = [server_data.column(col) for col in server_data.columns if col != SOURCE_ROW_COLUMN]
+        return {
+            host: hash(tuple(tuple(col[position] for col in columns) for position in positions))
+            for host, positions in host_rows.items()
+        }
+
+    def _group_host_rows(self, server_data):
+        """
+        Group row positions per normalized hostname
+
+        Storage rows that leave Server Name blank (merged-cell style layouts)
+        continue the host above them.
+        """
+        storage_columns = [server_data.column(col) for col in STORAGE_FIELDS.values() if col in server_data.columns]
+        host_rows = {}
+        current_host = None
+
+        for position, hostname in enumerate(server_data.column(HOSTNAME_COLUMN)):
+            if is_missing(hostname):
+                if current_host is not None and any(not is_missing(col[position]) for col in storage_columns):
+                    host_rows[current_host].append(position)
+                continue
+            current_host = self._normalize_hostname(hostname)
+            host_rows.setdefault(current_host, []).append(position)
+
+        return host_rows
+
+    def _aggregate_storage(self, server_data, host_rows):
+        """Total allocated and recommended GB per volume group for the given hosts"""
+        empty_column = [None] * len(server_data)
+        volume_groups, allocated, recommended = [
+            server_data.column(STORAGE_FIELDS[key]) if STORAGE_FIELDS[key] in server_data.columns else empty_column
+            for key in ('drive_volume_group', 'storage_allocation_gb', 'recommended_storage_gb')
+        ]
+
+        storage_totals = {}
+        for host, positions in host_rows.items():
+            totals = {}
+            for position in positions:
+                group = 'N/A' if is_missing(volume_groups[position]) else str(volume_groups[position])
+                group_totals = totals.setdefault(group, {'allocated_gb': 0.0, 'recommended_gb': 0.0, 'mount_count': 0})
+                group_totals['allocated_gb'] += self._to_gb(allocated[position]) or 0.0
+                group_totals['recommended_gb'] += self._to_gb(recommended[position]) or 0.0
+                group_totals['mount_count'] += 1
+            storage_totals[host] = totals
+
+        return storage_totals
+
+    @staticmethod
+    def _to_gb(value):
+        """Convert an EDS size cell (number or text such as '20 GB') to a float, or None"""
+        if is_missing(value):
+            return None
+        if isinstance(value, (int, float)):
+            return float(value)
+        match = re.search(r'\d+(?:\.\d+)?', str(value))
+        return float(match.group(0)) if match else None
+
+    def _require_hostname_index(self):
+        """Return the hostname index or raise if the EDS sheet cannot be searched by hostname"""
+        self._ensure_current()
         if self.server_data is None:
             raise RuntimeError("EDS sheet not available - cannot proceed with validation")
 
+        if self.hostname_index is None:
+            available_cols = list(self.server_data.columns)
+            info(f"Available columns: {available_cols}")
+            raise ValueError(f"Column '{HOSTNAME_COLUMN}' not found in EDS sheet")
+
+        return self.hostname_index
+
+    def _close_hostname_matches(self, hostname, limit=5):
+        """Return indexed hostnames that closely resemble an unknown hostname"""
+        candidates = [str(name) for name in self.server_data.column(HOSTNAME_COLUMN) if not is_missing(name)]
+        by_normalized = {self._normalize_hostname(name): name for name in candidates}
+        matches = difflib.get_close_matches(self._normalize_hostname(hostname), list(by_normalized), n=limit)
+        return [by_normalized[match] for match in matches]
+
+    def _hostname_not_found(self, hostname):
+        """Build the error raised for an unknown hostname, reporting close matches only"""
+        error(f"Hostname '{hostname}' not found in EDS sheet")
+        close_matches = self._close_hostname_matches(hostname)
+        if close_matches:
+            info(f"Close matches for '{hostname}': {close_matches}")
+        return ValueError(f"CRITICAL: Hostname '{hostname}' not found in EDS sheet. Cannot proceed with validation.")
+
+    def lookup_server_config(self, hostname):
+        """Lookup server configuration from EDS sheet based on hostname"""
+        index = self._require_hostname_index()
+
         try:
-            # Use correct column name from EDS file "Server Name"
-            hostname_col = "Server Name"
-
-            if hostname_col not in self.server_data.columns:
-                available_cols = list(self.server_data.columns)
-                info(f"Available columns: {available_cols}")
-                raise ValueError(f"Column '{hostname_col}' not found in EDS sheet")
-
-            # Find exact hostname match
-            mask = self.server_data[hostname_col].astype(str) == hostname
-            matching_rows = self.server_data[mask]
-
-            if matching_rows.empty:
-                available_hostnames = self.server_data[hostname_col].dropna().tolist()
-                error(f"Hostname '{hostname}' not found in EDS sheet")
-                info(f"Available hostnames: {available_hostnames}")
-                raise ValueError(f"CRITICAL: Hostname '{hostname}' not found in EDS sheet. Cannot proceed with validation.")
-
-            row = matching_rows.iloc[0]
-            info(f"Found matching row for hostname '{hostname}'")
-
-            # Extract configuration using actual EDS column names
-            # All extractions use safe method - returns 'N/A' if column doesn't exist or is empty
-            config = {
-                # Network Configuration
-                'ip': self._extract_ip(row),
-                'subnet': self._extract_safe(row, 'Subnet', 'N/A'),
-                'mask': self._extract_safe(row, 'Mask', 'N/A'),
-                'gateway': self._extract_safe(row, 'Gateway', 'N/A'),
-                'cname': self._extract_safe(row, 'CNAME', 'N/A'),
-                'domain': self._extract_safe(row, 'DOMAIN', 'N/A'),
-                'vlan_number': self._extract_safe(row, 'VLAN Number', 'N/A'),
-                'vlan_id': self._extract_safe(row, 'VLAN ID (Description of VLAN)', 'N/A'),
-                'teaming_bonding': self._extract_safe(row, 'Teaming Bonding (Y/N)', 'N/A'),
-
-                # Server Configuration
-                'host_description': self._extract_safe(row, 'Host Description', 'N/A'),
-                'cluster_name': self._extract_safe(row, 'Cluster Name', 'N/A'),
-                'container_type': self._extract_safe(row, 'Container Type', 'N/A'),
-                'type': self._extract_safe(row, 'Type', 'N/A'),
-                'purpose': self._extract_safe(row, 'Purpose', 'N/A'),
-                'classification': self._extract_safe(row, 'Classification', 'N/A'),
-                'site': self._extract_safe(row, 'Site', 'N/A'),
-                'environment': self._extract_safe(row, 'Environment', 'N/A'),
-                'trust_level': self._extract_safe(row, 'Trust Level', 'N/A'),
-                'os_type': self._extract_safe(row, 'OS Type', 'N/A'),
-
-                # Hardware Configuration
-                'cpu_cores': self._extract_safe(row, 'Number of CPU Cores (recom)', 'N/A'),
-                'ram': self._extract_safe(row, 'RAM', 'N/A'),
-
-                # Storage Configuration
-                'storage_type': self._extract_safe(row, 'Storage Type', 'N/A'),
-                'storage_total_tb': self._extract_safe(row, 'Storage Total TB', 'N/A'),
-                'drive_volume_group': self._extract_safe(row, 'Drive or Volume Group', 'N/A'),
-                'file_system': self._extract_safe(row, 'Files System', 'N/A'),
-                'logical_volume_partition': self._extract_safe(row, 'Logical Volume Name/Partition (Mounted On)', 'N/A'),
-                'storage_allocation_gb': self._extract_safe(row, 'Storage Allocation (GB)', 'N/A'),
-                'recommended_storage_gb': self._extract_safe(row, 'Recommended Storage Allocation (GB)', 'N/A'),
-                'drive_purpose': self._extract_safe(row, 'Drive Purpose', 'N/A'),
-
-                # Additional fields that may or may not exist in EDS
-                'vxrail_cluster': self._extract_safe(row, 'VxRail Cluster', 'N/A'),
-                'vcenter_host': self._extract_safe(row, 'vCenter Host', 'N/A'),
-                'vm_hardware_version': self._extract_safe(row, 'VM Hardware Version', 'N/A'),
-                'vm_memory_reservation': self._extract_safe(row, 'VM Memory Reservation', 'N/A'),
-                'vm_cpu_reservation': self._extract_safe(row, 'VM CPU Reservation', 'N/A')
-            }
+            position = index.get(self._normalize_hostname(hostname))
+            if position is None:
+                raise self._hostname_not_found(hostname)
+
+            row = self.server_data.row(position)
+            config = self._build_config(row)
 
-            info(f"EDS configuration for {hostname}: {config}")
+            log.record('lookup_server_config', hostname=hostname, config=config)
             return config
 
         except ValueError:
@@ -121,17 +595,389 @@ class EDSLookup:
             error(f"Error looking up configuration for {hostname}: {str(e)}")
             raise RuntimeError(f"Failed to lookup configuration: {str(e)}")
 
+    def lookup_server_configs(self, hostnames, ignore_missing=False):
+        """
+        Lookup server configurations for several hostnames in one pass
+
+        Args:
+            hostnames: List of hostnames (or a comma-separated string)
+            ignore_missing: Skip unknown hostnames instead of failing (default: False)
+
+        Returns:
+            dict: Configuration dict per requested hostname
+        """
+        index = self._require_hostname_index()
+
+        if isinstance(hostnames, str):
+            hostnames = [name.strip() for name in hostnames.split(',') if name.strip()]
+
+        try:
+            positions = {}
+            missing = []
+            for hostname in hostnames:
+                position = index.get(self._normalize_hostname(hostname))
+                if position is None:
+                    missing.append(hostname)
+                else:
+                    positions[hostname] = position
+
+            if missing:
+                for hostname in missing:
+                    close_matches = self._close_hostname_matches(hostname)
+                    if close_matches:
+                        info(f"Close matches for '{hostname}': {close_matches}")
+                if not ignore_missing:
+                    error(f"Hostnames not found in EDS sheet: {missing}")
+                    raise ValueError(f"CRITICAL: Hostnames {missing} not found in EDS sheet. Cannot proceed with validation.")
+                warn(f"Skipping hostnames not found in EDS sheet: {missing}")
+
+            configs = {
+                hostname: self._build_config(self.server_data.row(position))
+                for hostname, position in positions.items()
+            }
+
+            log.record('lookup_server_configs', requested=len(hostnames), resolved=len(configs), missing=missing)
+            return configs
+
+        except ValueError:
+            raise
+        except Exception as e:
+            error(f"Error looking up configurations for {hostnames}: {str(e)}")
+            raise RuntimeError(f"Failed to lookup configurations: {str(e)}")
+
+    def lookup_server_config_by_ip(self, ip_address):
+        """
+        Lookup server configuration by the host's EDS IP Assignment
+
+        Args:
+            ip_address: IPv4 address of the host
+
+        Returns:
+            dict: Server configuration, plus 'hostname' (the host's Server Name)
+        """
+        self._require_hostname_index()
+        match = IP_PATTERN.search(str(ip_address))
+        host = self.ip_index.get(match.group(1)) if match else None
+        if host is None:
+            error(f"IP address '{ip_address}' not found in EDS sheet")
+            raise ValueError(f"CRITICAL: IP address '{ip_address}' not found in EDS sheet. Cannot proceed with validation.")
+
+        config = self._config_for_host(host)
+        log.record('lookup_server_config_by_ip', ip_address=ip_address, hostname=config['hostname'])
+        return config
+
+    def lookup_server_config_by_cname(self, cname):
+        """
+        Lookup server configuration by the host's EDS CNAME
+
+        Args:
+            cname: CNAME, either fully qualified or its short name (case-insensitive)
+
+        Returns:
+            dict: Server configuration, plus 'hostname' (the host's Server Name)
+        """
+        self._require_hostname_index()
+        host = self.cname_index.get(self._normalize_hostname(cname))
+        if host is None:
+            error(f"CNAME '{cname}' not found in EDS sheet")
+            raise ValueError(f"CRITICAL: CNAME '{cname}' not found in EDS sheet. Cannot proceed with validation.")
+
+        config = self._config_for_host(host)
+        log.record('lookup_server_config_by_cname', cname=cname, hostname=config['hostname'])
+        return config
+
+    def lookup_server_configs_by_cluster(self, cluster_name, skip_invalid=False):
+        """
+        Lookup the configurations of every host in an EDS cluster
+
+        Args:
+            cluster_name: Cluster Name, with or without its qualifier, e.g. 'alhqanncc03 (Linux)' or 'alhqanncc03'
+            skip_invalid: Skip hosts whose configuration cannot be built (e.g. placeholder IP)
+                          instead of failing (default: False)
+
+        Returns:
+            dict: Configuration dict per Server Name, in sheet order
+        """
+        self._require_hostname_index()
+        hosts = self.cluster_index.get(self._normalize_hostname(cluster_name))
+        if hosts is None:
+            error(f"Cluster '{cluster_name}' not found in EDS sheet")
+            close_matches = difflib.get_close_matches(self._normalize_hostname(cluster_name), list(self.cluster_index))
+            if close_matches:
+                info(f"Close matches for '{cluster_name}': {close_matches}")
+            raise ValueError(f"CRITICAL: Cluster '{cluster_name}' not found in EDS sheet. Cannot proceed with validation.")
+
+        configs = {}
+        skipped = []
+        for host in hosts:
+            try:
+                config = self._config_for_host(host)
+            except ValueError as e:
+                if not skip_invalid:
+                    raise ValueError(f"CRITICAL: Invalid EDS data for {host} in cluster '{cluster_name}': {str(e)}")
+                warn(f"Skipping {host} in cluster '{cluster_name}': {str(e)}")
+                skipped.append(host)
+                continue
+            configs[config['hostname']] = config
+
+        log.record('lookup_server_configs_by_cluster', cluster_name=cluster_name, hosts=list(configs), skipped=skipped)
+        return configs
+
+    def query_eds_hosts(self, **predicates):
+        """
+        Select EDS hosts whose columns match every given predicate
+
+        Predicate names are EDS columns, matched ignoring case, spaces and
+        underscores, so 'Environment', 'cluster_name' and 'ClusterName' all
+        work. Values are matched case-insensitively against the host's first
+        row:
+            'QA (Staging)'       exact value
+            'QA (Staging)|PROD'  any of several values (a list also works)
+            'alhqa*'             wildcard pattern (* and ?)
+            '!PROD'              negation of any of the above
+
+        Each predicate is evaluated once per distinct column value and applied
+        to the whole column as a boolean mask, so queries stay fast on large fleets.
+
+        Example:
+            ${hosts}=    Query EDS Hosts    Environment=QA (Staging)    Purpose=Itential Redis    Site=GDCA
+
+        Args:
+            predicates: Column name -> expected value(s)
+
+        Returns:
+            list: Matching Server Names in sheet order
+        """
+        self._require_hostname_index()
+        positions = sorted(self.hostname_index.values())
+        mask = [True] * len(positions)
+
+        for name, expected in predicates.items():
+            column = self._resolve_query_column(name)
+            matcher = self._build_matcher(expected)
+            results = {}
+            values = self.server_data.column(column)
+            for offset, position in enumerate(positions):
+                if not mask[offset]:
+                    continue
+                value = values[position]
+                key = None if is_missing(value) else str(value).strip().lower()
+                if key not in results:
+                    results[key] = matcher(key)
+                mask[offset] = results[key]
+
+        names = self.server_data.column(HOSTNAME_COLUMN)
+        hosts = [str(names[position]).strip() for offset, position in enumerate(positions) if mask[offset]]
+
+        log.record('query_eds_hosts', predicates=predicates, matched=len(hosts))
+        return hosts
+
+    def _resolve_query_column(self, name):
+        """Map a query predicate name to an EDS column, ignoring case, spaces and underscores"""
+        def compact(text):
+            return re.sub(r'[\s_]+', '', str(text)).lower()
+
+        columns = {compact(col): col for col in self.server_data.columns}
+        column = columns.get(compact(name))
+        if column is None:
+            raise ValueError(f"Unknown EDS column '{name}' in query. Available columns: {list(self.server_data.columns)}")
+        return column
+
+    @staticmethod
+    def _build_matcher(expected):
+        """Build a predicate over normalized cell values from an expected value, list, pattern or '!' negation"""
+        negate = False
+        if isinstance(expected, (list, tuple, set)):
+            options = [str(option) for option in expected]
+        else:
+            expected = str(expected).strip()
+            if expected.startswith('!'):
+                negate = True
+                expected = expected[1:]
+            options = expected.split('|')
+
+        exact = set()
+        patterns = []
+        for option in options:
+            option = option.strip().lower()
+            if any(char in option for char in '*?['):
+                patterns.append(option)
+            else:
+                exact.add(option)
+
+        def matcher(value):
+            matched = value is not None and (
+                value in exact or any(fnmatch.fnmatchcase(value, pattern) for pattern in patterns)
+            )
+            return matched != negate
+
+        return matcher
+
+    def _config_for_host(self, host):
+        """Build the configuration of an indexed (normalized) hostname, including its Server Name"""
+        position = self.hostname_index[host]
+        config = self._build_config(self.server_data.row(position))
+        config['hostname'] = str(self.server_data.column(HOSTNAME_COLUMN)[position]).strip()
+        return config
+
+    def get_server_storage_layout(self, hostname):
+        """
+        Get every storage allocation row recorded in the EDS sheet for a hostname
+
+        Args:
+            hostname: Server hostname
+
+        Returns:
+            list: One dict per mount with drive_volume_group, file_system,
+                  logical_volume_partition, storage_allocation_gb,
+                  recommended_storage_gb and drive_purpose
+        """
+        self._require_hostname_index()
+        positions = self.host_rows.get(self._normalize_hostname(hostname))
+        if positions is None:
+            raise self._hostname_not_found(hostname)
+
+        columns = self.server_data.columns
+        layout = []
+        for position in positions:
+            mount = {}
+            for key, col in STORAGE_FIELDS.items():
+                value = self.server_data.column(col)[position] if col in columns else None
+                mount[key] = 'N/A' if is_missing(value) else str(value)
+            layout.append(mount)
+
+        log.record('get_server_storage_layout', hostname=hostname, mounts=len(layout))
+        return layout
+
+    def get_server_storage_totals(self, hostname):
+        """
+        Get total allocated and recommended storage per volume group for a hostname
+
+        Args:
+            hostname: Server hostname
+
+        Returns:
+            dict: Volume group -> {'allocated_gb', 'recommended_gb', 'mount_count'}
+        """
+        self._require_hostname_index()
+        totals = self.storage_totals.get(self._normalize_hostname(hostname))
+        if totals is None:
+            raise self._hostname_not_found(hostname)
+
+        log.record('get_server_storage_totals', hostname=hostname, totals=totals)
+        return {group: dict(group_totals) for group, group_totals in totals.items()}
+
+    def validate_eds_network(self, hostnames=None, fail_on_critical=False):
+        """
+        Lint the network columns of every EDS host before any connection is attempted
+
+        Flags placeholder or invalid addresses, IPs and gateways outside their
+        declared subnet, masks that contradict the subnet prefix, and duplicate
+        IPs or hostnames. Duplicates are detected across the whole fleet even
+        when only some hosts are reported.
+
+        Args:
+            hostnames: Only report these hosts - list or comma-separated string (default: all)
+            fail_on_critical: Raise instead of returning when critical violations are found
+
+        Returns:
+            dict: Validation results with violations list, counts per check and critical_count
+        """
+        self._require_hostname_index()
+
+        if isinstance(hostnames, str):
+            hostnames = [name.strip() for name in hostnames.split(',') if name.strip()]
+
+        try:
+            results = lint_network(
+                self.server_data, hostnames, row_column=SOURCE_ROW_COLUMN, file_column=SOURCE_FILE_COLUMN
+            )
+        except Exception as e:
+            error(f"Error validating EDS network data: {str(e)}")
+            raise RuntimeError(f"Failed to validate EDS network data: {str(e)}")
+
+        for violation in results['violations']:
+            log.detail('eds_network', "{} row {}: {} - {}",
+                       violation['hostname'], violation['row'], violation['check'], violation['reason'])
+        log.record('validate_eds_network', checked_hosts=results['checked_hosts'], counts=results['counts'])
+
+        if results['critical_count']:
+            warn(f"EDS network validation found {results['critical_count']} critical violations "
+                 f"in {results['checked_hosts']} hosts")
+            if fail_on_critical:
+                summary = '; '.join(
+                    f"{violation['hostname']}: {violation['reason']}"
+                    for violation in results['violations'] if violation['severity'] == 'critical'
+                )
+                raise ValueError(f"CRITICAL: EDS network data is inconsistent - {summary}")
+        else:
+            info(f"EDS network validation passed for {results['checked_hosts']} hosts")
+
+        return results
+
+    def _build_config(self, row):
+        """Build the configuration dict for one EDS row"""
+        # Extract configuration using actual EDS column names
+        # All extractions use safe method - returns 'N/A' if column doesn't exist or is empty
+        config = {
+            # Network Configuration
+            'ip': self._extract_ip(row),
+            'subnet': self._extract_safe(row, 'Subnet', 'N/A'),
+            'mask': self._extract_safe(row, 'Mask', 'N/A'),
+            'gateway': self._extract_safe(row, 'Gateway', 'N/A'),
+            'cname': self._extract_safe(row, 'CNAME', 'N/A'),
+            'domain': self._extract_safe(row, 'DOMAIN', 'N/A'),
+            'vlan_number': self._extract_safe(row, 'VLAN Number', 'N/A'),
+            'vlan_id': self._extract_safe(row, 'VLAN ID (Description of VLAN)', 'N/A'),
+            'teaming_bonding': self._extract_safe(row, 'Teaming Bonding (Y/N)', 'N/A'),
+
+            # Server Configuration
+            'host_description': self._extract_safe(row, 'Host Description', 'N/A'),
+            'cluster_name': self._extract_safe(row, 'Cluster Name', 'N/A'),
+            'container_type': self._extract_safe(row, 'Container Type', 'N/A'),
+            'type': self._extract_safe(row, 'Type', 'N/A'),
+            'purpose': self._extract_safe(row, 'Purpose', 'N/A'),
+            'classification': self._extract_safe(row, 'Classification', 'N/A'),
+            'site': self._extract_safe(row, 'Site', 'N/A'),
+            'environment': self._extract_safe(row, 'Environment', 'N/A'),
+            'trust_level': self._extract_safe(row, 'Trust Level', 'N/A'),
+            'os_type': self._extract_safe(row, 'OS Type', 'N/A'),
+
+            # Hardware Configuration
+            'cpu_cores': self._extract_safe(row, 'Number of CPU Cores (recom)', 'N/A'),
+            'ram': self._extract_safe(row, 'RAM', 'N/A'),
+
+            # Storage Configuration
+            'storage_type': self._extract_safe(row, 'Storage Type', 'N/A'),
+            'storage_total_tb': self._extract_safe(row, 'Storage Total TB', 'N/A'),
+            'drive_volume_group': self._extract_safe(row, 'Drive or Volume Group', 'N/A'),
+            'file_system': self._extract_safe(row, 'Files System', 'N/A'),
+            'logical_volume_partition': self._extract_safe(row, 'Logical Volume Name/Partition (Mounted On)', 'N/A'),
+            'storage_allocation_gb': self._extract_safe(row, 'Storage Allocation (GB)', 'N/A'),
+            'recommended_storage_gb': self._extract_safe(row, 'Recommended Storage Allocation (GB)', 'N/A'),
+            'drive_purpose': self._extract_safe(row, 'Drive Purpose', 'N/A'),
+
+            # Additional fields that may or may not exist in EDS
+            'vxrail_cluster': self._extract_safe(row, 'VxRail Cluster', 'N/A'),
+            'vcenter_host': self._extract_safe(row, 'vCenter Host', 'N/A'),
+            'vm_hardware_version': self._extract_safe(row, 'VM Hardware Version', 'N/A'),
+            'vm_memory_reservation': self._extract_safe(row, 'VM Memory Reservation', 'N/A'),
+            'vm_cpu_reservation': self._extract_safe(row, 'VM CPU Reservation', 'N/A')
+        }
+
+        return config
+
     def _extract_ip(self, row):
         """Extract IP address from EDS row"""
         try:
             ip_col = "IP Assignment"  # Correct column name from EDS
             
-            if ip_col in row.index and pd.notna(row[ip_col]):
+            if not is_missing(row.get(ip_col)):
                 ip_value = str(row[ip_col])
-                ip_match = re.search(r'(\d+\.\d+\.\d+\.\d+)', ip_value)
+                ip_match = IP_PATTERN.search(ip_value)
                 if ip_match:
                     extracted_ip = ip_match.group(1)
-                    info(f"Extracted IP from EDS: {extracted_ip}")
+                    log.detail('eds_field', "Extracted IP from EDS: {}", extracted_ip)
                     return extracted_ip
 
             raise ValueError(f"IP address not found in EDS column '{ip_col}'")
@@ -142,9 +988,9 @@ class EDSLookup:
         """Extract subnet from EDS row"""
         try:
             subnet_col = "Subnet"
-            if subnet_col in row.index and pd.notna(row[subnet_col]):
+            if not is_missing(row.get(subnet_col)):
                 subnet_value = str(row[subnet_col])
-                info(f"Extracted subnet from EDS: {subnet_value}")
+                log.detail('eds_field', "Extracted subnet from EDS: {}", subnet_value)
                 return subnet_value
             raise ValueError(f"Subnet not found in EDS column '{subnet_col}'")
         except Exception as e:
@@ -154,9 +1000,9 @@ class EDSLookup:
         """Extract subnet mask from EDS row"""
         try:
             mask_col = "Mask"
-            if mask_col in row.index and pd.notna(row[mask_col]):
+            if not is_missing(row.get(mask_col)):
                 mask_value = str(row[mask_col])
-                info(f"Extracted mask from EDS: {mask_value}")
+                log.detail('eds_field', "Extracted mask from EDS: {}", mask_value)
                 return mask_value
             raise ValueError(f"Subnet mask not found in EDS column '{mask_col}'")
         except Exception as e:
@@ -166,9 +1012,9 @@ class EDSLookup:
         """Extract gateway from EDS row"""
         try:
             gateway_col = "Gateway"
-            if gateway_col in row.index and pd.notna(row[gateway_col]):
+            if not is_missing(row.get(gateway_col)):
                 gateway_value = str(row[gateway_col])
-                info(f"Extracted gateway from EDS: {gateway_value}")
+                log.detail('eds_field', "Extracted gateway from EDS: {}", gateway_value)
                 return gateway_value
             raise ValueError(f"Gateway not found in EDS column '{gateway_col}'")
         except Exception as e:
@@ -178,9 +1024,9 @@ class EDSLookup:
         """Extract CNAME from EDS row"""
         try:
             cname_col = "CNAME"
-            if cname_col in row.index and pd.notna(row[cname_col]):
+            if not is_missing(row.get(cname_col)):
                 cname_value = str(row[cname_col])
-                info(f"Extracted CNAME from EDS: {cname_value}")
+                log.detail('eds_field', "Extracted CNAME from EDS: {}", cname_value)
                 return cname_value
             raise ValueError(f"CNAME not found in EDS column '{cname_col}'")
         except Exception as e:
@@ -190,9 +1036,9 @@ class EDSLookup:
         """Extract domain from EDS row"""
         try:
             domain_col = "DOMAIN"
-            if domain_col in row.index and pd.notna(row[domain_col]):
+            if not is_missing(row.get(domain_col)):
                 domain_value = str(row[domain_col])
-                info(f"Extracted domain from EDS: {domain_value}")
+                log.detail('eds_field', "Extracted domain from EDS: {}", domain_value)
                 return domain_value
             raise ValueError(f"Domain not found in EDS column '{domain_col}'")
         except Exception as e:
@@ -202,9 +1048,9 @@ class EDSLookup:
         """Extract CPU cores from EDS row"""
         try:
             cpu_col = "Number of CPU Cores (recom)"
-            if cpu_col in row.index and pd.notna(row[cpu_col]):
+            if not is_missing(row.get(cpu_col)):
                 cpu_value = str(row[cpu_col])
-                info(f"Extracted CPU cores from EDS: {cpu_value}")
+                log.detail('eds_field', "Extracted CPU cores from EDS: {}", cpu_value)
                 return cpu_value
             raise ValueError(f"CPU cores not found in EDS column '{cpu_col}'")
         except Exception as e:
@@ -214,9 +1060,9 @@ class EDSLookup:
         """Extract RAM from EDS row"""
         try:
             ram_col = "RAM"
-            if ram_col in row.index and pd.notna(row[ram_col]):
+            if not is_missing(row.get(ram_col)):
                 ram_value = str(row[ram_col])
-                info(f"Extracted RAM from EDS: {ram_value}")
+                log.detail('eds_field', "Extracted RAM from EDS: {}", ram_value)
                 return ram_value
             raise ValueError(f"RAM not found in EDS column '{ram_col}'")
         except Exception as e:
@@ -226,9 +1072,9 @@ class EDSLookup:
         """Extract storage type from EDS row"""
         try:
             storage_col = "Storage Type"
-            if storage_col in row.index and pd.notna(row[storage_col]):
+            if not is_missing(row.get(storage_col)):
                 storage_value = str(row[storage_col])
-                info(f"Extracted storage type from EDS: {storage_value}")
+                log.detail('eds_field', "Extracted storage type from EDS: {}", storage_value)
                 return storage_value
             raise ValueError(f"Storage type not found in EDS column '{storage_col}'")
         except Exception as e:
@@ -238,9 +1084,9 @@ class EDSLookup:
         """Extract total storage TB from EDS row"""
         try:
             storage_col = "Storage Total TB"
-            if storage_col in row.index and pd.notna(row[storage_col]):
+            if not is_missing(row.get(storage_col)):
                 storage_value = str(row[storage_col])
-                info(f"Extracted storage total TB from EDS: {storage_value}")
+                log.detail('eds_field', "Extracted storage total TB from EDS: {}", storage_value)
                 return storage_value
             raise ValueError(f"Storage total TB not found in EDS column '{storage_col}'")
         except Exception as e:
@@ -250,9 +1096,9 @@ class EDSLookup:
         """Extract drive/volume group from EDS row"""
         try:
             drive_col = "Drive or Volume Group"
-            if drive_col in row.index and pd.notna(row[drive_col]):
+            if not is_missing(row.get(drive_col)):
                 drive_value = str(row[drive_col])
-                info(f"Extracted drive/volume group from EDS: {drive_value}")
+                log.detail('eds_field', "Extracted drive/volume group from EDS: {}", drive_value)
                 return drive_value
             raise ValueError(f"Drive/volume group not found in EDS column '{drive_col}'")
         except Exception as e:
@@ -262,9 +1108,9 @@ class EDSLookup:
         """Extract file system from EDS row"""
         try:
             fs_col = "Files System"
-            if fs_col in row.index and pd.notna(row[fs_col]):
+            if not is_missing(row.get(fs_col)):
                 fs_value = str(row[fs_col])
-                info(f"Extracted file system from EDS: {fs_value}")
+                log.detail('eds_field', "Extracted file system from EDS: {}", fs_value)
                 return fs_value
             raise ValueError(f"File system not found in EDS column '{fs_col}'")
         except Exception as e:
@@ -274,9 +1120,9 @@ class EDSLookup:
         """Extract logical volume/partition from EDS row"""
         try:
             lv_col = "Logical Volume Name/Partition (Mounted On)"
-            if lv_col in row.index and pd.notna(row[lv_col]):
+            if not is_missing(row.get(lv_col)):
                 lv_value = str(row[lv_col])
-                info(f"Extracted logical volume/partition from EDS: {lv_value}")
+                log.detail('eds_field', "Extracted logical volume/partition from EDS: {}", lv_value)
                 return lv_value
             raise ValueError(f"Logical volume/partition not found in EDS column '{lv_col}'")
         except Exception as e:
@@ -286,9 +1132,9 @@ class EDSLookup:
         """Extract storage allocation GB from EDS row"""
         try:
             alloc_col = "Storage Allocation (GB)"
-            if alloc_col in row.index and pd.notna(row[alloc_col]):
+            if not is_missing(row.get(alloc_col)):
                 alloc_value = str(row[alloc_col])
-                info(f"Extracted storage allocation GB from EDS: {alloc_value}")
+                log.detail('eds_field', "Extracted storage allocation GB from EDS: {}", alloc_value)
                 return alloc_value
             raise ValueError(f"Storage allocation GB not found in EDS column '{alloc_col}'")
         except Exception as e:
@@ -298,9 +1144,9 @@ class EDSLookup:
         """Extract recommended storage allocation GB from EDS row"""
         try:
             rec_col = "Recommended Storage Allocation (GB)"
-            if rec_col in row.index and pd.notna(row[rec_col]):
+            if not is_missing(row.get(rec_col)):
                 rec_value = str(row[rec_col])
-                info(f"Extracted recommended storage allocation GB from EDS: {rec_value}")
+                log.detail('eds_field', "Extracted recommended storage allocation GB from EDS: {}", rec_value)
                 return rec_value
             raise ValueError(f"Recommended storage allocation GB not found in EDS column '{rec_col}'")
         except Exception as e:
@@ -310,9 +1156,9 @@ class EDSLookup:
         """Extract drive purpose from EDS row"""
         try:
             purpose_col = "Drive Purpose"
-            if purpose_col in row.index and pd.notna(row[purpose_col]):
+            if not is_missing(row.get(purpose_col)):
                 purpose_value = str(row[purpose_col])
-                info(f"Extracted drive purpose from EDS: {purpose_value}")
+                log.detail('eds_field', "Extracted drive purpose from EDS: {}", purpose_value)
                 return purpose_value
             raise ValueError(f"Drive purpose not found in EDS column '{purpose_col}'")
         except Exception as e:
@@ -322,9 +1168,9 @@ class EDSLookup:
         """Extract OS type from EDS row"""
         try:
             os_col = "OS Type"
-            if os_col in row.index and pd.notna(row[os_col]):
+            if not is_missing(row.get(os_col)):
                 os_value = str(row[os_col])
-                info(f"Extracted OS type from EDS: {os_value}")
+                log.detail('eds_field', "Extracted OS type from EDS: {}", os_value)
                 return os_value
             raise ValueError(f"OS type not found in EDS column '{os_col}'")
         except Exception as e:
@@ -333,12 +1179,57 @@ class EDSLookup:
     def _extract_safe(self, row, column_name, default='N/A'):
         """Safely extract a value from EDS row, returning default if not found"""
         try:
-            if column_name in row.index and pd.notna(row[column_name]):
+            if not is_missing(row.get(column_name)):
                 value = str(row[column_name])
-                info(f"Extracted {column_name} from EDS: {value}")
+                log.detail('eds_field', "Extracted {} from EDS: {}", column_name, value)
                 return value
-            info(f"{column_name} not found in EDS, using default: {default}")
+            log.detail('eds_field', "{} not found in EDS, using default: {}", column_name, default)
             return default
         except Exception as e:
             warn(f"Error extracting {column_name} from EDS: {str(e)}, using default: {default}")
-            return default
\ No newline at end of file
+            return default
+
+
+def main():
+    """Command line query of the EDS, printing the matching hostnames for multi-host runs"""
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(
+        description='Select EDS hosts by column predicates',
+        epilog='Example: python library/EDSLookup.py --where "Environment=QA (Staging)" '
+               '--where "Purpose=Itential Redis" --where Site=GDCA | xargs -n1 ./run_tests.sh'
+    )
+    parser.add_argument('--where', action='append', default=[], metavar='COLUMN=VALUE',
+                        help="Predicate, repeatable; VALUE may use '|', wildcards or a leading '!'")
+    parser.add_argument('--eds-files', help='Workbook paths, globs or directories (default: EDS_FILES or the Itential EDS)')
+    parser.add_argument('--format', choices=['lines', 'csv', 'json'], default='lines',
+                        help='One hostname per line (default), comma-separated, or a JSON list')
+    args = parser.parse_args()
+
+    predicates = {}
+    for clause in args.where:
+        column, separator, value = clause.partition('=')
+        if not separator:
+            parser.error(f"Predicate '{clause}' must be COLUMN=VALUE")
+        predicates[column.strip()] = value
+
+    eds_files = None
+    if args.eds_files:
+        eds_files = ','.join(os.path.abspath(source.strip()) for source in args.eds_files.split(',') if source.strip())
+    try:
+        hosts = EDSLookup(eds_files=eds_files).query_eds_hosts(**predicates)
+    except ValueError as e:
+        parser.exit(2, f"Error: {str(e)}\n")
+
+    if args.format == 'json':
+        print(json.dumps(hosts))
+    elif args.format == 'csv':
+        print(','.join(hosts))
+    else:
+        for host in hosts:
+            print(host)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+"""
+F5 Pool Validator Library for Robot Framework
+Indexed lookup of the EDS "F5 GTM-LTM (Optional)" sheet and concurrent health probing of VIP pool members
+"""
+
+import re
+import time
+from robot.api.logger import info, warn, error
+from async_probe import DEFAULT_CONCURRENCY, DEFAULT_TIMEOUT, latency_summary, run_probes
+from eds_cache import load_sheet
+from eds_reader import EDSTable, SheetNotFoundError, is_missing, read_sheet
+from EDSLookup import EDSLookup, IP_PATTERN
+from library_logging import get_logger
+
+
+F5_SHEET_NAME = "F5 GTM-LTM (Optional)"
+
+# Columns read from the F5 sheet; a row that fills any of POOL_COLUMNS starts a new pool
+F5_COLUMNS = [
+    'GTM Alias', 'Cname', 'Port', 'LTM', 'VIP', 'VIPs Name', 'Node Members',
+    'HealthCheck', 'Environment', 'Load Balancing', 'Purpose', 'Release'
+]
+POOL_COLUMNS = ['GTM Alias', 'Cname', 'LTM', 'VIP']
+
+# Protocol assumed for ports listed without one ('80, 443')
+DEFAULT_PORT_PROTOCOLS = {80: 'http', 8080: 'http', 443: 'https', 8443: 'https'}
+
+log = get_logger('F5PoolValidator')
+
+
+class F5PoolValidator:
+    """Library to look up F5 VIP pools from the EDS and probe their members concurrently"""
+
+    ROBOT_LIBRARY_SCOPE = 'GLOBAL'
+
+    def __init__(self, eds_files=None, use_cache=True):
+        """
+        Args:
+            eds_files: EDS workbook sources, as for EDSLookup (default: EDS_FILES or the Itential EDS)
+            use_cache: Load the F5 sheet through the compiled EDS cache (default: True)
+        """
+        self.eds = EDSLookup(eds_files=eds_files, use_cache=use_cache)
+        self.use_cache = use_cache
+        self.pools = []
+        self.vip_index = {}
+        self.member_index = {}
+        self._load_f5_data()
+
+    def _load_f5_data(self):
+        """Read the F5 sheet of every EDS workbook and build the VIP and member indexes"""
+        pools = []
+        for path in self.eds.eds_files:
+            try:
+                if self.use_cache:
+                    table = EDSTable.from_payload(load_sheet(path, F5_SHEET_NAME, self._parse_f5_sheet, columns=F5_COLUMNS))
+                else:
+                    table = read_sheet(path, F5_SHEET_NAME, F5_COLUMNS)
+            except SheetNotFoundError:
+                # The F5 sheet is optional; EDS workbooks without a load balancer simply have no pools
+                warn(f"Sheet '{F5_SHEET_NAME}' not found in {path} - no F5 pools loaded from it")
+                continue
+            except Exception as e:
+                error(f"Error loading F5 sheet from {path}: {str(e)}")
+                raise RuntimeError(f"Failed to load F5 sheet from {path}: {str(e)}")
+
+            pools.extend(self._build_pools(table, path))
+
+        self.pools = pools
+        self.vip_index = {}
+        self.member_index = {}
+        for number, pool in enumerate(pools):
+            for key in (pool['vip'], pool['ltm'], pool['gtm_alias'], pool['cname'], pool['name']):
+                if key:
+                    self.vip_index.setdefault(key.lower(), number)
+            for member in pool['members']:
+                pools_of_member = self.member_index.setdefault(member['name'].lower(), [])
+                if number not in pools_of_member:
+                    pools_of_member.append(number)
+
+        log.record('load_f5_data', workbooks=len(self.eds.eds_files), pools=len(pools),
+                   members=len(self.member_index))
+
+    @staticmethod
+    def _parse_f5_sheet(path, sheet_name, columns):
+        """Parse the F5 sheet into the columnar payload stored in the EDS cache"""
+        return read_sheet(path, sheet_name, columns).to_payload()
+
+    def _build_pools(self, table, path):
+        """Group F5 sheet rows into pools: a row naming a VIP / LTM / GTM alias starts a pool, the next rows add members"""
+        def cell(position, column):
+            value = table.column(column)[position] if column in table.columns else None
+            return '' if is_missing(value) else str(value).strip()
+
+        pools = []
+        current = None
+        for position in range(len(table)):
+            if any(cell(position, column) for column in POOL_COLUMNS):
+                health_check = self._parse_health_check(cell(position, 'HealthCheck'))
+                current = {
+                    'name': cell(position, 'LTM') or cell(position, 'GTM Alias') or cell(position, 'VIP') or cell(position, 'Cname'),
+                    'gtm_alias': cell(position, 'GTM Alias'),
+                    'cname': cell(position, 'Cname'),
+                    'ltm': cell(position, 'LTM'),
+                    'vip': cell(position, 'VIP'),
+                    'vip_name': cell(position, 'VIPs Name'),
+                    'ports': self._parse_ports(cell(position, 'Port')),
+                    'health_path': health_check['path'],
+                    'health_expect': health_check['expect'],
+                    'environment': cell(position, 'Environment'),
+                    'load_balancing': cell(position, 'Load Balancing'),
+                    'purpose': cell(position, 'Purpose'),
+                    'release': cell(position, 'Release'),
+                    'file': path,
+                    'row': table.row_numbers[position],
+                    'members': []
+                }
+                pools.append(current)
+
+            members = self._parse_members(cell(position, 'Node Members'))
+            if not members:
+                continue
+            if current is None:
+                warn(f"F5 members {[member['name'] for member in members]} in {path} row "
+                     f"{table.row_numbers[position]} precede any VIP - ignored")
+                continue
+            current['members'].extend(members)
+
+        return pools
+
+    @staticmethod
+    def _parse_ports(value):
+        """Parse a Port cell such as '3443/https\\n3000/http' or '80, 443' into [{'port', 'protocol'}]"""
+        ports = []
+        for port, protocol in re.findall(r'(\d+)\s*(?:/\s*([A-Za-z]+))?', value):
+            port = int(port)
+            protocol = protocol.lower() if protocol else DEFAULT_PORT_PROTOCOLS.get(port, 'tcp')
+            ports.append({'port': port, 'protocol': protocol if protocol in ('http', 'https') else 'tcp'})
+        return ports
+
+    @staticmethod
+    def _parse_health_check(value):
+        """Parse a HealthCheck cell such as 'HTTP GET /f5healthcheck.html\\nResponse String: Alive'"""
+        path = re.search(r'GET\s+(\S+)', value, re.IGNORECASE)
+        expect = re.search(r'Response String:\s*(.+)', value, re.IGNORECASE)
+        return {
+            'path': path.group(1) if path else '/',
+            'expect': expect.group(1).strip() if expect else None
+        }
+
+    @staticmethod
+    def _parse_members(value):
+        """Parse a Node Members cell into [{'name', 'address'}]; one member per line, 'NAME [IP]'"""
+        members = []
+        for line in re.split(r'[\r\n,;]+', value):
+            tokens = line.split()
+            if not tokens:
+                continue
+            addresses = [token for token in tokens if IP_PATTERN.fullmatch(token)]
+            names = [token for token in tokens if not IP_PATTERN.fullmatch(token)]
+            members.append({
+                'name': names[0] if names else addresses[0],
+                'address': addresses[0] if addresses else None
+            })
+        return members
+
+    def _require_pool(self, vip):
+        """Return the pool for a VIP address, LTM name, GTM alias or CNAME, or raise"""
+        number = self.vip_index.get(str(vip).strip().lower())
+        if number is None:
+            error(f"VIP '{vip}' not found in EDS sheet '{F5_SHEET_NAME}'")
+            raise ValueError(f"CRITICAL: VIP '{vip}' not found in EDS sheet '{F5_SHEET_NAME}'. Cannot proceed with validation.")
+        return self.pools[number]
+
+    def _lookup_member_addresses(self, pools):
+        """
+        Look up the EDS IP Assignment of pool members listed without an address
+
+        Goes through EDSLookup.lookup_server_configs, so the Server Requirements
+        index is refreshed first when a workbook changed on disk.
+
+        Returns:
+            dict: Member name -> (address, source) where source is 'eds', or 'dns'
+                  when the member is not in the EDS and its name is probed as is
+        """
+        names = sorted({member['name'] for pool in pools for member in pool['members'] if not member['address']})
+        if not names:
+            return {}
+
+        try:
+            configs = self.eds.lookup_server_configs(names, ignore_missing=True)
+        except ValueError:
+            # A member in the EDS without an IP Assignment fails the batch; look the members up one by one
+            configs = {}
+            for name in names:
+                try:
+                    configs[name] = self.eds.lookup_server_config(name)
+                except ValueError:
+                    continue
+        except RuntimeError as e:
+            warn(f"EDS Server Requirements not available - F5 members without an IP are probed by name: {str(e)}")
+            configs = {}
+
+        return {name: (configs[name]['ip'], 'eds') if name in configs else (name, 'dns') for name in names}
+
+    def reload_f5_data(self):
+        """
+        Reload the EDS workbooks and rebuild the F5 pool indexes
+
+        Returns:
+            int: Number of pools loaded
+        """
+        self.eds.reload_eds_data()
+        self._load_f5_data()
+        info(f"Reloaded F5 data: {len(self.pools)} pools")
+        return len(self.pools)
+
+    def get_f5_pools(self):
+        """
+        Get every F5 pool defined in the EDS
+
+        Returns:
+            list: One dict per pool with name, gtm_alias, cname, ltm, vip, ports,
+                  health_path, health_expect, environment, file, row and members
+        """
+        return [dict(pool, members=[dict(member) for member in pool['members']]) for pool in self.pools]
+
+    def get_f5_pool_members(self, vip):
+        """
+        Get the members of the pool behind a VIP
+
+        Args:
+            vip: VIP address, LTM name, GTM alias or CNAME (case-insensitive)
+
+        Returns:
+            list: Member dicts with 'name' and 'address' (address is None when the sheet lists only a hostname)
+        """
+        pool = self._require_pool(vip)
+        log.record('get_f5_pool_members', vip=vip, pool=pool['name'], members=len(pool['members']))
+        return [dict(member) for member in pool['members']]
+
+    def get_f5_vips_for_member(self, member):
+        """
+        Get the pools a node is a member of
+
+        Args:
+            member: Member hostname as listed in Node Members (case-insensitive)
+
+        Returns:
+            list: Pool names (LTM name, else GTM alias, VIP or CNAME); empty if the node is in no pool
+        """
+        numbers = self.member_index.get(str(member).strip().lower(), [])
+        return [self.pools[number]['name'] for number in numbers]
+
+    def probe_f5_pool_members(self, vip=None, concurrency=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT,
+                              http_checks=True, fail_on_unhealthy=False):
+        """
+        Probe every member and port of one or all F5 pools concurrently
+
+        HTTP and HTTPS ports get an HTTP GET of the pool's health check path
+        (and its response string when the sheet defines one); other ports get a
+        TCP connect. All probes run at once under the concurrency limit, so a
+        pool is checked in about one round trip.
+
+        Args:
+            vip: Pool to probe - VIP address, LTM name, GTM alias or CNAME (default: all pools)
+            concurrency: Maximum probes in flight at once (default: 50)
+            timeout: Seconds allowed per probe (default: 3)
+            http_checks: Send HTTP health checks on HTTP(S) ports; False probes TCP only
+            fail_on_unhealthy: Raise instead of returning when any probe fails
+
+        Returns:
+            dict: Validation results with probes list, violations list, total_probes,
+                  violations_count, latency summary and elapsed_ms
+        """
+        pools = [self._require_pool(vip)] if vip else self.pools
+
+        # Address order: the IP written in the F5 sheet, the member's IP Assignment in the EDS, its name (DNS)
+        eds_addresses = self._lookup_member_addresses(pools)
+        probes = []
+        for pool in pools:
+            for member in pool['members']:
+                if member['address']:
+                    address, source = member['address'], 'f5_sheet'
+                else:
+                    address, source = eds_addresses[member['name']]
+                for port in pool['ports']:
+                    kind = port['protocol'] if http_checks else 'tcp'
+                    probes.append({
+                        'pool': pool['name'],
+                        'member': member['name'],
+                        'host': address,
+                        'address_source': source,
+                        'port': port['port'],
+                        'kind': kind,
+                        'path': pool['health_path'] if kind != 'tcp' else None,
+                        'expect': pool['health_expect'] if kind != 'tcp' else None
+                    })
+
+        if not probes:
+            warn(f"No F5 pool members to probe{f' for {vip}' if vip else ''}")
+
+        try:
+            start = time.perf_counter()
+            results = run_probes(probes, int(concurrency), float(timeout))
+            elapsed_ms = round((time.perf_counter() - start) * 1000, 2)
+        except Exception as e:
+            error(f"Error probing F5 pool members: {str(e)}")
+            raise RuntimeError(f"Failed to probe F5 pool members: {str(e)}")
+
+        violations = [
+            {
+                'pool': result['pool'],
+                'member': result['member'],
+                'host': result['host'],
+                'port': result['port'],
+                'reason': result['error'],
+                'severity': 'critical'
+            }
+            for result in results if not result['ok']
+        ]
+        for result in results:
+            log.detail('f5_probe', "{} {} {}:{} {} - {}", result['pool'], result['member'], result['host'],
+                       result['port'], result['kind'], 'OK' if result['ok'] else result['error'])
+
+        summary = {
+            'probes': results,
+            'violations': violations,
+            'total_pools': len(pools),
+            'total_probes': len(results),
+            'violations_count': len(violations),
+            'latency': latency_summary(results),
+            'elapsed_ms': elapsed_ms
+        }
+        log.record('probe_f5_pool_members', vip=vip, pools=len(pools), probes=len(results),
+                   failed=len(violations), elapsed_ms=elapsed_ms)
+
+        if violations:
+            warn(f"F5 pool probing found {len(violations)} unhealthy member ports out of {len(results)}")
+            if fail_on_unhealthy:
+                details = '; '.join(f"{v['member']} ({v['host']}:{v['port']}): {v['reason']}" for v in violations)
+                raise ValueError(f"CRITICAL: F5 pool members unhealthy - {details}")
+        else:
+            info(f"All {len(results)} F5 pool member probes passed in {elapsed_ms}ms")
+
+        return summary
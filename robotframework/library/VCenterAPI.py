@@ -3,11 +3,26 @@ VCenter API Library for Robot Framework
 Provides vCenter API interactions for VM validation and configuration queries
 """
 
-from pyVim.connect import SmartConnect, Disconnect
 from pyVmomi import vim
-import ssl
-import atexit
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from robot.api.logger import info, warn, error
+from EDSLookup import EDSLookup
+from library_logging import get_logger
+import vcenter_connection
+from vcenter_session_cache import session_cache_enabled
+from vcenter_inventory import (
+    DEFAULT_INVENTORY_TTL, collect_vm_details, collect_vm_inventory, collect_vms_details, eds_host_records,
+    reconcile, write_report
+)
+from vcenter_snapshot import VCenterSnapshot, capture_snapshot, open_snapshot, snapshot_enabled
+
+
+log = get_logger('VCenterAPI')
+
+# Concurrent per-VM requests of Get VMs Comprehensive Details
+DEFAULT_MAX_WORKERS = 8
 
 
 class VCenterAPI:
@@ -15,10 +30,29 @@ class VCenterAPI:
 
     ROBOT_LIBRARY_SCOPE = 'GLOBAL'
 
-    def __init__(self):
+    def __init__(self, inventory_ttl=DEFAULT_INVENTORY_TTL, session_cache=None, snapshot=None, snapshot_file=None):
+        """
+        Args:
+            inventory_ttl: Seconds VM name lookups are served from the cached inventory index (default: 300)
+            session_cache: Reuse vCenter sessions across robot processes through the on-disk
+                           session cache (default: the VCENTER_SESSION_CACHE environment variable)
+            snapshot: Answer from the inventory snapshot of Capture vCenter Snapshot instead of
+                      connecting, when one exists (default: the VCENTER_SNAPSHOT environment variable)
+            snapshot_file: Snapshot file (default: VCENTER_SNAPSHOT_FILE or .cache/vcenter/snapshot.sqlite)
+        """
+        self.inventory_ttl = float(inventory_ttl)
+        self.session_cache = session_cache_enabled(session_cache)
+        self.snapshot_enabled = snapshot_enabled(snapshot)
+        self.snapshot_file = snapshot_file
+        # Open snapshot while answering from it; None when connected to vCenter
+        self.snapshot = None
+        # Pooled session, shared with VCenterLibrary when both connect to the same host as the same user with the same SSL verification
+        self.connection = None
         self.service_instance = None
         self.content = None
         self.session_id = None
+        # SOAP requests per method / lazily fetched property of the pooled session
+        self.api_calls = Counter()
 
     def connect_to_vcenter(self, vcenter_host, username, password, port=443, verify_ssl=False):
         """
@@ -45,29 +79,26 @@ class VCenterAPI:
             if not vcenter_host or vcenter_host == 'N/A':
                 raise ValueError("vCenter host not provided")
 
-            # Create SSL context
-            if not verify_ssl:
-                ssl_context = ssl._create_unverified_context()
-            else:
-                ssl_context = ssl.create_default_context()
-
-            # Connect to vCenter
-            self.service_instance = SmartConnect(
-                host=vcenter_host,
-                user=username,
-                pwd=password,
-                port=int(port),
-                sslContext=ssl_context
+            if self.connection is not None or self.snapshot is not None:
+                self.disconnect_from_vcenter()
+
+            # Answer from the run's inventory snapshot without connecting when there is one
+            if self.snapshot_enabled:
+                self.snapshot, reason = open_snapshot(self.snapshot_file, vcenter_host)
+                if self.snapshot is not None:
+                    self.session_id = f"snapshot:{self.snapshot.captured_at}"
+                    info(f"Answering vCenter queries from snapshot {self.snapshot.path} "
+                         f"captured {self.snapshot.captured_at} - not connecting")
+                    return self.session_id
+                info(f"vCenter snapshot not used: {reason}")
+
+            # Take the pooled session for this host and user, logging in on first use
+            self.connection = vcenter_connection.connect(
+                vcenter_host, username, password, port=port, verify_ssl=verify_ssl,
+                session_cache=self.session_cache
             )
-
-            if not self.service_instance:
-                raise RuntimeError("Failed to connect to vCenter - no service instance returned")
-
-            # Register disconnect at exit
-            atexit.register(Disconnect, self.service_instance)
-
-            # Get content
-            self.content = self.service_instance.RetrieveContent()
+            self.api_calls = self.connection.api_calls
+            self._ensure_connected()
 
             # Generate session ID
             self.session_id = self.service_instance.content.sessionManager.currentSession.key
@@ -81,11 +112,25 @@ class VCenterAPI:
             error(f"Failed to connect to vCenter {vcenter_host}: {str(e)}")
             raise RuntimeError(f"vCenter connection failed: {str(e)}")
 
-    def disconnect_from_vcenter(self):
-        """Disconnect from vCenter API session"""
+    def disconnect_from_vcenter(self, logout=None):
+        """
+        Disconnect from vCenter API session
+
+        The pooled session stays open while VCenterLibrary still uses it.
+
+        Args:
+            logout: End the vCenter session once unused (default: only when the session cache is off,
+                    so cached sessions stay valid for the next robot process)
+        """
         try:
-            if self.service_instance:
-                Disconnect(self.service_instance)
+            if self.snapshot is not None:
+                self.snapshot.close()
+                self.snapshot = None
+                self.session_id = None
+                info("Closed vCenter snapshot")
+            if self.connection:
+                connection, self.connection = self.connection, None
+                vcenter_connection.release(connection, logout)
                 info("Disconnected from vCenter API")
                 self.service_instance = None
                 self.content = None
@@ -97,6 +142,9 @@ class VCenterAPI:
         """
         Get comprehensive VM configuration details from vCenter
 
+        The VM hardware, its host, cluster and network names are fetched in a
+        single RetrievePropertiesEx call instead of one round trip per property.
+
         Args:
             vm_name: Name of the VM to query
 
@@ -104,54 +152,287 @@ class VCenterAPI:
             dict: Comprehensive VM details including cluster, CPU, memory, network, disk
         """
         try:
-            if not self.service_instance or not self.content:
-                raise RuntimeError("Not connected to vCenter - call Connect To VCenter first")
+            if self.snapshot is None:
+                self._ensure_connected()
 
             info(f"Searching for VM: {vm_name}")
+            calls_before = sum(self.api_calls.values())
 
-            # Find the VM
-            vm = self._get_vm_by_name(vm_name)
+            if self.snapshot is not None:
+                vm_details = self._get_snapshot_vm_details(vm_name)
+            else:
+                # Find the VM
+                vm = self._get_vm_by_name(vm_name)
+
+                if not vm:
+                    raise ValueError(f"VM '{vm_name}' not found in vCenter")
+
+                log.detail('vm', "Found VM: {}", vm_name)
+
+                # Collect comprehensive details in one property collector round trip
+                vm_details = self._build_vm_details(collect_vm_details(self.content, vm), vm_name)
+
+            log.record(
+                'get_vm_comprehensive_details',
+                vm=vm_name,
+                cluster=vm_details['cluster_placement']['cluster_name'],
+                host=vm_details['cluster_placement']['host_name'],
+                cpu_count=vm_details['configuration']['cpu_count'],
+                memory_size_gb=vm_details['configuration']['memory_size_gb'],
+                network_adapters=len(vm_details['network_adapters']),
+                disks=len(vm_details['disk_configuration']),
+                api_calls=sum(self.api_calls.values()) - calls_before
+            )
 
-            if not vm:
-                raise ValueError(f"VM '{vm_name}' not found in vCenter")
+            return vm_details
 
-            info(f"Found VM: {vm_name}")
+        except Exception as e:
+            error(f"Failed to get VM details for {vm_name}: {str(e)}")
+            raise RuntimeError(f"Failed to retrieve VM details: {str(e)}")
 
-            # Collect comprehensive details
-            vm_details = {
-                'name': vm.name,
-                'cluster_placement': self._get_cluster_placement(vm),
-                'configuration': self._get_vm_configuration(vm),
-                'network_adapters': self._get_network_adapters(vm),
-                'disk_configuration': self._get_disk_configuration(vm)
-            }
+    def get_vms_comprehensive_details(self, vm_names, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Get comprehensive configuration details of several VMs in one batch
 
-            info(f"Successfully collected comprehensive details for VM: {vm_name}")
+        Names are resolved through the shared inventory index and all found VMs
+        are fetched with one batched RetrievePropertiesEx call. The remaining
+        per-VM work (DNS-name lookups of names not in the index, placement of
+        templates) runs on a bounded thread pool over the same session. A VM
+        that is missing or fails is reported in its own result and does not
+        fail the batch. In snapshot mode every VM is read from the snapshot.
 
-            return vm_details
+        Args:
+            vm_names: VM names - list or comma-separated string
+            max_workers: Maximum concurrent per-VM requests (default: 8)
 
+        Returns:
+            list: One dict per name, in order, with vm_name, success, details
+                  (as returned by Get VM Comprehensive Details, or None) and error
+        """
+        if self.snapshot is None:
+            self._ensure_connected()
+
+        if isinstance(vm_names, str):
+            vm_names = [name.strip() for name in vm_names.split(',') if name.strip()]
+        vm_names = list(vm_names)
+        results = [{'vm_name': name, 'success': False, 'details': None, 'error': None} for name in vm_names]
+
+        start = time.perf_counter()
+        calls_before = sum(self.api_calls.values())
+        workers = max(1, min(int(max_workers), len(vm_names) or 1))
+        if self.snapshot is not None:
+            for result in results:
+                try:
+                    result['details'] = self._get_snapshot_vm_details(result['vm_name'])
+                    result['success'] = True
+                except ValueError as e:
+                    result['error'] = str(e)
+        else:
+            self._get_live_vms_details(results, workers)
+
+        elapsed_ms = round((time.perf_counter() - start) * 1000, 2)
+        failed = [result for result in results if not result['success']]
+        for result in failed:
+            log.detail('vm', "{}: {}", result['vm_name'], result['error'])
+        log.record('get_vms_comprehensive_details', vms=len(results), failed=len(failed), workers=workers,
+                   api_calls=sum(self.api_calls.values()) - calls_before, elapsed_ms=elapsed_ms)
+
+        if failed:
+            warn(f"Details unavailable for {len(failed)} of {len(results)} VMs: "
+                 f"{', '.join(result['vm_name'] for result in failed[:20])}")
+        else:
+            info(f"Retrieved details of {len(results)} VMs in {elapsed_ms}ms")
+        return results
+
+    def _get_live_vms_details(self, results, workers):
+        """Fill batch results from vCenter: look the VMs up, then fetch them in one batched retrieval"""
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            vms = list(executor.map(self._find_vm_safely, [result['vm_name'] for result in results]))
+
+            found = [(result, vm) for result, vm in zip(results, vms) if isinstance(vm, vim.VirtualMachine)]
+            for result, vm in zip(results, vms):
+                if vm is None:
+                    result['error'] = f"VM '{result['vm_name']}' not found in vCenter"
+                elif not isinstance(vm, vim.VirtualMachine):
+                    result['error'] = f"VM lookup failed: {vm}"
+
+            try:
+                details = collect_vms_details(self.content, [vm for _, vm in found]) if found else {}
+            except Exception as e:
+                error(f"Failed to retrieve details of {len(found)} VMs: {str(e)}")
+                for result, _ in found:
+                    result['error'] = f"Failed to retrieve VM details: {str(e)}"
+                found = []
+
+            def build(item):
+                result, vm = item
+                try:
+                    result['details'] = self._build_vm_details(details[vm._moId], result['vm_name'])
+                    result['success'] = True
+                except Exception as e:
+                    result['error'] = f"Failed to retrieve VM details: {str(e)}"
+
+            list(executor.map(build, found))
+
+    def _find_vm_safely(self, vm_name):
+        """Look up a VM for a batch; return the error message instead of raising"""
+        try:
+            return self._get_vm_by_name(vm_name)
         except Exception as e:
-            error(f"Failed to get VM details for {vm_name}: {str(e)}")
-            raise RuntimeError(f"Failed to retrieve VM details: {str(e)}")
+            return str(e) or type(e).__name__
+
+    def _build_vm_details(self, details, vm_name):
+        """Build the comprehensive details dict of one VM from its collect_vms_details entry"""
+        devices = details['vm'].get('config.hardware.device') or []
+        return {
+            'name': details['vm'].get('name', vm_name),
+            'cluster_placement': self._get_cluster_placement(details),
+            'configuration': self._get_vm_configuration(details['vm']),
+            'network_adapters': self._get_network_adapters(devices, details['networks']),
+            'disk_configuration': self._get_disk_configuration(devices)
+        }
+
+    def reconcile_vcenter_inventory_with_eds(self, eds_files=None, output_file=None, fail_on_drift=False):
+        """
+        Compare every EDS host with its VM in one pass over the whole vCenter inventory
+
+        The VM inventory is fetched with bulk property retrieval (a page of VMs
+        per round trip) and joined against the EDS Server Requirements hosts on
+        hostname, so CPU, RAM, cluster and disk drift are reported for the whole
+        fleet without a per-host lookup.
+
+        Args:
+            eds_files: EDS workbook sources, as for EDSLookup (default: EDS_FILES or the Itential EDS)
+            output_file: Also write the per-host drift report to this CSV file (optional)
+            fail_on_drift: Raise instead of returning when any host has drifted
+
+        Returns:
+            dict: Reconciliation results with rows (one per EDS host), violations list,
+                  counts per check, total_hosts, matched_hosts, unmanaged_vms,
+                  violations_count, total_vms and elapsed_ms
+        """
+        try:
+            if self.snapshot is None:
+                self._ensure_connected()
+
+            start = time.perf_counter()
+            eds = EDSLookup(eds_files=eds_files)
+            if self.snapshot is not None:
+                inventory = self.snapshot.vm_inventory()
+            else:
+                inventory = collect_vm_inventory(self.content)
+            info(f"Collected {len(inventory)} VMs from vCenter inventory")
+
+            results = reconcile(eds_host_records(eds), inventory)
+            results['total_vms'] = len(inventory)
+            results['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 2)
+            if output_file:
+                write_report(results, output_file)
+                info(f"Reconciliation report saved to: {output_file}")
+
+        except Exception as e:
+            error(f"Failed to reconcile vCenter inventory with EDS: {str(e)}")
+            raise RuntimeError(f"Failed to reconcile vCenter inventory with EDS: {str(e)}")
+
+        for violation in results['violations']:
+            log.detail('reconcile', "{}: {} - {}", violation['hostname'], violation['check'], violation['reason'])
+        log.record('reconcile_vcenter_inventory_with_eds', hosts=results['total_hosts'], vms=results['total_vms'],
+                   matched=results['matched_hosts'], counts=results['counts'], elapsed_ms=results['elapsed_ms'])
+
+        drifted = [violation for violation in results['violations'] if violation['severity'] == 'critical']
+        if results['violations']:
+            warn(f"vCenter reconciliation found {len(drifted)} drifted settings and "
+                 f"{results['counts']['missing_in_vcenter']} EDS hosts missing from vCenter")
+            if fail_on_drift and drifted:
+                details = '; '.join(f"{v['hostname']}: {v['reason']}" for v in drifted[:20])
+                raise ValueError(f"CRITICAL: VM configuration drifted from EDS - {details}")
+        else:
+            info(f"All {results['total_hosts']} EDS hosts match vCenter in {results['elapsed_ms']}ms")
+
+        return results
+
+    def capture_vcenter_snapshot(self, snapshot_file=None):
+        """
+        Capture the vCenter inventory into a local snapshot and answer later keywords from it
+
+        VMs, hosts, clusters, datastores, VM devices and portgroups are pulled
+        with one bulk property retrieval and written to an indexed SQLite file.
+        This library then answers from the snapshot for the rest of the run;
+        other robot processes (and VCenterLibrary) use it when created with
+        snapshot=True or run with VCENTER_SNAPSHOT=1.
+
+        Args:
+            snapshot_file: Snapshot file to write (default: the library's snapshot_file)
+
+        Returns:
+            dict: path, captured_at, the number of vms, hosts, clusters, datastores,
+                  portgroups and devices, api_calls and elapsed_ms
+        """
+        try:
+            self._ensure_connected()
+
+            start = time.perf_counter()
+            calls_before = sum(self.api_calls.values())
+            summary = capture_snapshot(self.content, snapshot_file or self.snapshot_file, vcenter=self.connection.host)
+            summary['api_calls'] = sum(self.api_calls.values()) - calls_before
+            summary['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 2)
+
+            self.snapshot_enabled = True
+            self.snapshot_file = summary['path']
+            if self.snapshot is not None:
+                self.snapshot.close()
+            self.snapshot = VCenterSnapshot(summary['path'])
+
+            log.record('capture_vcenter_snapshot', **summary)
+            info(f"Captured vCenter snapshot of {summary['vms']} VMs, {summary['hosts']} hosts and "
+                 f"{summary['datastores']} datastores to {summary['path']} in {summary['elapsed_ms']}ms")
+            return summary
+
+        except Exception as e:
+            error(f"Failed to capture vCenter snapshot: {str(e)}")
+            raise RuntimeError(f"vCenter snapshot capture failed: {str(e)}")
+
+    def get_vcenter_api_call_counts(self):
+        """
+        Get the number of SOAP requests sent over the pooled vCenter session since it was opened
+
+        Returns:
+            dict: 'total' plus one count per method, lazily fetched properties as 'Fetch <property>'
+        """
+        counts = dict(sorted(self.api_calls.items()))
+        counts['total'] = sum(self.api_calls.values())
+        return counts
+
+    def reset_vcenter_api_call_counts(self):
+        """Reset the vCenter SOAP request counters"""
+        self.api_calls.clear()
+
+    def refresh_vcenter_inventory_index(self):
+        """Drop the cached VM name index so the next lookup reads the inventory again"""
+        if self.snapshot is None and self.connection is not None and self.connection.inventory is not None:
+            self.connection.inventory.invalidate()
+
+    def _ensure_connected(self):
+        """Health-check the pooled session, reconnecting if vCenter expired it, and refresh content"""
+        if self.connection is None:
+            raise RuntimeError("Not connected to vCenter - call Connect To VCenter first")
+        self.content = self.connection.ensure_alive()
+        self.service_instance = self.connection.service_instance
+
+    def _get_snapshot_vm_details(self, vm_name):
+        """Comprehensive details of a VM, found by name or exact DNS name, from the snapshot"""
+        moid = self.snapshot.find_vm(vm_name)
+        if moid is None:
+            raise ValueError(f"VM '{vm_name}' not found in vCenter snapshot {self.snapshot.path}")
+        log.detail('vm', "Found VM in snapshot: {}", vm_name)
+        return self.snapshot.vm_details(moid)
 
     def _get_vm_by_name(self, vm_name):
-        """Find a VM by name in vCenter inventory"""
-        container = self.content.viewManager.CreateContainerView(
-            self.content.rootFolder,
-            [vim.VirtualMachine],
-            True
-        )
-
-        for vm in container.view:
-            if vm.name == vm_name:
-                container.Destroy()
-                return vm
-
-        container.Destroy()
-        return None
-
-    def _get_cluster_placement(self, vm):
-        """Get cluster placement information for VM"""
+        """Find a VM by name (or exact DNS name) through the pooled session's inventory index"""
+        return self.connection.inventory_index(self.inventory_ttl).find(vim.VirtualMachine, vm_name)
+
+    def _get_cluster_placement(self, details):
+        """Get cluster placement information for VM from collect_vm_details output"""
         try:
             cluster_info = {
                 'cluster_name': 'N/A',
@@ -160,17 +441,24 @@ class VCenterAPI:
             }
 
             # Get host
-            if vm.runtime.host:
-                cluster_info['host_name'] = vm.runtime.host.name
-                info(f"VM Host: {cluster_info['host_name']}")
+            host = details['vm'].get('runtime.host')
+            if host:
+                if host._moId in details['hosts']:
+                    cluster_info['host_name'] = details['hosts'][host._moId]
+                    cluster = details['compute_resource']
+                    cluster_name = details['compute_resource_name']
+                else:
+                    # Templates have no resource pool to traverse; read the host directly
+                    cluster_info['host_name'] = host.name
+                    cluster = host.parent
+                    cluster_name = cluster.name if isinstance(cluster, vim.ClusterComputeResource) else None
+                log.detail('vm_placement', "VM Host: {}", cluster_info['host_name'])
 
                 # Get cluster from host
-                if hasattr(vm.runtime.host, 'parent') and vm.runtime.host.parent:
-                    if isinstance(vm.runtime.host.parent, vim.ClusterComputeResource):
-                        cluster = vm.runtime.host.parent
-                        cluster_info['cluster_name'] = cluster.name
-                        cluster_info['cluster_id'] = cluster._moId
-                        info(f"VM Cluster: {cluster_info['cluster_name']}")
+                if isinstance(cluster, vim.ClusterComputeResource):
+                    cluster_info['cluster_name'] = cluster_name
+                    cluster_info['cluster_id'] = cluster._moId
+                    log.detail('vm_placement', "VM Cluster: {}", cluster_info['cluster_name'])
 
             return cluster_info
 
@@ -182,22 +470,21 @@ class VCenterAPI:
                 'host_name': 'N/A'
             }
 
-    def _get_vm_configuration(self, vm):
-        """Get VM hardware configuration"""
+    def _get_vm_configuration(self, props):
+        """Get VM hardware configuration from the retrieved VM properties"""
         try:
-            config = vm.config
-
             configuration = {
-                'cpu_count': config.hardware.numCPU,
-                'cores_per_socket': config.hardware.numCoresPerSocket,
-                'memory_size_mb': config.hardware.memoryMB,
-                'memory_size_gb': round(config.hardware.memoryMB / 1024, 2),
-                'hardware_version': config.version
+                'cpu_count': props['config.hardware.numCPU'],
+                'cores_per_socket': props['config.hardware.numCoresPerSocket'],
+                'memory_size_mb': props['config.hardware.memoryMB'],
+                'memory_size_gb': round(props['config.hardware.memoryMB'] / 1024, 2),
+                'hardware_version': props['config.version']
             }
 
-            info(f"CPU: {configuration['cpu_count']} cores ({configuration['cores_per_socket']} per socket)")
-            info(f"Memory: {configuration['memory_size_gb']} GB")
-            info(f"Hardware Version: {configuration['hardware_version']}")
+            log.detail('vm_configuration', "CPU: {} cores ({} per socket)",
+                       configuration['cpu_count'], configuration['cores_per_socket'])
+            log.detail('vm_configuration', "Memory: {} GB", configuration['memory_size_gb'])
+            log.detail('vm_configuration', "Hardware Version: {}", configuration['hardware_version'])
 
             return configuration
 
@@ -205,18 +492,18 @@ class VCenterAPI:
             error(f"Error getting VM configuration: {str(e)}")
             raise
 
-    def _get_network_adapters(self, vm):
-        """Get VM network adapter configuration"""
+    def _get_network_adapters(self, devices, networks):
+        """Get VM network adapter configuration from its devices and the retrieved network names"""
         try:
             adapters = []
 
-            for device in vm.config.hardware.device:
+            for device in devices:
                 if isinstance(device, vim.vm.device.VirtualEthernetCard):
                     # Get network name
                     network_name = 'Unknown'
                     if hasattr(device, 'backing'):
                         if hasattr(device.backing, 'network') and device.backing.network:
-                            network_name = device.backing.network.name
+                            network_name = networks.get(device.backing.network._moId, 'Unknown')
                         elif hasattr(device.backing, 'port') and hasattr(device.backing.port, 'portgroupKey'):
                             # Distributed port group
                             network_name = device.backing.port.portgroupKey
@@ -229,7 +516,8 @@ class VCenterAPI:
                     }
 
                     adapters.append(adapter_info)
-                    info(f"Network Adapter: {adapter_info['label']} - {adapter_info['type']} on {adapter_info['network_name']}")
+                    log.detail('network_adapter', "Network Adapter: {} - {} on {}",
+                               adapter_info['label'], adapter_info['type'], adapter_info['network_name'])
 
             return adapters
 
@@ -237,12 +525,12 @@ class VCenterAPI:
             warn(f"Error getting network adapters: {str(e)}")
             return []
 
-    def _get_disk_configuration(self, vm):
-        """Get VM disk configuration"""
+    def _get_disk_configuration(self, devices):
+        """Get VM disk configuration from its devices"""
         try:
             disks = []
 
-            for device in vm.config.hardware.device:
+            for device in devices:
                 if isinstance(device, vim.vm.device.VirtualDisk):
                     # Get disk capacity in GB
                     capacity_bytes = device.capacityInBytes if hasattr(device, 'capacityInBytes') else device.capacityInKB * 1024
@@ -260,7 +548,8 @@ class VCenterAPI:
                     }
 
                     disks.append(disk_info)
-                    info(f"Disk: {disk_info['label']} - {disk_info['capacity_gb']} GB ({disk_info['type']})")
+                    log.detail('disk', "Disk: {} - {} GB ({})",
+                               disk_info['label'], disk_info['capacity_gb'], disk_info['type'])
 
             return disks
 
@@ -8,6 +8,10 @@ import json
 from requests.auth import HTTPBasicAuth
 from datetime import datetime, timedelta
 from robot.api.logger import info, warn, error
+from vcenter_session_cache import REST_SESSION, forget_session, load_session, save_session, session_cache_enabled
+
+# REST sessions are cached per host and user; the REST API is always on the HTTPS port
+REST_PORT = 443
 
 
 class VCenterAPILibrary:
@@ -15,10 +19,18 @@ class VCenterAPILibrary:
 
     ROBOT_LIBRARY_SCOPE = 'GLOBAL'
 
-    def __init__(self):
+    def __init__(self, session_cache=None):
+        """
+        Args:
+            session_cache: Reuse vCenter sessions across robot processes through the on-disk
+                           session cache (default: the VCENTER_SESSION_CACHE environment variable)
+        """
+        self.session_cache = session_cache_enabled(session_cache)
         self.session = None
         self.api_base_url = None
         self.session_id = None
+        self.vcenter_server = None
+        self.username = None
 
     def connect_to_vcenter_api(self, vcenter_server, username, password, verify_ssl=False):
         """
@@ -46,12 +58,29 @@ class VCenterAPILibrary:
 
             # Set API base URL
             self.api_base_url = f"https://{vcenter_server}/api"
+            self.vcenter_server = vcenter_server
+            self.username = username
 
             # Create session
             self.session = requests.Session()
             self.session.verify = verify_ssl
             self.session.auth = HTTPBasicAuth(username, password)
 
+            # Reuse the session of an earlier process when the session cache is enabled
+            if self.session_cache:
+                cached_session_id = load_session(REST_SESSION, vcenter_server, REST_PORT, username)
+                if cached_session_id and self._session_is_valid(vcenter_server, cached_session_id, verify_ssl):
+                    self.session_id = cached_session_id
+                    self.session.headers.update({
+                        'vmware-api-session-id': self.session_id,
+                        'Content-Type': 'application/json'
+                    })
+                    info(f"Reusing cached vCenter REST API session for {username}@{vcenter_server}")
+                    return True
+                if cached_session_id:
+                    info("Cached vCenter REST API session has expired - logging in again")
+                    forget_session(REST_SESSION, vcenter_server, REST_PORT, username)
+
             # Authenticate and get session token
             auth_url = f"https://{vcenter_server}/rest/com/vmware/cis/session"
             response = self.session.post(auth_url, verify=verify_ssl)
@@ -65,6 +94,8 @@ class VCenterAPILibrary:
                     'vmware-api-session-id': self.session_id,
                     'Content-Type': 'application/json'
                 })
+                if self.session_cache:
+                    save_session(REST_SESSION, vcenter_server, REST_PORT, username, self.session_id)
 
                 info(f"Successfully connected to vCenter REST API: {vcenter_server}")
                 return True
@@ -76,6 +107,21 @@ class VCenterAPILibrary:
             error(f"Failed to connect to vCenter API: {str(e)}")
             raise RuntimeError(f"vCenter API connection failed: {str(e)}")
 
+    def _session_is_valid(self, vcenter_server, session_id, verify_ssl):
+        """Check a REST API session token with one session info request"""
+        try:
+            response = requests.post(
+                f"https://{vcenter_server}/rest/com/vmware/cis/session",
+                params={'~action': 'get'},
+                headers={'vmware-api-session-id': session_id},
+                verify=verify_ssl,
+                timeout=30
+            )
+            return response.status_code == 200
+        except requests.RequestException as e:
+            warn(f"Could not validate cached vCenter REST API session: {str(e)}")
+            return False
+
     def verify_vcenter_api_connection(self):
         """
         Verify vCenter API connection is active
@@ -305,13 +351,25 @@ class VCenterAPILibrary:
             error(f"Error collecting offsite replication status: {str(e)}")
             return []
 
-    def disconnect_from_vcenter_api(self):
-        """Disconnect from vCenter API"""
+    def disconnect_from_vcenter_api(self, logout=None):
+        """
+        Disconnect from vCenter API
+
+        Args:
+            logout: Delete the vCenter session (default: only when the session cache is off,
+                    so cached sessions stay valid for the next robot process)
+        """
         try:
             if self.session and self.session_id:
-                # Delete session
-                auth_url = f"https://{self.api_base_url.replace('/api', '')}/rest/com/vmware/cis/session"
-                self.session.delete(auth_url)
+                if logout is None:
+                    logout = not self.session_cache
+                if logout:
+                    # Delete session
+                    auth_url = f"https://{self.vcenter_server}/rest/com/vmware/cis/session"
+                    self.session.delete(auth_url)
+                    if self.session_cache:
+                        forget_session(REST_SESSION, self.vcenter_server, REST_PORT, self.username)
+                self.session.close()
                 info("Disconnected from vCenter API")
 
             self.session = None
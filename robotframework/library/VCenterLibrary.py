@@ -3,11 +3,17 @@ VCenter Library for Robot Framework - Datastore Operations
 Provides vCenter connectivity and datastore management for Test-9
 """
 
-from pyVim.connect import SmartConnect, Disconnect
 from pyVmomi import vim
-import ssl
-import atexit
+import time
 from robot.api.logger import info, warn, error
+from library_logging import get_logger
+import vcenter_connection
+from vcenter_session_cache import session_cache_enabled
+from vcenter_inventory import DEFAULT_INVENTORY_TTL, collect_host_datastores, collect_host_vm_datastores
+from vcenter_snapshot import VCenterSnapshot, capture_snapshot, open_snapshot, snapshot_enabled
+
+
+log = get_logger('VCenterLibrary')
 
 
 class VCenterLibrary:
@@ -15,7 +21,24 @@ class VCenterLibrary:
 
     ROBOT_LIBRARY_SCOPE = 'GLOBAL'
 
-    def __init__(self):
+    def __init__(self, inventory_ttl=DEFAULT_INVENTORY_TTL, session_cache=None, snapshot=None, snapshot_file=None):
+        """
+        Args:
+            inventory_ttl: Seconds host and cluster lookups are served from the cached inventory index (default: 300)
+            session_cache: Reuse vCenter sessions across robot processes through the on-disk
+                           session cache (default: the VCENTER_SESSION_CACHE environment variable)
+            snapshot: Answer from the inventory snapshot of VCenter Capture Snapshot instead of
+                      connecting, when one exists (default: the VCENTER_SNAPSHOT environment variable)
+            snapshot_file: Snapshot file (default: VCENTER_SNAPSHOT_FILE or .cache/vcenter/snapshot.sqlite)
+        """
+        self.inventory_ttl = float(inventory_ttl)
+        self.session_cache = session_cache_enabled(session_cache)
+        self.snapshot_enabled = snapshot_enabled(snapshot)
+        self.snapshot_file = snapshot_file
+        # Open snapshot while answering from it; None when connected to vCenter
+        self.snapshot = None
+        # Pooled session, shared with VCenterAPI when both connect to the same host as the same user with the same SSL verification
+        self.pooled = None
         self.service_instance = None
         self.content = None
         self.connection = None
@@ -32,7 +55,7 @@ class VCenterLibrary:
             verify_ssl: Whether to verify SSL certificate (default: False)
 
         Returns:
-            connection: Connection object/identifier
+            connection: Connection identifier (host, port, username) of the pooled session
         """
         try:
             info(f"Connecting to vCenter: {vcenter_host}")
@@ -45,36 +68,29 @@ class VCenterLibrary:
             if not vcenter_host:
                 raise ValueError("vCenter host not provided")
 
-            # Create SSL context
-            if not verify_ssl:
-                ssl_context = ssl._create_unverified_context()
-            else:
-                ssl_context = ssl.create_default_context()
-
-            # Connect to vCenter
-            self.service_instance = SmartConnect(
-                host=vcenter_host,
-                user=username,
-                pwd=password,
-                port=int(port),
-                sslContext=ssl_context
+            if self.pooled is not None or self.snapshot is not None:
+                self.vcenter_disconnect(self.connection)
+
+            # Answer from the run's inventory snapshot without connecting when there is one
+            if self.snapshot_enabled:
+                self.snapshot, reason = open_snapshot(self.snapshot_file, vcenter_host)
+                if self.snapshot is not None:
+                    self.connection = {'host': vcenter_host, 'port': int(port), 'username': username}
+                    info(f"Answering vCenter queries from snapshot {self.snapshot.path} "
+                         f"captured {self.snapshot.captured_at} - not connecting")
+                    return self.connection
+                info(f"vCenter snapshot not used: {reason}")
+
+            # Take the pooled session for this host and user, logging in on first use
+            self.pooled = vcenter_connection.connect(
+                vcenter_host, username, password, port=port, verify_ssl=verify_ssl,
+                session_cache=self.session_cache
             )
+            self.service_instance = self.pooled.service_instance
+            self.content = self.pooled.content
 
-            if not self.service_instance:
-                raise RuntimeError("Failed to connect to vCenter")
-
-            # Register disconnect at exit
-            atexit.register(Disconnect, self.service_instance)
-
-            # Get content
-            self.content = self.service_instance.RetrieveContent()
-
-            # Store connection identifier
-            self.connection = {
-                'host': vcenter_host,
-                'service_instance': self.service_instance,
-                'content': self.content
-            }
+            # Store connection identifier; the live session stays in the pool
+            self.connection = self.pooled.handle()
 
             info(f"Successfully connected to vCenter: {vcenter_host}")
 
@@ -84,11 +100,26 @@ class VCenterLibrary:
             error(f"Failed to connect to vCenter {vcenter_host}: {str(e)}")
             raise RuntimeError(f"vCenter connection failed: {str(e)}")
 
-    def vcenter_disconnect(self, connection):
-        """Disconnect from vCenter"""
+    def vcenter_disconnect(self, connection, logout=None):
+        """
+        Disconnect from vCenter
+
+        The pooled session stays open while VCenterAPI still uses it.
+
+        Args:
+            connection: vCenter connection object
+            logout: End the vCenter session once unused (default: only when the session cache is off,
+                    so cached sessions stay valid for the next robot process)
+        """
         try:
-            if connection and connection.get('service_instance'):
-                Disconnect(connection['service_instance'])
+            if self.snapshot is not None:
+                self.snapshot.close()
+                self.snapshot = None
+                self.connection = None
+                info("Closed vCenter snapshot")
+            if connection and self.pooled:
+                pooled, self.pooled = self.pooled, None
+                vcenter_connection.release(pooled, logout)
                 info("Disconnected from vCenter")
                 self.service_instance = None
                 self.content = None
@@ -107,12 +138,14 @@ class VCenterLibrary:
             bool: True if connection is active
         """
         try:
-            if not connection or not connection.get('content'):
+            if connection and self.snapshot is not None:
+                return True
+            if not connection or self.pooled is None:
                 return False
 
-            # Try to access content to verify connection
-            _ = connection['content'].about.fullName
-            return True
+            # Check the session itself, reconnecting if vCenter expired it
+            self._content(connection)
+            return self.pooled.is_alive()
         except Exception as e:
             warn(f"Connection verification failed: {str(e)}")
             return False
@@ -130,17 +163,19 @@ class VCenterLibrary:
             bool: True if host found in cluster
         """
         try:
-            content = connection['content']
-
-            # Find the cluster
-            cluster = self._find_cluster_by_name(content, cluster_name)
-            if not cluster:
+            if self.snapshot is not None:
+                host_names = self.snapshot.cluster_host_names(cluster_name)
+            else:
+                # Find the cluster
+                cluster = self._find_cluster_by_name(connection, cluster_name)
+                host_names = (host.name for host in cluster.host) if cluster else None
+            if host_names is None:
                 error(f"Cluster '{cluster_name}' not found")
                 return False
 
             # Search for host in cluster
-            for host in cluster.host:
-                if host.name == host_name or host_name in host.name:
+            for name in host_names:
+                if name == host_name or host_name in name:
                     info(f"Host '{host_name}' found in cluster '{cluster_name}'")
                     return True
 
@@ -163,35 +198,30 @@ class VCenterLibrary:
             list: List of VM datastore assignments
         """
         try:
-            content = connection['content']
-            assignments = []
+            if self.snapshot is not None:
+                assignments = self.snapshot.host_vm_datastores(host_name)
+                if assignments is None:
+                    error(f"Host '{host_name}' not found")
+                    return []
+                for vm_info in assignments:
+                    log.detail('vm_datastores', "VM: {} - Datastores: {}",
+                               vm_info['vm_name'], [ds['name'] for ds in vm_info['datastores']])
+                log.record('vcenter_get_vm_datastore_assignments', host=host_name, vms=len(assignments), snapshot=True)
+                return assignments
 
             # Find the host
-            host = self._find_host_by_name(content, host_name)
+            host = self._find_host_by_name(connection, host_name)
             if not host:
                 error(f"Host '{host_name}' not found")
-                return assignments
+                return []
 
-            # Get all VMs on this host
-            for vm in host.vm:
-                if vm.config:
-                    vm_info = {
-                        'vm_name': vm.name,
-                        'datastores': [],
-                        'power_state': str(vm.runtime.powerState)
-                    }
-
-                    # Get datastores for this VM
-                    if vm.datastore:
-                        for ds in vm.datastore:
-                            vm_info['datastores'].append({
-                                'name': ds.name,
-                                'type': ds.summary.type if hasattr(ds.summary, 'type') else 'Unknown'
-                            })
-
-                    assignments.append(vm_info)
-                    info(f"VM: {vm.name} - Datastores: {[ds['name'] for ds in vm_info['datastores']]}")
+            # Get all VMs on this host with their datastores in one retrieval
+            assignments = collect_host_vm_datastores(self._content(connection), host)
+            for vm_info in assignments:
+                log.detail('vm_datastores', "VM: {} - Datastores: {}",
+                           vm_info['vm_name'], [ds['name'] for ds in vm_info['datastores']])
 
+            log.record('vcenter_get_vm_datastore_assignments', host=host_name, vms=len(assignments))
             return assignments
 
         except Exception as e:
@@ -210,37 +240,38 @@ class VCenterLibrary:
             list: List of datastore capacity information
         """
         try:
-            content = connection['content']
             capacity_data = []
 
-            # Find the host
-            host = self._find_host_by_name(content, host_name)
-            if not host:
+            # Find the host's datastores
+            datastores = self._get_host_datastores(connection, host_name)
+            if datastores is None:
                 error(f"Host '{host_name}' not found")
                 return capacity_data
 
             # Get datastores for this host
-            for ds in host.datastore:
-                capacity_gb = round(ds.summary.capacity / (1024**3), 2)
-                free_gb = round(ds.summary.freeSpace / (1024**3), 2)
+            for ds in datastores:
+                capacity_gb = round(ds['capacity'] / (1024**3), 2)
+                free_gb = round(ds['free_space'] / (1024**3), 2)
                 used_gb = capacity_gb - free_gb
                 used_percent = round((used_gb / capacity_gb) * 100, 2) if capacity_gb > 0 else 0
                 free_percent = round((free_gb / capacity_gb) * 100, 2) if capacity_gb > 0 else 0
 
                 ds_info = {
-                    'name': ds.name,
-                    'type': ds.summary.type,
+                    'name': ds['name'],
+                    'type': ds['type'],
                     'total_gb': capacity_gb,
                     'free_gb': free_gb,
                     'used_gb': used_gb,
                     'used_percent': used_percent,
                     'free_percent': free_percent,
-                    'accessible': ds.summary.accessible
+                    'accessible': ds['accessible']
                 }
 
                 capacity_data.append(ds_info)
-                info(f"Datastore: {ds.name} - Total: {capacity_gb}GB, Free: {free_gb}GB ({free_percent}%)")
+                log.detail('datastore_capacity', "Datastore: {} - Total: {}GB, Free: {}GB ({}%)",
+                           ds_info['name'], capacity_gb, free_gb, free_percent)
 
+            log.record('vcenter_get_datastore_capacity', host=host_name, datastores=len(capacity_data))
             return capacity_data
 
         except Exception as e:
@@ -259,31 +290,32 @@ class VCenterLibrary:
             list: List of datastore performance tier information
         """
         try:
-            content = connection['content']
             performance_data = []
 
-            # Find the host
-            host = self._find_host_by_name(content, host_name)
-            if not host:
+            # Find the host's datastores
+            datastores = self._get_host_datastores(connection, host_name)
+            if datastores is None:
                 error(f"Host '{host_name}' not found")
                 return performance_data
 
             # Get datastores and classify by performance tier
-            for ds in host.datastore:
-                storage_type = ds.summary.type
+            for ds in datastores:
+                storage_type = ds['type']
 
                 # Determine performance tier based on storage type and name
-                performance_tier = self._classify_performance_tier(ds.name, storage_type)
+                performance_tier = self._classify_performance_tier(ds['name'], storage_type)
 
                 tier_info = {
-                    'name': ds.name,
+                    'name': ds['name'],
                     'storage_type': storage_type,
                     'performance_tier': performance_tier
                 }
 
                 performance_data.append(tier_info)
-                info(f"Datastore: {ds.name} - Type: {storage_type}, Tier: {performance_tier}")
+                log.detail('datastore_tier', "Datastore: {} - Type: {}, Tier: {}",
+                           tier_info['name'], storage_type, performance_tier)
 
+            log.record('vcenter_get_datastore_performance_tiers', host=host_name, datastores=len(performance_data))
             return performance_data
 
         except Exception as e:
@@ -302,42 +334,34 @@ class VCenterLibrary:
             list: List of datastore subscription information
         """
         try:
-            content = connection['content']
             subscription_data = []
 
-            # Find the host
-            host = self._find_host_by_name(content, host_name)
-            if not host:
+            # Find the host's datastores, with the disk capacity provisioned on each
+            datastores = self._get_host_datastores(connection, host_name, provisioned=True)
+            if datastores is None:
                 error(f"Host '{host_name}' not found")
                 return subscription_data
 
             # Calculate subscription for each datastore
-            for ds in host.datastore:
-                capacity_gb = round(ds.summary.capacity / (1024**3), 2)
-
-                # Calculate provisioned space from all VMs using this datastore
-                provisioned_gb = 0
-                if hasattr(ds, 'vm'):
-                    for vm in ds.vm:
-                        if vm.config:
-                            # Sum all virtual disk capacities
-                            for device in vm.config.hardware.device:
-                                if isinstance(device, vim.vm.device.VirtualDisk):
-                                    provisioned_gb += round(device.capacityInBytes / (1024**3), 2)
+            for ds in datastores:
+                capacity_gb = round(ds['capacity'] / (1024**3), 2)
+                provisioned_gb = ds['provisioned_gb']
 
                 # Calculate subscription ratio
                 subscription_ratio = round(provisioned_gb / capacity_gb, 2) if capacity_gb > 0 else 0
 
                 sub_info = {
-                    'name': ds.name,
+                    'name': ds['name'],
                     'capacity_gb': capacity_gb,
                     'provisioned_gb': provisioned_gb,
                     'subscription_ratio': subscription_ratio
                 }
 
                 subscription_data.append(sub_info)
-                info(f"Datastore: {ds.name} - Provisioned: {provisioned_gb}GB, Ratio: {subscription_ratio}:1")
+                log.detail('datastore_subscription', "Datastore: {} - Provisioned: {}GB, Ratio: {}:1",
+                           sub_info['name'], provisioned_gb, subscription_ratio)
 
+            log.record('vcenter_get_datastore_subscription_levels', host=host_name, datastores=len(subscription_data))
             return subscription_data
 
         except Exception as e:
@@ -375,38 +399,90 @@ class VCenterLibrary:
             error(f"Error capturing screenshot: {str(e)}")
             raise
 
+    def vcenter_capture_snapshot(self, connection, snapshot_file=None):
+        """
+        Capture the vCenter inventory into a local snapshot and answer later keywords from it
+
+        VMs, hosts, clusters, datastores, VM devices and portgroups are pulled
+        with one bulk property retrieval and written to an indexed SQLite file.
+        This library then answers from the snapshot for the rest of the run;
+        other robot processes (and VCenterAPI) use it when created with
+        snapshot=True or run with VCENTER_SNAPSHOT=1.
+
+        Args:
+            connection: vCenter connection object (a live connection, not a snapshot)
+            snapshot_file: Snapshot file to write (default: the library's snapshot_file)
+
+        Returns:
+            dict: path, captured_at, the number of vms, hosts, clusters, datastores,
+                  portgroups and devices, api_calls and elapsed_ms
+        """
+        try:
+            content = self._content(connection)
+            pooled = vcenter_connection.get_connection(connection)
+
+            start = time.perf_counter()
+            calls_before = sum(pooled.api_calls.values())
+            summary = capture_snapshot(content, snapshot_file or self.snapshot_file, vcenter=pooled.host)
+            summary['api_calls'] = sum(pooled.api_calls.values()) - calls_before
+            summary['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 2)
+
+            self.snapshot_enabled = True
+            self.snapshot_file = summary['path']
+            if self.snapshot is not None:
+                self.snapshot.close()
+            self.snapshot = VCenterSnapshot(summary['path'])
+
+            log.record('vcenter_capture_snapshot', **summary)
+            info(f"Captured vCenter snapshot of {summary['vms']} VMs, {summary['hosts']} hosts and "
+                 f"{summary['datastores']} datastores to {summary['path']} in {summary['elapsed_ms']}ms")
+            return summary
+
+        except Exception as e:
+            error(f"Failed to capture vCenter snapshot: {str(e)}")
+            raise RuntimeError(f"vCenter snapshot capture failed: {str(e)}")
+
+    def vcenter_refresh_inventory_index(self, connection):
+        """Drop the cached host and cluster name indexes so the next lookup reads the inventory again"""
+        if connection and self.snapshot is None and self.pooled is not None:
+            self._inventory(connection).invalidate()
+
     # Helper methods
-    def _find_cluster_by_name(self, content, cluster_name):
-        """Find a cluster by name"""
-        container = content.viewManager.CreateContainerView(
-            content.rootFolder,
-            [vim.ClusterComputeResource],
-            True
-        )
-
-        for cluster in container.view:
-            if cluster.name == cluster_name:
-                container.Destroy()
-                return cluster
-
-        container.Destroy()
-        return None
-
-    def _find_host_by_name(self, content, host_name):
-        """Find a host by name"""
-        container = content.viewManager.CreateContainerView(
-            content.rootFolder,
-            [vim.HostSystem],
-            True
-        )
-
-        for host in container.view:
-            if host.name == host_name or host_name in host.name:
-                container.Destroy()
-                return host
-
-        container.Destroy()
-        return None
+    def _content(self, connection):
+        """ServiceContent of the pooled session named by a connection, reconnected first if it expired"""
+        pooled = vcenter_connection.get_connection(connection)
+        self.content = pooled.ensure_alive()
+        self.service_instance = pooled.service_instance
+        return self.content
+
+    def _inventory(self, connection):
+        """Name index of the pooled session named by a connection, reconnected first if it expired"""
+        self._content(connection)
+        return vcenter_connection.get_connection(connection).inventory_index(self.inventory_ttl)
+
+    def _get_host_datastores(self, connection, host_name, provisioned=False):
+        """
+        Datastores of a host from the snapshot or the live session, or None when the host is not found
+
+        Returns:
+            list: One dict per datastore with name, type, capacity, free_space, accessible and,
+                  when provisioned is set, provisioned_gb (disk capacity of every VM on it)
+        """
+        if self.snapshot is not None:
+            return self.snapshot.host_datastores(host_name, provisioned)
+
+        host = self._find_host_by_name(connection, host_name)
+        if not host:
+            return None
+        return collect_host_datastores(self._content(connection), host, provisioned)
+
+    def _find_cluster_by_name(self, connection, cluster_name):
+        """Find a cluster by name through the pooled session's inventory index"""
+        return self._inventory(connection).find(vim.ClusterComputeResource, cluster_name)
+
+    def _find_host_by_name(self, connection, host_name):
+        """Find a host by exact or DNS name, else the first host whose name contains host_name"""
+        return self._inventory(connection).find(vim.HostSystem, host_name, partial=True)
 
     def _classify_performance_tier(self, datastore_name, storage_type):
         """Classify datastore performance tier based on name and type"""
@@ -0,0 +1,241 @@
+"""
+Async Network Probes
+Concurrent TCP connect and HTTP(S) health probes with asyncio, shared by the validator libraries
+
+Probes run on one event loop under a semaphore, so checking N endpoints takes
+roughly the slowest single round trip instead of N sequential ones, while the
+number of sockets open at once stays bounded.
+
+Each probe is a dict:
+    host, port:  Endpoint to probe
+    kind:        'tcp' (connect only), 'http' or 'https' (GET request)
+    path:        HTTP path (default: '/')
+    expect:      Text the HTTP response body must contain (optional)
+Any other keys (e.g. the VIP or member a probe belongs to) are copied to its result.
+"""
+
+import asyncio
+import concurrent.futures
+import ssl
+import time
+
+
+DEFAULT_CONCURRENCY = 50
+DEFAULT_TIMEOUT = 3.0
+
+# Health checks only need the status line and enough body to find the expected text
+MAX_RESPONSE_BYTES = 64 * 1024
+
+
+async def tcp_probe(host, port, timeout=DEFAULT_TIMEOUT):
+    """
+    Open and close a TCP connection
+
+    Returns:
+        dict: 'ok', 'latency_ms' and 'error' (None on success)
+    """
+    start = time.perf_counter()
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+        latency_ms = (time.perf_counter() - start) * 1000
+        writer.close()
+        await _wait_closed(writer)
+        return {'ok': True, 'latency_ms': round(latency_ms, 2), 'error': None}
+    except asyncio.TimeoutError:
+        return {'ok': False, 'latency_ms': None, 'error': f"Timed out after {timeout}s"}
+    except OSError as e:
+        return {'ok': False, 'latency_ms': None, 'error': str(e) or type(e).__name__}
+
+
+async def http_probe(host, port, path='/', timeout=DEFAULT_TIMEOUT, tls=False, expect=None):
+    """
+    Send one HTTP GET and check the status code and, optionally, the body
+
+    TLS certificates are not verified: the probe checks that the member serves
+    its health page, and pool members commonly use self-signed certificates.
+
+    Returns:
+        dict: 'ok', 'latency_ms', 'status' and 'error' (None on success)
+    """
+    context = None
+    if tls:
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+
+    start = time.perf_counter()
+    writer = None
+    try:
+        async def exchange():
+            nonlocal writer
+            reader, writer = await asyncio.open_connection(host, port, ssl=context)
+            request = (
+                f"GET {path or '/'} HTTP/1.1\r\nHost: {host}\r\n"
+                f"User-Agent: robot-async-probe\r\nAccept: */*\r\nConnection: close\r\n\r\n"
+            )
+            writer.write(request.encode('ascii'))
+            await writer.drain()
+
+            response = b''
+            while len(response) < MAX_RESPONSE_BYTES:
+                chunk = await reader.read(MAX_RESPONSE_BYTES - len(response))
+                if not chunk:
+                    break
+                response += chunk
+                if expect is None and b'\r\n' in response:
+                    break
+            return response
+
+        response = await asyncio.wait_for(exchange(), timeout)
+        latency_ms = round((time.perf_counter() - start) * 1000, 2)
+
+        status_line = response.split(b'\r\n', 1)[0].decode('latin-1')
+        parts = status_line.split()
+        if len(parts) < 2 or not parts[0].startswith('HTTP/') or not parts[1].isdigit():
+            return {'ok': False, 'latency_ms': latency_ms, 'status': None,
+                    'error': f"Invalid HTTP response: {status_line[:80]!r}"}
+
+        status = int(parts[1])
+        if status >= 400:
+            return {'ok': False, 'latency_ms': latency_ms, 'status': status, 'error': f"HTTP {status}"}
+        if expect is not None and expect.encode('utf-8') not in response:
+            return {'ok': False, 'latency_ms': latency_ms, 'status': status,
+                    'error': f"Response does not contain '{expect}'"}
+        return {'ok': True, 'latency_ms': latency_ms, 'status': status, 'error': None}
+
+    except asyncio.TimeoutError:
+        return {'ok': False, 'latency_ms': None, 'status': None, 'error': f"Timed out after {timeout}s"}
+    except (OSError, ssl.SSLError) as e:
+        return {'ok': False, 'latency_ms': None, 'status': None, 'error': str(e) or type(e).__name__}
+    finally:
+        if writer is not None:
+            writer.close()
+            await _wait_closed(writer)
+
+
+async def _wait_closed(writer):
+    """Wait for a stream to close, ignoring errors from peers that already dropped it"""
+    try:
+        await writer.wait_closed()
+    except (OSError, ssl.SSLError):
+        pass
+
+
+async def _probe(probe, semaphore, timeout):
+    """Run one probe under the concurrency limit and merge its outcome into the probe dict"""
+    kind = probe.get('kind', 'tcp')
+    async with semaphore:
+        if kind in ('http', 'https'):
+            outcome = await http_probe(
+                probe['host'], probe['port'], probe.get('path') or '/', timeout,
+                tls=kind == 'https', expect=probe.get('expect')
+            )
+        else:
+            outcome = await tcp_probe(probe['host'], probe['port'], timeout)
+    return dict(probe, kind=kind, **outcome)
+
+
+async def probe_all(probes, concurrency=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT):
+    """Run probes concurrently on the current event loop; results keep the order of probes"""
+    semaphore = asyncio.Semaphore(max(1, int(concurrency)))
+    return await asyncio.gather(*(_probe(probe, semaphore, timeout) for probe in probes))
+
+
+async def _probe_series(probe, attempts, semaphore, timeout):
+    """Probe one endpoint attempts times in a row and summarize its latency distribution"""
+    outcomes = [await _probe(probe, semaphore, timeout) for _ in range(attempts)]
+    successes = sum(1 for outcome in outcomes if outcome['ok'])
+    errors = [outcome['error'] for outcome in outcomes if not outcome['ok']]
+    return dict(
+        probe,
+        kind=probe.get('kind', 'tcp'),
+        ok=successes == attempts,
+        attempts=attempts,
+        successes=successes,
+        error=errors[-1] if errors else None,
+        latency=latency_summary(outcomes)
+    )
+
+
+async def probe_series_all(probes, attempts=3, concurrency=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT):
+    """Run a series of attempts per endpoint, endpoints concurrently; results keep the order of probes"""
+    semaphore = asyncio.Semaphore(max(1, int(concurrency)))
+    attempts = max(1, int(attempts))
+    return await asyncio.gather(*(_probe_series(probe, attempts, semaphore, timeout) for probe in probes))
+
+
+def run_probes(probes, concurrency=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT):
+    """
+    Run probes concurrently from synchronous code such as a Robot keyword
+
+    Args:
+        probes: List of probe dicts (host, port, kind, optional path / expect)
+        concurrency: Maximum probes in flight at once (default: 50)
+        timeout: Seconds allowed per probe (default: 3)
+
+    Returns:
+        list: One result dict per probe, in order, with 'ok', 'latency_ms', 'error'
+              (and 'status' for HTTP probes)
+    """
+    probes = list(probes)
+    if not probes:
+        return []
+
+    return _run(probe_all(probes, concurrency, float(timeout)))
+
+
+def run_probe_series(probes, attempts=3, concurrency=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT):
+    """
+    Probe every endpoint several times from synchronous code, for per-endpoint latency percentiles
+
+    The attempts against one endpoint run one after another (so they measure the
+    endpoint rather than contention between the attempts), while different
+    endpoints are probed concurrently under the concurrency limit. The total time
+    is bounded by about attempts * timeout per batch of concurrent endpoints.
+
+    Args:
+        probes: List of probe dicts (host, port, kind, optional path / expect)
+        attempts: Probes sent to each endpoint (default: 3)
+        concurrency: Maximum probes in flight at once (default: 50)
+        timeout: Seconds allowed per attempt (default: 3)
+
+    Returns:
+        list: One result dict per endpoint, in order, with 'ok' (every attempt succeeded),
+              'attempts', 'successes', 'error' (last failure) and 'latency' (latency_summary)
+    """
+    probes = list(probes)
+    if not probes:
+        return []
+    return _run(probe_series_all(probes, attempts, concurrency, float(timeout)))
+
+
+def _run(coroutine):
+    """Run a coroutine to completion, also when called from inside a running event loop"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+
+    # Called from inside a running event loop: run on a private loop in a worker thread
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()
+
+
+def latency_summary(results):
+    """Return count, min, p50, p95, p99 and max latency (ms) of the successful probe results"""
+    latencies = sorted(result['latency_ms'] for result in results if result.get('ok') and result['latency_ms'] is not None)
+    if not latencies:
+        return {'count': 0, 'min_ms': None, 'p50_ms': None, 'p95_ms': None, 'p99_ms': None, 'max_ms': None}
+
+    def percentile(fraction):
+        index = min(len(latencies) - 1, max(0, int(round(fraction * len(latencies))) - 1))
+        return latencies[index]
+
+    return {
+        'count': len(latencies),
+        'min_ms': latencies[0],
+        'p50_ms': percentile(0.50),
+        'p95_ms': percentile(0.95),
+        'p99_ms': percentile(0.99),
+        'max_ms': latencies[-1]
+    }
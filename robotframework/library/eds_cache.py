@@ -0,0 +1,206 @@
+"""
+EDS Workbook Cache
+Compiled on-disk cache of EDS worksheets so repeated library loads skip the xlsx parse
+
+Cache files are pickles, and unpickling runs code, so they are only loaded
+from a directory that is owned by the current user and closed to everyone
+else (0700), and only when the file itself belongs to the current user. The
+directory is created that way; a cache directory anyone else could have
+written to is ignored and the workbook is parsed instead.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+from robot.api.logger import info, warn
+
+
+# Bump when the cached payload layout changes so old cache files are rebuilt
+CACHE_FORMAT_VERSION = 3
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'eds'
+)
+
+
+def get_cache_dir():
+    """Return the cache directory, overridable with the EDS_CACHE_DIR environment variable"""
+    return os.environ.get('EDS_CACHE_DIR', DEFAULT_CACHE_DIR)
+
+
+def file_signature(path):
+    """Return the cheap (path, size, mtime) signature of a workbook"""
+    stat = os.stat(path)
+    return {
+        'path': os.path.abspath(path),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns
+    }
+
+
+def file_hash(path):
+    """Return the SHA-256 content hash of a workbook"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_path_for(path, sheet_name, cache_dir=None, columns=None):
+    """Return the cache file used for one sheet (and column projection) of one workbook"""
+    projection = '*' if columns is None else '|'.join(columns)
+    key = f"{os.path.abspath(path)}|{sheet_name}|{projection}".encode('utf-8')
+    filename = f"{hashlib.sha1(key).hexdigest()[:20]}.pkl"
+    return os.path.join(cache_dir or get_cache_dir(), filename)
+
+
+def load_sheet(path, sheet_name, parse_func, cache_dir=None, columns=None):
+    """
+    Load a worksheet through the compiled cache, rebuilding it when the workbook changed
+
+    The cache is valid when the workbook size and mtime match. If only the
+    mtime moved (e.g. the file was touched or copied) the content hash is
+    compared before deciding to reparse.
+
+    Args:
+        path: Path to the xlsx workbook
+        sheet_name: Worksheet to load
+        parse_func: Callable(path, sheet_name, columns) returning {'columns': [...], 'data': {col: [...]}}
+        cache_dir: Cache directory (default: get_cache_dir())
+        columns: Column projection passed to parse_func; each projection is cached separately
+
+    Returns:
+        dict: Columnar sheet payload with 'columns' and 'data' keys
+    """
+    payload = cached_payload(path, sheet_name, cache_dir, columns)
+    if payload is not None:
+        return payload
+
+    signature = file_signature(path)
+    content_hash = file_hash(path)
+    info(f"Building EDS cache for '{sheet_name}' from {path}")
+    payload = parse_func(path, sheet_name, columns)
+    store_sheet(path, sheet_name, payload, cache_dir, columns, signature, content_hash)
+    return payload
+
+
+def cached_payload(path, sheet_name, cache_dir=None, columns=None):
+    """
+    Return the cached payload of a worksheet, or None when there is no valid cache
+
+    Args:
+        path: Path to the xlsx workbook
+        sheet_name: Worksheet to load
+        cache_dir: Cache directory (default: get_cache_dir())
+        columns: Column projection the cache was built with
+
+    Returns:
+        dict: Columnar sheet payload, or None if the cache is missing or stale
+    """
+    cache_file = cache_path_for(path, sheet_name, cache_dir, columns)
+    header, payload = _read_cache_file(cache_file)
+    if header is None:
+        return None
+
+    signature = file_signature(path)
+    if header['signature'] == signature:
+        info(f"Loaded '{sheet_name}' from EDS cache {cache_file}")
+        return payload
+
+    content_hash = file_hash(path)
+    if header['sha256'] == content_hash:
+        info(f"EDS workbook touched but unchanged - refreshing cache signature for '{sheet_name}'")
+        _write_cache_file(cache_file, sheet_name, signature, content_hash, payload)
+        return payload
+
+    return None
+
+
+def store_sheet(path, sheet_name, payload, cache_dir=None, columns=None, signature=None, content_hash=None):
+    """
+    Write the compiled cache of a worksheet parsed outside load_sheet
+
+    Args:
+        path: Path to the xlsx workbook the payload was parsed from
+        sheet_name: Worksheet name
+        payload: Columnar sheet payload
+        cache_dir: Cache directory (default: get_cache_dir())
+        columns: Column projection the payload was parsed with
+        signature: Workbook signature taken before parsing (default: current)
+        content_hash: Workbook hash taken before parsing (default: current)
+    """
+    cache_file = cache_path_for(path, sheet_name, cache_dir, columns)
+    _write_cache_file(
+        cache_file,
+        sheet_name,
+        signature or file_signature(path),
+        content_hash or file_hash(path),
+        payload
+    )
+
+
+def _is_private(path, stat, allowed_mode):
+    """Check that a cache path belongs to the current user and has no permission bits outside allowed_mode"""
+    if os.name != 'posix':
+        return True
+    if stat.st_uid != os.getuid():
+        warn(f"Ignoring EDS cache {path}: it is owned by another user")
+        return False
+    if stat.st_mode & 0o777 & ~allowed_mode:
+        warn(f"Ignoring EDS cache {path}: it is accessible to other users (expected mode {allowed_mode:04o})")
+        return False
+    return True
+
+
+def _read_cache_file(cache_file):
+    """Read (header, payload) from a cache file, returning (None, None) when unusable or not private"""
+    if not os.path.exists(cache_file):
+        return None, None
+
+    try:
+        cache_dir = os.path.dirname(cache_file)
+        if not _is_private(cache_dir, os.stat(cache_dir), 0o700):
+            return None, None
+        with open(cache_file, 'rb') as f:
+            if not _is_private(cache_file, os.fstat(f.fileno()), 0o600):
+                return None, None
+            header = pickle.load(f)
+            if header.get('version') != CACHE_FORMAT_VERSION:
+                return None, None
+            payload = pickle.load(f)
+        return header, payload
+    except Exception as e:
+        warn(f"Ignoring unreadable EDS cache {cache_file}: {str(e)}")
+        return None, None
+
+
+def _write_cache_file(cache_file, sheet_name, signature, content_hash, payload):
+    """Atomically write a cache file so concurrent robot processes never see a partial cache"""
+    header = {
+        'version': CACHE_FORMAT_VERSION,
+        'sheet': sheet_name,
+        'signature': signature,
+        'sha256': content_hash
+    }
+
+    try:
+        cache_dir = os.path.dirname(cache_file)
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        if os.name == 'posix':
+            stat = os.stat(cache_dir)
+            if stat.st_uid == os.getuid() and stat.st_mode & 0o077:
+                # Directory from before the cache was private; files others may have put there are still refused
+                os.chmod(cache_dir, 0o700)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_file)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+    except Exception as e:
+        warn(f"Could not write EDS cache {cache_file}: {str(e)}")
@@ -0,0 +1,376 @@
+"""
+EDS Network Linter
+Fleet-wide consistency checks of the network columns of an EDS table
+
+Checks every host row at once instead of one host per suite run: unparseable
+or placeholder addresses ('10.26.6.???'), an IP or gateway outside the declared
+subnet, a mask that does not match the subnet prefix, and duplicate IPs or
+hostnames. Columns are parsed in bulk (socket.inet_pton, with repeated subnet,
+mask and gateway values parsed once) and IPs are placed with a sorted interval
+index of all declared subnets, so a 50k-host sheet is linted in about half a second.
+
+Usage:
+    python library/eds_linter.py [EDS_FILES ...] [--hosts HOST,...] [--json]
+"""
+
+import bisect
+import os
+import socket
+import sys
+from eds_reader import is_missing
+
+
+HOSTNAME_COLUMN = "Server Name"
+IP_COLUMN = "IP Assignment"
+SUBNET_COLUMN = "Subnet"
+MASK_COLUMN = "Mask"
+GATEWAY_COLUMN = "Gateway"
+
+# Values that mark an address as not yet assigned rather than mistyped
+PLACEHOLDER_MARKERS = ('?', 'tbd', 'xx', 'n/a', 'pending')
+
+# Check name -> severity; 'critical' findings make a host unusable for a validation run
+CHECKS = {
+    'placeholder': 'critical',
+    'invalid_address': 'critical',
+    'missing_address': 'critical',
+    'ip_outside_subnet': 'critical',
+    'gateway_outside_subnet': 'critical',
+    'mask_mismatch': 'critical',
+    'duplicate_ip': 'critical',
+    'duplicate_hostname': 'critical',
+    'ip_is_network_or_broadcast': 'critical',
+    'subnet_has_host_bits': 'warning',
+    'ip_is_gateway': 'warning'
+}
+
+
+def parse_ipv4(value):
+    """Parse a dotted IPv4 address into an int, returning None if it is not one"""
+    try:
+        # inet_pton is strict: four decimal octets, no shorthand forms or leading zeros
+        return int.from_bytes(socket.inet_pton(socket.AF_INET, str(value).strip()), 'big')
+    except (OSError, ValueError):
+        return None
+
+
+def parse_subnet(value):
+    """
+    Parse a CIDR subnet ('10.26.6.0/24')
+
+    Returns:
+        tuple: (network, prefix, has_host_bits), or None if the value is not a subnet
+    """
+    text = str(value).strip()
+    if '/' not in text:
+        return None
+    address_text, _, prefix_text = text.partition('/')
+    address = parse_ipv4(address_text)
+    if address is None or not prefix_text.strip().isdigit():
+        return None
+
+    prefix = int(prefix_text)
+    if prefix > 32:
+        return None
+    netmask = prefix_to_netmask(prefix)
+    return address & netmask, prefix, address & ~netmask & 0xFFFFFFFF != 0
+
+
+def parse_mask(value):
+    """Parse a dotted netmask ('255.255.255.0') or '/24' into a prefix length, None if invalid"""
+    text = str(value).strip()
+    if text.startswith('/') and text[1:].isdigit():
+        prefix = int(text[1:])
+        return prefix if prefix <= 32 else None
+
+    mask = parse_ipv4(text)
+    if mask is None:
+        return None
+    prefix = bin(mask).count('1')
+    # Reject non-contiguous masks such as 255.0.255.0
+    return prefix if mask == prefix_to_netmask(prefix) else None
+
+
+def prefix_to_netmask(prefix):
+    """Return the netmask of a prefix length as an int"""
+    return (0xFFFFFFFF << (32 - prefix)) & 0xFFFFFFFF
+
+
+def format_ipv4(address):
+    """Format an int IPv4 address as dotted text"""
+    return '.'.join(str((address >> shift) & 0xFF) for shift in (24, 16, 8, 0))
+
+
+def is_placeholder(value):
+    """Check whether a cell holds a not-yet-assigned placeholder such as '10.26.6.???' or 'TBD'"""
+    text = str(value).strip().lower()
+    return any(marker in text for marker in PLACEHOLDER_MARKERS)
+
+
+def is_placeholder_name(value):
+    """
+    Check whether a name cell as a whole is a placeholder such as 'TBD', '(pending)' or '???'
+
+    Unlike is_placeholder, a real hostname that merely contains a marker
+    ('dbxx01', 'tbdb-prod') is not a placeholder.
+    """
+    text = str(value).strip().strip('()[]<>').strip().lower()
+    return text in PLACEHOLDER_MARKERS or (bool(text) and set(text) <= {'?', 'x'})
+
+
+class SubnetIndex:
+    """Sorted interval index of subnets for containing-subnet lookups with bisect"""
+
+    def __init__(self, subnets):
+        """
+        Args:
+            subnets: Iterable of (network, prefix, label) tuples; duplicates are ignored
+        """
+        intervals = sorted({
+            (network, network | (~prefix_to_netmask(prefix) & 0xFFFFFFFF), prefix, label)
+            for network, prefix, label in subnets
+        })
+        self.starts = [interval[0] for interval in intervals]
+        self.intervals = intervals
+
+        # Running maximum of interval ends, so overlapping (nested) subnets are still found
+        self.max_ends = []
+        highest = -1
+        for interval in intervals:
+            highest = max(highest, interval[1])
+            self.max_ends.append(highest)
+
+    def __len__(self):
+        return len(self.intervals)
+
+    def find(self, address):
+        """Return the label of the most specific subnet containing an address, or None"""
+        best = None
+        position = bisect.bisect_right(self.starts, address) - 1
+        while position >= 0 and self.max_ends[position] >= address:
+            start, end, prefix, label = self.intervals[position]
+            if start <= address <= end and (best is None or prefix > best[0]):
+                best = (prefix, label)
+            position -= 1
+        return best[1] if best else None
+
+
+def lint_network(table, hostnames=None, row_column=None, file_column=None):
+    """
+    Check the network columns of every host row of an EDS table
+
+    Duplicate IPs and hostnames are always detected across the whole table;
+    hostnames only limits which hosts findings are reported for.
+
+    Args:
+        table: EDSTable of the Server Requirements sheet
+        hostnames: Only report findings for these hosts (default: all hosts)
+        row_column: Column holding each row's worksheet row (default: table.row_numbers)
+        file_column: Column holding each row's source workbook (default: none)
+
+    Returns:
+        dict: 'violations' list, 'total_hosts', 'checked_hosts', 'violations_count',
+              'critical_count' and 'counts' per check
+    """
+    size = len(table)
+
+    def column(name):
+        return table.column(name) if name in table.columns else [None] * size
+
+    names = column(HOSTNAME_COLUMN)
+    ips = column(IP_COLUMN)
+    subnets = column(SUBNET_COLUMN)
+    masks = column(MASK_COLUMN)
+    gateways = column(GATEWAY_COLUMN)
+    rows = column(row_column) if row_column else table.row_numbers
+    files = column(file_column) if file_column else [None] * size
+
+    # Only the first row of a host carries its network columns; the rest are storage rows.
+    # (name == name is only False for NaN, the one missing value besides None)
+    host_positions = [
+        position for position, name in enumerate(names)
+        if name is not None and name == name and str(name).strip()
+    ]
+    normalized = {position: str(names[position]).strip().lower() for position in host_positions}
+
+    wanted = None
+    if hostnames is not None:
+        wanted = {str(hostname).strip().lower() for hostname in hostnames}
+
+    # Bulk parse. IPs are unique per host; subnets, masks and gateways repeat across a
+    # VLAN, so their distinct values are parsed once each
+    subnet_cache = {}
+    mask_cache = {}
+    gateway_cache = {}
+    parsed_ips = {}
+    hosts_by_name = {}
+    hosts_by_ip = {}
+    for position in host_positions:
+        hosts_by_name.setdefault(normalized[position], []).append(position)
+
+        ip = ips[position]
+        if ip is not None and ip == ip:
+            address = parse_ipv4(ip)
+            parsed_ips[position] = address
+            if address is not None:
+                hosts_by_ip.setdefault(address, []).append(position)
+
+        subnet = subnets[position]
+        if subnet is not None and subnet not in subnet_cache:
+            parsed = parse_subnet(subnet)
+            if parsed is not None:
+                network, prefix, has_host_bits = parsed
+                parsed = (network, prefix, has_host_bits, prefix_to_netmask(prefix), f"{format_ipv4(network)}/{prefix}")
+            subnet_cache[subnet] = parsed
+
+    index = SubnetIndex(
+        (parsed[0], parsed[1], parsed[4]) for parsed in subnet_cache.values() if parsed is not None
+    )
+
+    violations = []
+
+    def report(position, check, field, value, message):
+        violations.append({
+            'hostname': str(names[position]).strip(),
+            'row': rows[position],
+            'file': files[position],
+            'check': check,
+            'field': field,
+            'value': value,
+            'reason': message,
+            'severity': CHECKS[check]
+        })
+
+    def report_unparsed(position, field, value, expected):
+        if is_placeholder(value):
+            report(position, 'placeholder', field, value, f"Placeholder {field} '{value}'")
+        else:
+            report(position, 'invalid_address', field, value, f"'{value}' is not {expected}")
+
+    checked = 0
+    for position in host_positions:
+        hostname = normalized[position]
+        if wanted is not None and hostname not in wanted:
+            continue
+        checked += 1
+
+        duplicates = hosts_by_name[hostname]
+        if len(duplicates) > 1 and duplicates[0] != position:
+            report(position, 'duplicate_hostname', HOSTNAME_COLUMN, names[position],
+                   f"Hostname also defined at row {rows[duplicates[0]]}")
+
+        ip_value = ips[position]
+        ip = parsed_ips.get(position)
+        if ip is None:
+            if is_missing(ip_value) or not str(ip_value).strip():
+                report(position, 'missing_address', IP_COLUMN, None, "No IP assigned")
+            else:
+                report_unparsed(position, IP_COLUMN, ip_value, "an IPv4 address")
+
+        gateway_value = gateways[position]
+        gateway = None
+        if not is_missing(gateway_value) and str(gateway_value).strip():
+            if gateway_value not in gateway_cache:
+                gateway_cache[gateway_value] = parse_ipv4(gateway_value)
+            gateway = gateway_cache[gateway_value]
+            if gateway is None:
+                report_unparsed(position, GATEWAY_COLUMN, gateway_value, "an IPv4 address")
+
+        prefix = None
+        mask_value = masks[position]
+        if not is_missing(mask_value):
+            if mask_value not in mask_cache:
+                mask_cache[mask_value] = parse_mask(mask_value)
+            prefix = mask_cache[mask_value]
+            if prefix is None:
+                report_unparsed(position, MASK_COLUMN, mask_value, "a netmask")
+
+        subnet_value = subnets[position]
+        if is_missing(subnet_value):
+            continue
+        subnet = subnet_cache[subnet_value]
+        if subnet is None:
+            report_unparsed(position, SUBNET_COLUMN, subnet_value, "a CIDR subnet")
+            continue
+        network, subnet_prefix, has_host_bits, netmask, subnet_label = subnet
+
+        if has_host_bits:
+            report(position, 'subnet_has_host_bits', SUBNET_COLUMN, subnet_value,
+                   f"Subnet has host bits set; network is {subnet_label}")
+        if prefix is not None and prefix != subnet_prefix:
+            report(position, 'mask_mismatch', MASK_COLUMN, mask_value,
+                   f"Mask is /{prefix} but subnet {subnet_value} is /{subnet_prefix}")
+
+        if ip is not None:
+            if ip & netmask != network:
+                actual = index.find(ip)
+                where = f"it is in declared subnet {actual}" if actual else "no declared subnet contains it"
+                report(position, 'ip_outside_subnet', IP_COLUMN, ip_value,
+                       f"IP is outside subnet {subnet_label}; {where}")
+            elif subnet_prefix < 31 and ip in (network, network | (~netmask & 0xFFFFFFFF)):
+                report(position, 'ip_is_network_or_broadcast', IP_COLUMN, ip_value,
+                       f"IP is the network or broadcast address of {subnet_label}")
+
+            sharing = hosts_by_ip[ip]
+            if len(sharing) > 1:
+                others = [str(names[other]).strip() for other in sharing if other != position]
+                report(position, 'duplicate_ip', IP_COLUMN, ip_value,
+                       f"IP also assigned to {', '.join(others[:5])}")
+
+        if gateway is not None:
+            if gateway & netmask != network:
+                report(position, 'gateway_outside_subnet', GATEWAY_COLUMN, gateway_value,
+                       f"Gateway is outside subnet {subnet_label}")
+            elif gateway == ip:
+                report(position, 'ip_is_gateway', IP_COLUMN, ip_value, "IP is the subnet gateway")
+
+    counts = {}
+    for violation in violations:
+        counts[violation['check']] = counts.get(violation['check'], 0) + 1
+
+    return {
+        'violations': violations,
+        'total_hosts': len(hosts_by_name),
+        'checked_hosts': checked,
+        'violations_count': len(violations),
+        'critical_count': sum(1 for violation in violations if violation['severity'] == 'critical'),
+        'counts': counts
+    }
+
+
+def main():
+    import argparse
+    import json
+    import time
+
+    parser = argparse.ArgumentParser(description='Lint the network columns of EDS workbooks')
+    parser.add_argument('eds_files', nargs='*', help='Workbook paths, globs or directories (default: EDSLookup default)')
+    parser.add_argument('--hosts', help='Comma-separated hostnames to report on (default: all)')
+    parser.add_argument('--json', action='store_true', help='Print the full result as JSON')
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from EDSLookup import EDSLookup
+
+    eds = EDSLookup(eds_files=','.join(os.path.abspath(path) for path in args.eds_files) or None)
+    hostnames = [host for host in args.hosts.split(',') if host.strip()] if args.hosts else None
+
+    start = time.perf_counter()
+    result = eds.validate_eds_network(hostnames)
+    elapsed = time.perf_counter() - start
+
+    if args.json:
+        print(json.dumps(result, indent=2, default=str))
+    else:
+        for violation in result['violations']:
+            location = f"{os.path.basename(violation['file'])}:{violation['row']}" if violation['file'] else violation['row']
+            print(f"{violation['severity'].upper():8} {location} {violation['hostname']}: "
+                  f"{violation['check']} - {violation['reason']}")
+        print(f"\n{result['checked_hosts']} host(s) checked in {elapsed:.3f}s: "
+              f"{result['violations_count']} violation(s), {result['critical_count']} critical")
+
+    sys.exit(1 if result['critical_count'] else 0)
+
+
+if __name__ == "__main__":
+    main()
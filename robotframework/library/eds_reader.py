@@ -0,0 +1,166 @@
+"""
+EDS Workbook Reader
+Lightweight pandas-free reader for EDS worksheets using openpyxl read_only mode
+"""
+
+import math
+
+
+# Number of consecutive empty rows that marks the end of the data block
+EMPTY_ROW_BLOCK = 5
+
+# Rows searched for the header when a sheet has title rows above it
+HEADER_SEARCH_ROWS = 10
+
+
+class SheetNotFoundError(ValueError):
+    """Raised by read_sheet when the workbook has no sheet of the requested name"""
+
+
+class EDSTable:
+    """Columnar in-memory copy of one EDS worksheet"""
+
+    def __init__(self, columns, data, row_numbers=None):
+        """
+        Args:
+            columns: Ordered list of column names
+            data: Dict mapping each column name to its list of cell values
+            row_numbers: Worksheet row number of each row (default: unknown)
+        """
+        self.columns = list(columns)
+        self.data = data
+        self.row_count = len(data[self.columns[0]]) if self.columns else 0
+        self.row_numbers = row_numbers if row_numbers is not None else [None] * self.row_count
+
+    def __len__(self):
+        return self.row_count
+
+    @classmethod
+    def from_payload(cls, payload):
+        """Build a table from the columnar payload stored in the EDS cache"""
+        return cls(payload['columns'], payload['data'], payload.get('row_numbers'))
+
+    def to_payload(self):
+        """Return the columnar payload stored in the EDS cache"""
+        return {'columns': self.columns, 'data': self.data, 'row_numbers': self.row_numbers}
+
+    def column(self, name):
+        """Return the list of values of one column"""
+        return self.data[name]
+
+    def row(self, position):
+        """Return one row as a dict of column name -> value"""
+        return {col: self.data[col][position] for col in self.columns}
+
+    def to_dataframe(self):
+        """Return the table as a pandas DataFrame (pandas is imported on demand)"""
+        import pandas as pd
+        return pd.DataFrame(self.data, columns=self.columns)
+
+
+def is_missing(value):
+    """Check whether a cell value is empty (None or NaN)"""
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def read_sheet(path, sheet_name, columns=None, empty_row_block=EMPTY_ROW_BLOCK, header_marker=None):
+    """
+    Stream one worksheet into an EDSTable without pandas
+
+    The header row is resolved once and only the projected columns are
+    copied out of each row. Reading stops at the first block of
+    empty_row_block consecutive empty rows, so trailing template rows and
+    formatting-only ranges are never walked.
+
+    Args:
+        path: Path to the xlsx workbook
+        sheet_name: Worksheet to read; its first row is the header
+        columns: Column names to keep (default: all). Names missing from the sheet are skipped
+        empty_row_block: Consecutive empty rows that end the data (default: 5)
+        header_marker: Column name identifying the header row, for sheets with title rows
+                       above the header (default: the first row is the header)
+
+    Returns:
+        EDSTable: Columnar copy of the projected columns (empty rows are skipped)
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        if sheet_name not in workbook.sheetnames:
+            raise SheetNotFoundError(f"Sheet '{sheet_name}' not found in {path}")
+
+        worksheet = workbook[sheet_name]
+        header_row = 1
+        header = next(worksheet.iter_rows(max_row=1, values_only=True), ())
+        if header_marker is not None:
+            header_row, header = _find_header(worksheet, header_marker)
+            if header_row is None:
+                raise ValueError(f"Header '{header_marker}' not found in the first {HEADER_SEARCH_ROWS} "
+                                 f"rows of sheet '{sheet_name}' in {path}")
+        positions = _project_columns(_header_columns(header), columns)
+        names = list(positions)
+        indexes = list(positions.values())
+        values = [[] for _ in names]
+        row_numbers = []
+
+        if indexes:
+            last_index = max(indexes)
+            empty_rows = 0
+            rows = worksheet.iter_rows(min_row=header_row + 1, max_col=last_index + 1, values_only=True)
+            for row_number, row in enumerate(rows, start=header_row + 1):
+                if len(row) <= last_index:
+                    row = tuple(row) + (None,) * (last_index + 1 - len(row))
+                cells = [row[index] for index in indexes]
+
+                if all(is_missing(cell) for cell in cells):
+                    empty_rows += 1
+                    if empty_rows >= empty_row_block:
+                        break
+                    continue
+                empty_rows = 0
+
+                row_numbers.append(row_number)
+                for column_values, cell in zip(values, cells):
+                    column_values.append(cell)
+
+        return EDSTable(names, dict(zip(names, values)), row_numbers)
+    finally:
+        workbook.close()
+
+
+def _find_header(worksheet, header_marker):
+    """Return (row number, values) of the first row containing header_marker, or (None, ())"""
+    rows = worksheet.iter_rows(max_row=HEADER_SEARCH_ROWS, values_only=True)
+    for row_number, row in enumerate(rows, start=1):
+        if any(not is_missing(cell) and str(cell).strip() == header_marker for cell in row):
+            return row_number, row
+    return None, ()
+
+
+def _project_columns(header_columns, columns):
+    """Map each projected column name to its position in the header"""
+    positions = {name: index for index, name in enumerate(header_columns)}
+    if columns is None:
+        return positions
+    return {name: positions[name] for name in columns if name in positions}
+
+
+def _header_columns(header_row):
+    """Build unique column names from a header row, naming blank headers like pandas does"""
+    # Drop trailing blank header cells so the template's unused columns are not read
+    header = list(header_row)
+    while header and is_missing(header[-1]):
+        header.pop()
+
+    columns = []
+    seen = {}
+    for position, name in enumerate(header):
+        name = f"Unnamed: {position}" if is_missing(name) else str(name).strip()
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        columns.append(name)
+    return columns
@@ -0,0 +1,111 @@
+"""
+Library Logging Facade
+Level-gated, structured and sampled logging shared by the library/ modules
+
+Per-item messages (one per EDS field, device, datastore ...) are dropped
+unless the detail level is DEBUG, and repeated messages are sampled, so a
+keyword writes one structured record to output.xml instead of dozens.
+
+Configuration (environment variables read at import, or set_detail_level()):
+    LIBRARY_LOG_LEVEL:  INFO (default) hides per-item messages, DEBUG shows them
+    LIBRARY_LOG_SAMPLE: Messages per key and operation logged before sampling starts (default: 50)
+    LIBRARY_LOG_EVERY:  After that, log one in every N repeats (default: 100)
+"""
+
+import json
+import os
+import threading
+from robot.api import logger
+
+
+LEVELS = {'TRACE': 0, 'DEBUG': 10, 'INFO': 20, 'WARN': 30, 'ERROR': 40}
+
+_settings = {
+    'detail_level': LEVELS.get(os.environ.get('LIBRARY_LOG_LEVEL', 'INFO').upper(), LEVELS['INFO']),
+    'sample_limit': int(os.environ.get('LIBRARY_LOG_SAMPLE', '50')),
+    'sample_every': max(1, int(os.environ.get('LIBRARY_LOG_EVERY', '100')))
+}
+_counts = {}
+_counts_lock = threading.Lock()
+
+
+def set_detail_level(level):
+    """Set the level that gates per-item messages ('DEBUG' shows them, 'INFO' hides them)"""
+    level = str(level).upper()
+    if level not in LEVELS:
+        raise ValueError(f"Unknown log level '{level}' - use one of {list(LEVELS)}")
+    _settings['detail_level'] = LEVELS[level]
+
+
+def detail_enabled():
+    """Check whether per-item messages are currently emitted"""
+    return _settings['detail_level'] <= LEVELS['DEBUG']
+
+
+def get_logger(component):
+    """Return the logging facade for one library component"""
+    return LibraryLogger(component)
+
+
+class LibraryLogger:
+    """Logging facade used by the library/ modules"""
+
+    def __init__(self, component):
+        self.component = component
+
+    def info(self, message):
+        logger.info(message)
+
+    def warn(self, message):
+        logger.warn(message)
+
+    def error(self, message):
+        logger.error(message)
+
+    def record(self, operation, **fields):
+        """
+        Emit one structured INFO record summarizing an operation
+
+        Also restarts sampling of this component's per-item messages, so each
+        operation gets its own sample budget.
+
+        Args:
+            operation: Short operation name, e.g. 'lookup_server_config'
+            fields: JSON-serializable details of the operation
+        """
+        with _counts_lock:
+            for counter in [counter for counter in _counts if counter[0] == self.component]:
+                del _counts[counter]
+
+        payload = json.dumps(fields, default=str)
+        logger.info(f"[{self.component}] {operation} {payload}")
+
+    def detail(self, key, message, *args):
+        """
+        Emit a per-item message when the detail level allows it
+
+        Formatting is deferred until the message is known to be emitted, so
+        callers can pass format arguments instead of pre-built strings.
+        Repeats of the same key are sampled once they pass the sample limit.
+
+        Args:
+            key: Sampling key identifying the repeated message, e.g. 'eds_field'
+            message: Message or str.format template
+            args: Values for the template
+        """
+        if not detail_enabled():
+            return
+
+        with _counts_lock:
+            count = _counts.get((self.component, key), 0) + 1
+            _counts[(self.component, key)] = count
+
+        limit = _settings['sample_limit']
+        if count > limit and (count - limit) % _settings['sample_every']:
+            return
+
+        if args:
+            message = message.format(*args)
+        if count > limit:
+            message = f"{message} (sampled: {count} messages for '{key}')"
+        logger.info(message)
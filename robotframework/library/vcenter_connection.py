@@ -0,0 +1,368 @@
+"""
+vCenter Connection Manager
+Pooled, health-checked pyVmomi sessions shared by the vCenter libraries
+
+VCenterAPI and VCenterLibrary used to SmartConnect on their own, so a suite
+importing both logged in twice and kept two sessions open. Both now take their
+session from one process-wide pool keyed by host, port, user and SSL
+verification: the first
+connect logs in (or reuses a session saved by vcenter_session_cache), later
+connects for the same identity share that session, and it is closed when the
+last library releases it or when the process exits.
+
+A session left unused for HEALTH_CHECK_INTERVAL seconds is checked with one
+SessionManager.currentSession read before it is handed out again, and is
+logged in again if vCenter has expired it. A daemon keep-alive thread does the
+same read every KEEPALIVE_INTERVAL seconds on idle sessions. Without it, a long
+suite that spends most of its time on SSH checks would lose its session to
+vCenter's idle timeout.
+"""
+
+import atexit
+import ssl
+import threading
+import time
+from collections import Counter
+from pyVim.connect import Disconnect, SmartConnect
+from robot.api.logger import info, warn
+from vcenter_inventory import DEFAULT_INVENTORY_TTL, InventoryIndex, count_round_trips
+from vcenter_session_cache import SOAP_SESSION, forget_session, load_session, save_session
+
+
+# Idle seconds after which a session is checked before it is used again
+HEALTH_CHECK_INTERVAL = 60
+
+# Idle seconds after which the keep-alive thread touches a session (vCenter's idle timeout is 30 minutes)
+KEEPALIVE_INTERVAL = 600
+
+_POOL = {}
+_POOL_LOCK = threading.Lock()
+_KEEPALIVE_THREAD = None
+
+# SOAP requests of every pooled session in this process, for per-keyword round-trip measurements
+API_CALLS = Counter()
+
+
+def ssl_verified(verify_ssl):
+    """Whether a verify_ssl argument (bool or Robot string such as 'True') asks for certificate verification"""
+    if isinstance(verify_ssl, str):
+        return verify_ssl.strip().lower() in ('1', 'true', 'yes', 'on')
+    return bool(verify_ssl)
+
+
+def create_ssl_context(verify_ssl=False):
+    """SSL context for vCenter connections; unverified unless verify_ssl is set"""
+    if not ssl_verified(verify_ssl):
+        return ssl._create_unverified_context()
+    return ssl.create_default_context()
+
+
+def smart_connect(host, username, password, port=443, ssl_context=None, session_cache=False):
+    """
+    SmartConnect to vCenter, reusing the cached session of an earlier process when enabled
+
+    A cached session is validated with SessionManager.currentSession (None once
+    vCenter has expired it); on failure the stale entry is dropped and a normal
+    login is done, whose session is then cached.
+
+    Args:
+        host: vCenter host
+        username: vCenter user
+        password: vCenter password (only used when a login is needed)
+        port: vCenter port (default: 443)
+        ssl_context: SSL context passed to SmartConnect
+        session_cache: Reuse and save sessions in the on-disk cache (default: False)
+
+    Returns:
+        tuple: (service_instance, reused) where reused tells whether the login was skipped
+    """
+    if session_cache:
+        session_id = load_session(SOAP_SESSION, host, port, username)
+        if session_id:
+            try:
+                service_instance = SmartConnect(host=host, user=username, pwd=password, port=int(port),
+                                                sslContext=ssl_context, sessionId=session_id)
+                if service_instance.RetrieveContent().sessionManager.currentSession is not None:
+                    info(f"Reusing cached vCenter session for {username}@{host}")
+                    return service_instance, True
+                service_instance._stub.DropConnections()
+                info(f"Cached vCenter session for {username}@{host} has expired - logging in again")
+            except Exception as e:
+                warn(f"Could not reuse cached vCenter session for {username}@{host}: {str(e)}")
+            forget_session(SOAP_SESSION, host, port, username)
+
+    service_instance = SmartConnect(host=host, user=username, pwd=password, port=int(port), sslContext=ssl_context)
+    if session_cache and service_instance:
+        save_session(SOAP_SESSION, host, port, username, service_instance._stub.GetSessionId())
+    return service_instance, False
+
+
+def connection_key(host, port, username, verify_ssl=False):
+    """
+    Pool key of a vCenter session: host and user are case-insensitive
+
+    SSL verification is part of the key, so a caller asking for a verified
+    connection never gets a session opened without certificate checks.
+    """
+    return (str(host).strip().lower(), int(port), str(username).strip().lower(), ssl_verified(verify_ssl))
+
+
+class VCenterConnection:
+    """One pooled vCenter session, shared by every library connected with the same host, port, user and SSL verification"""
+
+    def __init__(self, host, port, username, password, verify_ssl=False, session_cache=False):
+        self.host = host
+        self.port = int(port)
+        self.username = username
+        self.password = password
+        self.verify_ssl = ssl_verified(verify_ssl)
+        self.session_cache = session_cache
+        self.service_instance = None
+        self.content = None
+        self.inventory = None
+        # SOAP requests per method / lazily fetched property, across reconnects
+        self.api_calls = Counter()
+        self.users = 0
+        self.logins = 0
+        self.last_used = 0.0
+        self.lock = threading.RLock()
+
+    @property
+    def key(self):
+        return connection_key(self.host, self.port, self.username, self.verify_ssl)
+
+    def handle(self):
+        """Plain-data identifier of this session, safe to keep in Robot variables"""
+        return {'host': self.host, 'port': self.port, 'username': self.username, 'verify_ssl': self.verify_ssl}
+
+    def connect(self):
+        """Log in (or reuse a cached session) and start counting its SOAP requests"""
+        with self.lock:
+            service_instance, reused = smart_connect(
+                self.host, self.username, self.password, port=self.port,
+                ssl_context=create_ssl_context(self.verify_ssl), session_cache=self.session_cache
+            )
+            if not service_instance:
+                raise RuntimeError("Failed to connect to vCenter - no service instance returned")
+
+            count_round_trips(service_instance._stub, self.api_calls)
+            count_round_trips(service_instance._stub, API_CALLS)
+            self.service_instance = service_instance
+            self.content = service_instance.RetrieveContent()
+            self.inventory = None
+            self.last_used = time.monotonic()
+            if not reused:
+                self.logins += 1
+            return self.content
+
+    def is_alive(self):
+        """Check the session with one SessionManager.currentSession read"""
+        try:
+            return self._session_alive()
+        except Exception as e:
+            warn(f"vCenter session check for {self.username}@{self.host} failed: {str(e)}")
+            return False
+
+    def _session_alive(self):
+        """Read SessionManager.currentSession without logging; raises when vCenter cannot be reached"""
+        return self.content is not None and self.content.sessionManager.currentSession is not None
+
+    def ensure_alive(self):
+        """
+        Return the ServiceContent of a working session
+
+        The session is only checked after HEALTH_CHECK_INTERVAL idle seconds;
+        an expired session is dropped and logged in again.
+        """
+        with self.lock:
+            if self.service_instance is None:
+                return self.connect()
+            if time.monotonic() - self.last_used >= HEALTH_CHECK_INTERVAL and not self.is_alive():
+                warn(f"vCenter session for {self.username}@{self.host} expired - reconnecting")
+                self.close(logout=False)
+                if self.session_cache:
+                    forget_session(SOAP_SESSION, self.host, self.port, self.username)
+                return self.connect()
+            self.last_used = time.monotonic()
+            return self.content
+
+    def inventory_index(self, ttl=DEFAULT_INVENTORY_TTL):
+        """Name -> managed object index of this session, created on first use and dropped when the session closes"""
+        with self.lock:
+            if self.content is None:
+                raise RuntimeError(f"vCenter session for {self.username}@{self.host} is closed")
+            if self.inventory is None:
+                self.inventory = InventoryIndex(self.content, ttl)
+            self.inventory.ttl = float(ttl)
+            return self.inventory
+
+    def keep_alive(self):
+        """
+        Touch the session if it has been idle for KEEPALIVE_INTERVAL seconds
+
+        Runs on the keep-alive thread, where Robot's logger must not be used, so
+        a failed check is not logged here: the session simply stays idle and
+        the next ensure_alive on the main thread reports it and reconnects.
+        """
+        if not self.lock.acquire(blocking=False):
+            return  # In use right now, so not idle
+        try:
+            if self.service_instance is not None and time.monotonic() - self.last_used >= KEEPALIVE_INTERVAL:
+                try:
+                    alive = self._session_alive()
+                except Exception:
+                    alive = False
+                if alive:
+                    self.last_used = time.monotonic()
+        finally:
+            self.lock.release()
+
+    def close(self, logout=None):
+        """
+        Close the session's connections
+
+        Args:
+            logout: End the vCenter session (default: only when the session cache is off,
+                    so cached sessions stay valid for the next robot process)
+        """
+        with self.lock:
+            if self.service_instance is None:
+                return
+            if logout is None:
+                logout = not self.session_cache
+            try:
+                if logout:
+                    Disconnect(self.service_instance)
+                    if self.session_cache:
+                        forget_session(SOAP_SESSION, self.host, self.port, self.username)
+                else:
+                    self.service_instance._stub.DropConnections()
+            finally:
+                self.service_instance = None
+                self.content = None
+                self.inventory = None
+
+
+def connect(host, username, password, port=443, verify_ssl=False, session_cache=False):
+    """
+    Get the pooled session for a vCenter host and user, logging in on first use
+
+    Every call must be paired with release(). Verified and unverified connections
+    to the same host and user are pooled as separate sessions.
+
+    Args:
+        host: vCenter server hostname or IP
+        username: vCenter username
+        password: vCenter password (kept for reconnecting after the session expires)
+        port: vCenter port (default: 443)
+        verify_ssl: Whether to verify the SSL certificate (default: False)
+        session_cache: Reuse and save sessions in the on-disk session cache (default: False)
+
+    Returns:
+        VCenterConnection: The shared connection, with a working session
+    """
+    key = connection_key(host, port, username, verify_ssl)
+    with _POOL_LOCK:
+        connection = _POOL.get(key)
+        if connection is None:
+            connection = VCenterConnection(host, port, username, password, verify_ssl, session_cache)
+            _POOL[key] = connection
+            _start_keepalive()
+        else:
+            info(f"Sharing pooled vCenter session for {username}@{host} ({connection.users} users)")
+            connection.password = password
+        connection.users += 1
+
+    try:
+        connection.ensure_alive()
+    except Exception:
+        release(connection, logout=False)
+        raise
+    return connection
+
+
+def get_connection(handle):
+    """
+    Look up a pooled session from its handle
+
+    Args:
+        handle: VCenterConnection.handle() dict (host, port, username, verify_ssl)
+
+    Returns:
+        VCenterConnection: The pooled connection
+
+    Raises:
+        RuntimeError: When the session was never opened or has been released
+    """
+    connection = None
+    if handle and isinstance(handle, dict):
+        connection = _POOL.get(connection_key(handle.get('host'), handle.get('port', 443), handle.get('username'),
+                                              handle.get('verify_ssl', False)))
+    if connection is None:
+        raise RuntimeError("Not connected to vCenter - call VCenter Connect first")
+    return connection
+
+
+def release(connection, logout=None):
+    """
+    Release one user of a pooled session; the session is closed when its last user releases it
+
+    Args:
+        connection: VCenterConnection returned by connect()
+        logout: End the vCenter session once unused (default: only when the session cache is off)
+    """
+    with _POOL_LOCK:
+        connection.users -= 1
+        if connection.users > 0:
+            info(f"vCenter session for {connection.username}@{connection.host} still used by {connection.users} other libraries")
+            return
+        if _POOL.get(connection.key) is connection:
+            del _POOL[connection.key]
+    connection.close(logout)
+
+
+def pool_statistics():
+    """
+    Return users, logins and SOAP requests of every pooled session
+
+    Sessions are keyed by 'user@host:port', with ' (verified)' appended when SSL verification is on.
+    """
+    with _POOL_LOCK:
+        connections = list(_POOL.values())
+    return {
+        f"{c.username}@{c.host}:{c.port}{' (verified)' if c.verify_ssl else ''}": {
+            'users': c.users, 'logins': c.logins, 'api_calls': sum(c.api_calls.values())
+        }
+        for c in connections
+    }
+
+
+def _start_keepalive():
+    """Start the keep-alive thread once per process (called with _POOL_LOCK held)"""
+    global _KEEPALIVE_THREAD
+    if _KEEPALIVE_THREAD is None or not _KEEPALIVE_THREAD.is_alive():
+        _KEEPALIVE_THREAD = threading.Thread(target=_keepalive_loop, name='vcenter-keepalive', daemon=True)
+        _KEEPALIVE_THREAD.start()
+
+
+def _keepalive_loop():
+    """Touch idle pooled sessions for the life of the process"""
+    while True:
+        time.sleep(KEEPALIVE_INTERVAL / 4)
+        with _POOL_LOCK:
+            connections = list(_POOL.values())
+        for connection in connections:
+            connection.keep_alive()
+
+
+@atexit.register
+def _close_all():
+    """Close every pooled session at exit; cached sessions stay logged in for the next process"""
+    with _POOL_LOCK:
+        connections = list(_POOL.values())
+        _POOL.clear()
+    for connection in connections:
+        try:
+            connection.close()
+        except Exception as e:
+            warn(f"Error disconnecting from vCenter {connection.host}: {str(e)}")
@@ -0,0 +1,645 @@
+"""
+Bulk vCenter inventory retrieval and EDS reconciliation
+
+The whole VM inventory is pulled with PropertyCollector.RetrievePropertiesEx
+over a container view, a page of objects per round trip, instead of walking
+managed objects one property access at a time. Hosts and clusters come back
+in the same retrieval, so VM placement is resolved without extra calls.
+
+The inventory is then joined against the EDS hosts on hostname as two tables
+and the CPU, RAM, cluster and disk drift of every host is computed with
+column-wise comparisons. pandas is only imported when a reconciliation runs.
+
+Usage:
+    python vcenter_inventory.py --vcenter vcenter.domain.com --username admin@vsphere.local [--output drift.csv]
+    (the password is read from VCENTER_PASSWORD)
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from pyVmomi import vim, vmodl
+from EDSLookup import EDSLookup, HOSTNAME_COLUMN, SOURCE_FILE_COLUMN, SOURCE_ROW_COLUMN
+
+
+# Objects fetched per RetrievePropertiesEx / ContinueRetrievePropertiesEx round trip
+DEFAULT_PAGE_SIZE = 1000
+
+VM_PROPERTIES = [
+    'name', 'config.template', 'config.version', 'config.hardware.numCPU',
+    'config.hardware.numCoresPerSocket', 'config.hardware.memoryMB',
+    'config.hardware.device', 'runtime.host', 'runtime.powerState'
+]
+# VM properties read by VCenterAPI.get_vm_comprehensive_details
+VM_DETAIL_PROPERTIES = [
+    'name', 'config.version', 'config.hardware.numCPU', 'config.hardware.numCoresPerSocket',
+    'config.hardware.memoryMB', 'config.hardware.device', 'runtime.host', 'resourcePool'
+]
+HOST_PROPERTIES = ['name', 'parent']
+CLUSTER_PROPERTIES = ['name']
+
+# Memory is compared in GB to two decimals, as test4 does
+MEMORY_TOLERANCE_GB = 0.01
+# VM disks may exceed the EDS allocation (swap, OS overhead); only a shortfall beyond this is drift
+DISK_TOLERANCE_GB = 1.0
+
+DRIFT_CHECKS = ['missing_in_vcenter', 'cpu', 'memory', 'cluster', 'disk']
+
+# Seconds a name -> MoRef index stays valid before the next lookup rebuilds it
+DEFAULT_INVENTORY_TTL = 300
+
+# A missing name rebuilds its type's index only if the index is older than this, so repeated
+# lookups of names that do not exist cost one round trip each instead of a full rebuild
+MISS_REFRESH_INTERVAL = 30
+
+
+def retrieve_properties(content, property_specs, container=None, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Retrieve properties of every object of the given types below a container in bulk
+
+    Args:
+        content: vCenter ServiceContent (service_instance.RetrieveContent())
+        property_specs: Dict of managed object type -> list of property paths
+        container: Folder / datacenter / cluster to search (default: the root folder)
+        page_size: Objects returned per round trip (default: 1000)
+
+    Returns:
+        list: (managed object, {property path: value}) per object; unset properties are absent
+    """
+    view = content.viewManager.CreateContainerView(container or content.rootFolder, list(property_specs), True)
+    try:
+        traversal = vmodl.query.PropertyCollector.TraversalSpec(
+            name='traverseView', path='view', skip=False, type=vim.view.ContainerView
+        )
+        object_spec = vmodl.query.PropertyCollector.ObjectSpec(obj=view, skip=True, selectSet=[traversal])
+        filter_spec = vmodl.query.PropertyCollector.FilterSpec(
+            objectSet=[object_spec],
+            propSet=[
+                vmodl.query.PropertyCollector.PropertySpec(type=object_type, pathSet=list(paths), all=False)
+                for object_type, paths in property_specs.items()
+            ]
+        )
+        return _retrieve(content.propertyCollector, filter_spec, page_size)
+    finally:
+        view.Destroy()
+
+
+def _retrieve(collector, filter_spec, page_size):
+    """Run one RetrievePropertiesEx and follow its continuation tokens"""
+    options = vmodl.query.PropertyCollector.RetrieveOptions(maxObjects=int(page_size))
+    objects = []
+    result = collector.RetrievePropertiesEx([filter_spec], options)
+    while result is not None:
+        for object_content in result.objects:
+            objects.append((object_content.obj, {prop.name: prop.val for prop in object_content.propSet or []}))
+        result = collector.ContinueRetrievePropertiesEx(result.token) if result.token else None
+    return objects
+
+
+class InventoryIndex:
+    """
+    Name -> managed object index of one vCenter session, one bulk name retrieval per object type
+
+    Each object type is indexed on first use and rebuilt when it is older than
+    the TTL, or when a name is missing and the index is older than
+    MISS_REFRESH_INTERVAL (the object may have been created since). Exact DNS names that do not match an inventory name are resolved
+    with the vCenter SearchIndex, which needs no inventory walk. The index is
+    kept on the pooled session (VCenterConnection.inventory_index) and dropped
+    with it, since its managed objects are bound to that session.
+    """
+
+    def __init__(self, content, ttl=DEFAULT_INVENTORY_TTL):
+        self.content = content
+        self.ttl = float(ttl)
+        self._names = {}
+        self._lock = threading.Lock()
+
+    def names(self, object_type, refresh=False):
+        """Return the {name: managed object} index of a type, building it if missing or expired"""
+        return self._entry(object_type, refresh)[1]
+
+    def _entry(self, object_type, refresh=False):
+        """Return the (built at, names) entry of a type, building it if missing or expired"""
+        with self._lock:
+            entry = self._names.get(object_type)
+            if refresh or entry is None or time.monotonic() - entry[0] > self.ttl:
+                objects = retrieve_properties(self.content, {object_type: ['name']})
+                names = {}
+                for obj, props in objects:
+                    names.setdefault(props.get('name'), obj)
+                entry = (time.monotonic(), names)
+                self._names[object_type] = entry
+            return entry
+
+    def invalidate(self, object_type=None):
+        """Drop the index of one type (default: every type) so the next lookup rebuilds it"""
+        with self._lock:
+            if object_type is None:
+                self._names.clear()
+            else:
+                self._names.pop(object_type, None)
+
+    def find(self, object_type, name, partial=False):
+        """
+        Find a managed object by inventory name
+
+        Args:
+            object_type: vim.VirtualMachine, vim.HostSystem, vim.ClusterComputeResource, ...
+            name: Inventory name; for VMs and hosts also an exact DNS name
+            partial: Fall back to the first object whose name contains name (default: False)
+
+        Returns:
+            Managed object or None
+        """
+        built_at, names = self._entry(object_type)
+        obj = self._match(names, name, partial)
+        if obj is None and object_type in (vim.VirtualMachine, vim.HostSystem):
+            obj = self._find_by_dns_name(object_type, name)
+        if obj is None and time.monotonic() - built_at > min(MISS_REFRESH_INTERVAL, self.ttl):
+            # Not in an index built a while ago: the object may be new, rebuild once
+            obj = self._match(self.names(object_type, refresh=True), name, partial)
+        return obj
+
+    @staticmethod
+    def _match(names, name, partial):
+        """Exact name match, else (when partial) the first name containing name"""
+        obj = names.get(name)
+        if obj is None and partial:
+            obj = next((candidate for candidate_name, candidate in names.items()
+                        if candidate_name and name in candidate_name), None)
+        return obj
+
+    def _find_by_dns_name(self, object_type, name):
+        """Resolve an exact DNS name with SearchIndex.FindByDnsName"""
+        obj = self.content.searchIndex.FindByDnsName(dnsName=name, vmSearch=object_type is vim.VirtualMachine)
+        return obj if isinstance(obj, object_type) else None
+
+
+def collect_vm_details(content, vm):
+    """
+    Fetch a VM with its hosts, cluster and networks in a single RetrievePropertiesEx call
+
+    Returns:
+        dict: Details of the VM, as returned per VM by collect_vms_details
+    """
+    return collect_vms_details(content, [vm])[vm._moId]
+
+
+def collect_vms_details(content, vms, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Fetch VMs with their hosts, clusters and networks in one batched RetrievePropertiesEx call
+
+    Traversal specs walk VM -> resource pool -> owning compute resource -> its
+    hosts, and VM -> networks, so placement and network names come back in
+    the same round trip as the VM hardware. Traversal paths must be top-level
+    properties, which is why the host is reached through the resource pool
+    owner rather than through runtime.host. Objects shared by several VMs
+    (hosts, clusters, networks) are returned once.
+
+    Args:
+        content: vCenter ServiceContent
+        vms: vim.VirtualMachine references
+        page_size: Objects returned per round trip (default: 1000)
+
+    Returns:
+        dict: VM moId -> {'vm' ({property path: value} of VM_DETAIL_PROPERTIES),
+              'hosts' (moId -> name), 'compute_resource' (managed object or None),
+              'compute_resource_name', 'networks' (moId -> name)}
+    """
+    PropertyCollector = vmodl.query.PropertyCollector
+    traversals = [
+        PropertyCollector.TraversalSpec(name='vmToResourcePool', type=vim.VirtualMachine, path='resourcePool', skip=False,
+                                        selectSet=[PropertyCollector.SelectionSpec(name='resourcePoolToOwner')]),
+        PropertyCollector.TraversalSpec(name='resourcePoolToOwner', type=vim.ResourcePool, path='owner', skip=False,
+                                        selectSet=[PropertyCollector.SelectionSpec(name='computeResourceToHost')]),
+        PropertyCollector.TraversalSpec(name='computeResourceToHost', type=vim.ComputeResource, path='host', skip=False),
+        PropertyCollector.TraversalSpec(name='vmToNetwork', type=vim.VirtualMachine, path='network', skip=False)
+    ]
+    filter_spec = PropertyCollector.FilterSpec(
+        objectSet=[PropertyCollector.ObjectSpec(obj=vm, skip=False, selectSet=traversals) for vm in vms],
+        propSet=[
+            PropertyCollector.PropertySpec(type=vim.VirtualMachine, pathSet=VM_DETAIL_PROPERTIES, all=False),
+            PropertyCollector.PropertySpec(type=vim.ResourcePool, pathSet=['owner'], all=False),
+            PropertyCollector.PropertySpec(type=vim.ComputeResource, pathSet=['name'], all=False),
+            PropertyCollector.PropertySpec(type=vim.HostSystem, pathSet=['name'], all=False),
+            PropertyCollector.PropertySpec(type=vim.Network, pathSet=['name'], all=False)
+        ]
+    )
+
+    vm_props, pool_owners, compute_resources, hosts, networks = {}, {}, {}, {}, {}
+    for obj, props in _retrieve(content.propertyCollector, filter_spec, page_size):
+        if isinstance(obj, vim.VirtualMachine):
+            vm_props[obj._moId] = props
+        elif isinstance(obj, vim.ResourcePool):
+            pool_owners[obj._moId] = props.get('owner')
+        elif isinstance(obj, vim.ComputeResource):
+            compute_resources[obj._moId] = (obj, props.get('name'))
+        elif isinstance(obj, vim.HostSystem):
+            hosts[obj._moId] = props.get('name')
+        elif isinstance(obj, vim.Network):
+            networks[obj._moId] = props.get('name')
+
+    details = {}
+    for vm in vms:
+        props = vm_props.get(vm._moId, {})
+        pool = props.get('resourcePool')
+        owner = pool_owners.get(pool._moId) if pool is not None else None
+        compute_resource, compute_resource_name = compute_resources.get(owner._moId, (None, None)) if owner is not None else (None, None)
+        details[vm._moId] = {
+            'vm': props,
+            'hosts': hosts,
+            'compute_resource': compute_resource,
+            'compute_resource_name': compute_resource_name,
+            'networks': networks
+        }
+    return details
+
+
+def collect_host_vm_datastores(content, host, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Fetch the VMs of a host with their power state and datastores in one RetrievePropertiesEx call
+
+    Traversal specs walk host -> VMs -> datastores, so the datastore names and
+    types come back in the same round trip instead of one Fetch per VM and
+    datastore property.
+
+    Args:
+        content: vCenter ServiceContent
+        host: vim.HostSystem reference
+        page_size: Objects returned per round trip (default: 1000)
+
+    Returns:
+        list: One dict per VM with a config, in host.vm order: vm_name,
+              datastores ([{name, type}]) and power_state
+    """
+    PropertyCollector = vmodl.query.PropertyCollector
+    props = _retrieve_related(content, host, [
+        PropertyCollector.TraversalSpec(name='hostToVm', type=vim.HostSystem, path='vm', skip=False,
+                                        selectSet=[PropertyCollector.SelectionSpec(name='vmToDatastore')]),
+        PropertyCollector.TraversalSpec(name='vmToDatastore', type=vim.VirtualMachine, path='datastore', skip=False)
+    ], {
+        vim.HostSystem: ['vm'],
+        vim.VirtualMachine: ['name', 'runtime.powerState', 'datastore', 'config.template'],
+        vim.Datastore: ['name', 'summary.type']
+    }, page_size)
+
+    assignments = []
+    for vm in props.get(host._moId, {}).get('vm') or []:
+        vm_props = props.get(vm._moId, {})
+        if not any(path.startswith('config.') for path in vm_props):
+            continue
+        power_state = vm_props.get('runtime.powerState')
+        assignments.append({
+            'vm_name': vm_props.get('name'),
+            'datastores': [
+                {'name': props.get(ds._moId, {}).get('name'), 'type': props.get(ds._moId, {}).get('summary.type') or 'Unknown'}
+                for ds in vm_props.get('datastore') or []
+            ],
+            'power_state': str(power_state) if power_state is not None else None
+        })
+    return assignments
+
+
+def collect_host_datastores(content, host, provisioned=False, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Fetch the datastores of a host, and optionally the disks of every VM on them, in one RetrievePropertiesEx call
+
+    Args:
+        content: vCenter ServiceContent
+        host: vim.HostSystem reference
+        provisioned: Also return provisioned_gb, the disk capacity of every VM on each datastore
+        page_size: Objects returned per round trip (default: 1000)
+
+    Returns:
+        list: One dict per datastore, in host.datastore order, with name, type,
+              capacity, free_space, accessible (and provisioned_gb)
+    """
+    PropertyCollector = vmodl.query.PropertyCollector
+    traversals = [PropertyCollector.TraversalSpec(
+        name='hostToDatastore', type=vim.HostSystem, path='datastore', skip=False,
+        selectSet=[PropertyCollector.SelectionSpec(name='datastoreToVm')] if provisioned else []
+    )]
+    property_specs = {vim.HostSystem: ['datastore'], vim.Datastore: ['name', 'summary']}
+    if provisioned:
+        traversals.append(PropertyCollector.TraversalSpec(name='datastoreToVm', type=vim.Datastore, path='vm', skip=False))
+        property_specs[vim.Datastore].append('vm')
+        property_specs[vim.VirtualMachine] = ['config.hardware.device']
+    props = _retrieve_related(content, host, traversals, property_specs, page_size)
+
+    datastores = []
+    for ds in props.get(host._moId, {}).get('datastore') or []:
+        ds_props = props.get(ds._moId, {})
+        summary = ds_props.get('summary')
+        datastore = {
+            'name': ds_props.get('name'),
+            'type': getattr(summary, 'type', None),
+            'capacity': getattr(summary, 'capacity', None),
+            'free_space': getattr(summary, 'freeSpace', None),
+            'accessible': getattr(summary, 'accessible', None)
+        }
+        if provisioned:
+            # Sum all virtual disk capacities of the VMs using this datastore
+            datastore['provisioned_gb'] = 0
+            for vm in ds_props.get('vm') or []:
+                for device in props.get(vm._moId, {}).get('config.hardware.device') or []:
+                    if isinstance(device, vim.vm.device.VirtualDisk):
+                        datastore['provisioned_gb'] += round(disk_capacity_bytes(device) / (1024**3), 2)
+        datastores.append(datastore)
+    return datastores
+
+
+def _retrieve_related(content, obj, traversals, property_specs, page_size):
+    """Retrieve properties of an object and of everything its traversal specs reach, keyed by moId"""
+    PropertyCollector = vmodl.query.PropertyCollector
+    filter_spec = PropertyCollector.FilterSpec(
+        objectSet=[PropertyCollector.ObjectSpec(obj=obj, skip=False, selectSet=traversals)],
+        propSet=[
+            PropertyCollector.PropertySpec(type=object_type, pathSet=list(paths), all=False)
+            for object_type, paths in property_specs.items()
+        ]
+    )
+    return {found._moId: props for found, props in _retrieve(content.propertyCollector, filter_spec, page_size)}
+
+
+def count_round_trips(stub, counter):
+    """
+    Count every SOAP request made through a pyVmomi stub
+
+    Lazy property reads on managed objects are sent as 'Fetch' requests and are
+    counted per property, e.g. counter['Fetch config']; other calls are counted
+    per method, e.g. counter['RetrievePropertiesEx'].
+
+    Args:
+        stub: service_instance._stub of a connected session
+        counter: collections.Counter updated in place
+    """
+    # SmartConnect wraps the SOAP adapter in a session stub; count at the adapter
+    stub = getattr(stub, 'soapStub', stub)
+    invoke_method = stub.InvokeMethod
+
+    def counted_invoke_method(mo, info, *args, **kwargs):
+        wsdl_name = getattr(info, 'wsdlName', None) or getattr(info, 'name', 'unknown')
+        counter[f"Fetch {info.name}" if wsdl_name == 'Fetch' else wsdl_name] += 1
+        return invoke_method(mo, info, *args, **kwargs)
+
+    stub.InvokeMethod = counted_invoke_method
+
+
+def collect_vm_inventory(content, container=None, page_size=DEFAULT_PAGE_SIZE, include_templates=False):
+    """
+    Collect placement and sizing of every VM in one bulk property retrieval
+
+    Args:
+        content: vCenter ServiceContent
+        container: Folder / datacenter / cluster to search (default: the root folder)
+        page_size: Objects returned per round trip (default: 1000)
+        include_templates: Also return VM templates (default: False)
+
+    Returns:
+        list: One dict per VM with name, moref, power_state, cpu_count, cores_per_socket,
+              memory_size_mb, memory_size_gb, hardware_version, host_name, cluster_name,
+              cluster_id, disk_count and disk_capacity_gb
+    """
+    objects = retrieve_properties(content, {
+        vim.VirtualMachine: VM_PROPERTIES,
+        vim.HostSystem: HOST_PROPERTIES,
+        vim.ClusterComputeResource: CLUSTER_PROPERTIES
+    }, container, page_size)
+
+    clusters = {obj._moId: props.get('name') for obj, props in objects if isinstance(obj, vim.ClusterComputeResource)}
+    hosts = {}
+    for obj, props in objects:
+        if isinstance(obj, vim.HostSystem):
+            parent = props.get('parent')
+            cluster_id = parent._moId if isinstance(parent, vim.ClusterComputeResource) else None
+            hosts[obj._moId] = (props.get('name', 'N/A'), cluster_id)
+
+    inventory = []
+    for obj, props in objects:
+        if not isinstance(obj, vim.VirtualMachine):
+            continue
+        if props.get('config.template') and not include_templates:
+            continue
+
+        host = props.get('runtime.host')
+        host_name, cluster_id = hosts.get(host._moId, ('N/A', None)) if host is not None else ('N/A', None)
+        disks = [device for device in props.get('config.hardware.device') or []
+                 if isinstance(device, vim.vm.device.VirtualDisk)]
+        memory_mb = props.get('config.hardware.memoryMB')
+
+        inventory.append({
+            'name': props.get('name'),
+            'moref': obj._moId,
+            'power_state': str(props.get('runtime.powerState', 'N/A')),
+            'cpu_count': props.get('config.hardware.numCPU'),
+            'cores_per_socket': props.get('config.hardware.numCoresPerSocket'),
+            'memory_size_mb': memory_mb,
+            'memory_size_gb': round(memory_mb / 1024, 2) if memory_mb is not None else None,
+            'hardware_version': props.get('config.version', 'N/A'),
+            'host_name': host_name,
+            'cluster_name': clusters.get(cluster_id, 'N/A') if cluster_id else 'N/A',
+            'cluster_id': cluster_id or 'N/A',
+            'disk_count': len(disks),
+            'disk_capacity_gb': round(sum(disk_capacity_bytes(disk) for disk in disks) / (1024 ** 3), 2)
+        })
+    return inventory
+
+
+def disk_capacity_bytes(disk):
+    """Capacity of a VirtualDisk in bytes (capacityInBytes is unset on old hardware versions)"""
+    return disk.capacityInBytes if getattr(disk, 'capacityInBytes', None) else (disk.capacityInKB or 0) * 1024
+
+
+def eds_host_records(eds):
+    """
+    Build one record per EDS host with the values the reconciliation compares
+
+    Args:
+        eds: Loaded EDSLookup instance
+
+    Returns:
+        list: Dicts with hostname, eds_cpu, eds_ram, eds_cluster, eds_disk_gb, file and row
+    """
+    eds._require_hostname_index()
+    table = eds.server_data
+
+    def column(name):
+        return table.column(name) if name in table.columns else [None] * len(table)
+
+    cpu, ram, cluster = column('Number of CPU Cores (recom)'), column('RAM'), column('VxRail Cluster')
+    names, files, rows = column(HOSTNAME_COLUMN), column(SOURCE_FILE_COLUMN), column(SOURCE_ROW_COLUMN)
+
+    records = []
+    for host, position in eds.hostname_index.items():
+        totals = eds.storage_totals.get(host, {})
+        allocated = sum(group['allocated_gb'] for group in totals.values())
+        records.append({
+            'key': host.split('.')[0],
+            'hostname': str(names[position]).strip(),
+            'eds_cpu': cpu[position],
+            'eds_ram': ram[position],
+            'eds_cluster': cluster[position],
+            'eds_disk_gb': allocated if allocated else None,
+            'file': files[position],
+            'row': rows[position]
+        })
+    return records
+
+
+def reconcile(eds_records, inventory, memory_tolerance_gb=MEMORY_TOLERANCE_GB, disk_tolerance_gb=DISK_TOLERANCE_GB):
+    """
+    Join EDS hosts and vCenter VMs on hostname and flag CPU, RAM, cluster and disk drift
+
+    Hostnames are matched case-insensitively on their short name, so a VM named
+    'host01.domain.com' matches the EDS host 'host01'. An EDS value that is
+    missing, 'N/A' or not a number skips that check for the host.
+
+    Args:
+        eds_records: Records from eds_host_records
+        inventory: VM dicts from collect_vm_inventory
+        memory_tolerance_gb: Allowed RAM difference (default: 0.01)
+        disk_tolerance_gb: Allowed shortfall of VM disk capacity below the EDS allocation (default: 1)
+
+    Returns:
+        dict: rows (one per EDS host with EDS and vCenter values and a drift list), violations,
+              counts per check, total_hosts, matched_hosts, unmanaged_vms and violations_count
+    """
+    import pandas as pd
+
+    eds_columns = ['key', 'hostname', 'eds_cpu', 'eds_ram', 'eds_cluster', 'eds_disk_gb', 'file', 'row']
+    vm_columns = ['vm_name', 'cpu_count', 'memory_size_gb', 'cluster_name', 'disk_capacity_gb', 'power_state', 'key']
+    eds_frame = pd.DataFrame.from_records(eds_records, columns=eds_columns)
+    vm_frame = pd.DataFrame.from_records(
+        [dict(vm, vm_name=vm['name'], key=str(vm['name']).strip().lower().split('.')[0]) for vm in inventory],
+        columns=vm_columns
+    ).drop_duplicates('key')
+
+    frame = eds_frame.merge(vm_frame, on='key', how='left', indicator=True)
+    frame['cpu_count'] = frame['cpu_count'].astype('Int64')
+    matched = frame['_merge'] == 'both'
+
+    def number(series):
+        return pd.to_numeric(series.astype('string').str.extract(r'(\d+(?:\.\d+)?)', expand=False), errors='coerce')
+
+    expected_cpu = number(frame['eds_cpu'])
+    expected_ram = number(frame['eds_ram'])
+    expected_disk = pd.to_numeric(frame['eds_disk_gb'], errors='coerce')
+    actual_cpu = pd.to_numeric(frame['cpu_count'], errors='coerce')
+    actual_ram = pd.to_numeric(frame['memory_size_gb'], errors='coerce')
+    actual_disk = pd.to_numeric(frame['disk_capacity_gb'], errors='coerce')
+
+    expected_cluster = frame['eds_cluster'].astype('string').str.strip().str.lower()
+    actual_cluster = frame['cluster_name'].astype('string').str.lower()
+    cluster_known = expected_cluster.notna() & (expected_cluster != '') & (expected_cluster != 'n/a')
+    cluster_contained = pd.Series(
+        [bool(expected) and expected in actual for expected, actual in
+         zip(expected_cluster.fillna(''), actual_cluster.fillna(''))],
+        index=frame.index
+    )
+
+    masks = {
+        'missing_in_vcenter': ~matched,
+        'cpu': matched & expected_cpu.notna() & (actual_cpu != expected_cpu),
+        'memory': matched & expected_ram.notna() & ((actual_ram - expected_ram).abs() > memory_tolerance_gb),
+        'cluster': matched & cluster_known & ~cluster_contained,
+        'disk': matched & expected_disk.notna() & (actual_disk < expected_disk - disk_tolerance_gb)
+    }
+    reasons = {
+        'missing_in_vcenter': lambda r: f"VM '{r['hostname']}' not found in vCenter",
+        'cpu': lambda r: f"EDS expects {r['eds_cpu']} CPU cores but vCenter shows {r['cpu_count']}",
+        'memory': lambda r: f"EDS expects {r['eds_ram']} GB RAM but vCenter shows {r['memory_size_gb']} GB",
+        'cluster': lambda r: f"EDS expects cluster '{r['eds_cluster']}' but VM is in '{r['cluster_name']}'",
+        'disk': lambda r: f"EDS allocates {r['eds_disk_gb']} GB but VM disks total {r['disk_capacity_gb']} GB"
+    }
+    actual_columns = {'missing_in_vcenter': None, 'cpu': 'cpu_count', 'memory': 'memory_size_gb',
+                      'cluster': 'cluster_name', 'disk': 'disk_capacity_gb'}
+    expected_columns = {'missing_in_vcenter': None, 'cpu': 'eds_cpu', 'memory': 'eds_ram',
+                        'cluster': 'eds_cluster', 'disk': 'eds_disk_gb'}
+
+    frame = frame.astype(object).where(frame.notna(), None)
+    drift = {position: [] for position in frame.index}
+    violations = []
+    for check in DRIFT_CHECKS:
+        for position, row in frame[masks[check]].iterrows():
+            drift[position].append(check)
+            violations.append({
+                'hostname': row['hostname'],
+                'vm_name': row['vm_name'],
+                'check': check,
+                'expected': row[expected_columns[check]] if expected_columns[check] else None,
+                'actual': row[actual_columns[check]] if actual_columns[check] else None,
+                'reason': reasons[check](row),
+                'file': row['file'],
+                'row': row['row'],
+                'severity': 'warning' if check == 'missing_in_vcenter' else 'critical'
+            })
+
+    rows = frame.drop(columns=['key', '_merge']).to_dict('records')
+    for position, row in zip(frame.index, rows):
+        row['drift'] = drift[position]
+
+    return {
+        'rows': rows,
+        'violations': violations,
+        'counts': {check: int(masks[check].sum()) for check in DRIFT_CHECKS},
+        'total_hosts': len(eds_frame),
+        'matched_hosts': int(matched.sum()),
+        'unmanaged_vms': int((~vm_frame['key'].isin(eds_frame['key'])).sum()),
+        'violations_count': len(violations)
+    }
+
+
+def write_report(results, output_file):
+    """Write the per-host reconciliation rows to a CSV file"""
+    import pandas as pd
+
+    frame = pd.DataFrame(results['rows'])
+    if 'drift' in frame.columns:
+        frame['drift'] = frame['drift'].map(', '.join)
+    frame.to_csv(output_file, index=False)
+    return output_file
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Reconcile the whole vCenter VM inventory against the EDS')
+    parser.add_argument('--vcenter', default=os.environ.get('VCENTER_SERVER'), help='vCenter host (default: VCENTER_SERVER)')
+    parser.add_argument('--username', default=os.environ.get('VCENTER_USERNAME'), help='vCenter user (default: VCENTER_USERNAME)')
+    parser.add_argument('--port', type=int, default=443, help='vCenter port (default: 443)')
+    parser.add_argument('--verify-ssl', action='store_true', default=os.environ.get('VCENTER_VERIFY_SSL', False),
+                        help='Verify the vCenter certificate (default: VCENTER_VERIFY_SSL, else off as in the libraries)')
+    parser.add_argument('--eds-files', help='EDS workbooks, comma-separated (default: EDS_FILES or the Itential EDS)')
+    parser.add_argument('--output', help='Write the per-host drift report to this CSV file')
+    args = parser.parse_args()
+
+    password = os.environ.get('VCENTER_PASSWORD')
+    if not (args.vcenter and args.username and password):
+        parser.error('vCenter host, username and VCENTER_PASSWORD are required')
+
+    # Imported here: vcenter_connection itself imports this module
+    import vcenter_connection
+    from vcenter_session_cache import session_cache_enabled
+
+    eds = EDSLookup(eds_files=args.eds_files)
+    connection = vcenter_connection.connect(args.vcenter, args.username, password, port=args.port,
+                                            verify_ssl=args.verify_ssl, session_cache=session_cache_enabled())
+    try:
+        start = time.perf_counter()
+        inventory = collect_vm_inventory(connection.ensure_alive())
+        print(f"Collected {len(inventory)} VMs in {time.perf_counter() - start:.1f}s")
+    finally:
+        vcenter_connection.release(connection)
+
+    results = reconcile(eds_host_records(eds), inventory)
+    for violation in results['violations']:
+        print(f"{violation['hostname']}: {violation['check']} - {violation['reason']}")
+    print(f"{results['matched_hosts']}/{results['total_hosts']} EDS hosts found in vCenter, "
+          f"{results['violations_count']} drift findings, {results['unmanaged_vms']} VMs not in the EDS")
+    if args.output:
+        print(f"Report written to {write_report(results, args.output)}")
+    sys.exit(1 if any(v['severity'] == 'critical' for v in results['violations']) else 0)
+
+
+if __name__ == "__main__":
+    main()
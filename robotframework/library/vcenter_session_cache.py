@@ -0,0 +1,140 @@
+"""
+vCenter Session Cache
+On-disk cache of vCenter session tokens so separate robot processes reuse one login
+
+Every vCenter-backed suite runs in its own robot process; without this cache
+each one logs in again, and a fleet run adds up to hundreds of logins that
+vCenter throttles. With the cache enabled a process first tries the session
+saved by an earlier one, validates it with one cheap request, and only logs
+in when it has expired. Sessions saved here are not logged out at exit, so
+the next process can pick them up; vCenter expires them when idle.
+vcenter_connection uses it for pyVmomi sessions, VCenterAPILibrary for REST ones.
+
+The cache is off unless the library is created with session_cache=True or the
+VCENTER_SESSION_CACHE environment variable is set to 1 / true / yes. Tokens
+are stored in a file readable only by the current user (0600, directory
+0700), keyed by a hash of API kind, host, port and user.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from robot.api.logger import info, warn
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, writes are still atomic
+    fcntl = None
+
+
+DEFAULT_SESSION_CACHE_FILE = os.path.join(os.path.expanduser('~'), '.cache', 'robotframework', 'vcenter_sessions.json')
+
+# Saved sessions older than this are ignored even if vCenter would still accept them
+SESSION_MAX_AGE = 12 * 3600
+
+SOAP_SESSION = 'soap'
+REST_SESSION = 'rest'
+
+
+def session_cache_enabled(session_cache=None):
+    """Resolve a library's session_cache argument; None defers to the VCENTER_SESSION_CACHE environment variable"""
+    if session_cache is None:
+        session_cache = os.environ.get('VCENTER_SESSION_CACHE', '')
+    if isinstance(session_cache, str):
+        return session_cache.strip().lower() in ('1', 'true', 'yes', 'on')
+    return bool(session_cache)
+
+
+def get_session_cache_file():
+    """Return the cache file, overridable with the VCENTER_SESSION_CACHE_FILE environment variable"""
+    return os.environ.get('VCENTER_SESSION_CACHE_FILE', DEFAULT_SESSION_CACHE_FILE)
+
+
+def _session_key(kind, host, port, username):
+    """Hash the session identity so the cache file does not list hosts and users"""
+    identity = f"{kind}|{str(host).strip().lower()}|{int(port)}|{str(username).strip().lower()}"
+    return hashlib.sha256(identity.encode('utf-8')).hexdigest()
+
+
+def load_session(kind, host, port, username):
+    """
+    Return the saved session token for a vCenter host and user
+
+    Args:
+        kind: SOAP_SESSION (pyVmomi session cookie) or REST_SESSION (REST API session id)
+        host: vCenter host
+        port: vCenter port
+        username: vCenter user
+
+    Returns:
+        str: Session token, or None when nothing usable is cached
+    """
+    sessions = _read_cache(get_session_cache_file())
+    entry = sessions.get(_session_key(kind, host, port, username))
+    if not entry or time.time() - entry.get('saved_at', 0) > SESSION_MAX_AGE:
+        return None
+    return entry.get('session_id')
+
+
+def save_session(kind, host, port, username, session_id):
+    """Save the session token of a fresh login for later processes"""
+    if not session_id:
+        return
+    key = _session_key(kind, host, port, username)
+    _update_cache(lambda sessions: sessions.__setitem__(key, {'session_id': session_id, 'saved_at': time.time()}))
+    info(f"Saved vCenter {kind} session for reuse by later runs")
+
+
+def forget_session(kind, host, port, username):
+    """Remove a saved session (after logout, or when vCenter rejected it)"""
+    key = _session_key(kind, host, port, username)
+    _update_cache(lambda sessions: sessions.pop(key, None))
+
+
+def _read_cache(path):
+    """Read the cache file, ignoring it when missing, corrupt or readable by other users"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            if os.name == 'posix' and os.fstat(f.fileno()).st_mode & 0o077:
+                warn(f"Ignoring vCenter session cache {path}: it is readable by other users (expected mode 0600)")
+                return {}
+            sessions = json.load(f)
+        return sessions if isinstance(sessions, dict) else {}
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        warn(f"Ignoring unreadable vCenter session cache {path}: {str(e)}")
+        return {}
+
+
+def _update_cache(change):
+    """Apply change(sessions) to the cache file under a cross-process lock and rewrite it atomically"""
+    path = get_session_cache_file()
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        with open(f"{path}.lock", 'a') as lock:
+            if fcntl:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            sessions = _read_cache(path)
+            now = time.time()
+            sessions = {key: entry for key, entry in sessions.items()
+                        if now - entry.get('saved_at', 0) <= SESSION_MAX_AGE}
+            change(sessions)
+
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            try:
+                os.chmod(tmp_path, 0o600)
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(sessions, f)
+                os.replace(tmp_path, path)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
+    except OSError as e:
+        # The cache only saves logins; never fail a connection because of it
+        warn(f"Could not update vCenter session cache {path}: {str(e)}")
+
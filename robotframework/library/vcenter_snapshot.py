@@ -0,0 +1,439 @@
+"""
+vCenter Inventory Snapshot
+Local SQLite snapshot of the vCenter inventory, so suites of one run answer from disk instead of vCenter
+
+test4, test9 and test15 all ask vCenter about the same VMs, hosts and
+datastores. Capture Snapshot pulls VMs, hosts, clusters, datastores, VM
+devices and portgroups once with bulk property retrieval (one paged
+RetrievePropertiesEx over a container view) and writes them to an indexed
+SQLite file. A library opened in snapshot mode then answers its keywords from
+that file with no network calls for the rest of the run.
+
+VM network adapters and disks are stored already reduced to the fields the
+libraries report, so the snapshot holds no pyVmomi objects and can be read by
+any process. The file is written to a temporary name and renamed into place,
+so a reader never sees a half-written snapshot.
+
+Snapshot mode is off unless the library is created with snapshot=True, the
+VCENTER_SNAPSHOT environment variable is set to 1 / true / yes, or the library
+itself captured the snapshot. The file is VCENTER_SNAPSHOT_FILE, or
+.cache/vcenter/snapshot.sqlite under the robotframework directory. Snapshots
+older than SNAPSHOT_MAX_AGE, or of another vCenter, are not used.
+"""
+
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timezone
+from pyVmomi import vim
+from vcenter_inventory import DEFAULT_PAGE_SIZE, disk_capacity_bytes, retrieve_properties
+
+
+# Bump when the schema changes so snapshots written by older code are not used
+SNAPSHOT_FORMAT_VERSION = 1
+
+DEFAULT_SNAPSHOT_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'vcenter', 'snapshot.sqlite'
+)
+
+# A snapshot describes one run; older ones are ignored rather than answering from stale inventory
+SNAPSHOT_MAX_AGE = 12 * 3600
+
+SNAPSHOT_PROPERTIES = {
+    vim.VirtualMachine: [
+        'name', 'guest.hostName', 'config.template', 'config.version', 'config.hardware.numCPU',
+        'config.hardware.numCoresPerSocket', 'config.hardware.memoryMB', 'config.hardware.device',
+        'runtime.host', 'runtime.powerState', 'datastore'
+    ],
+    vim.HostSystem: ['name', 'parent', 'datastore', 'vm'],
+    vim.ClusterComputeResource: ['name'],
+    vim.Datastore: ['name', 'summary.type', 'summary.capacity', 'summary.freeSpace', 'summary.accessible', 'vm'],
+    vim.Network: ['name']
+}
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE clusters (moid TEXT PRIMARY KEY, name TEXT);
+CREATE TABLE hosts (moid TEXT PRIMARY KEY, name TEXT, cluster_moid TEXT);
+CREATE TABLE datastores (moid TEXT PRIMARY KEY, name TEXT, type TEXT, capacity INTEGER, free_space INTEGER, accessible INTEGER);
+CREATE TABLE portgroups (moid TEXT PRIMARY KEY, name TEXT, type TEXT);
+CREATE TABLE vms (
+    moid TEXT PRIMARY KEY, name TEXT, dns_name TEXT, has_config INTEGER, template INTEGER, power_state TEXT,
+    host_moid TEXT, cpu_count INTEGER, cores_per_socket INTEGER, memory_mb INTEGER, hardware_version TEXT
+);
+CREATE TABLE vm_devices (
+    vm_moid TEXT, position INTEGER, kind TEXT, label TEXT, type TEXT, network_name TEXT, mac_address TEXT,
+    capacity_bytes INTEGER
+);
+CREATE TABLE host_datastores (host_moid TEXT, datastore_moid TEXT, position INTEGER);
+CREATE TABLE host_vms (host_moid TEXT, vm_moid TEXT, position INTEGER);
+CREATE TABLE vm_datastores (vm_moid TEXT, datastore_moid TEXT, position INTEGER);
+CREATE TABLE datastore_vms (datastore_moid TEXT, vm_moid TEXT, position INTEGER);
+CREATE INDEX clusters_name ON clusters (name);
+CREATE INDEX hosts_name ON hosts (name);
+CREATE INDEX hosts_cluster ON hosts (cluster_moid);
+CREATE INDEX vms_name ON vms (name);
+CREATE INDEX vms_dns_name ON vms (dns_name COLLATE NOCASE);
+CREATE INDEX vm_devices_vm ON vm_devices (vm_moid, position);
+CREATE INDEX host_datastores_host ON host_datastores (host_moid, position);
+CREATE INDEX host_vms_host ON host_vms (host_moid, position);
+CREATE INDEX vm_datastores_vm ON vm_datastores (vm_moid, position);
+CREATE INDEX datastore_vms_datastore ON datastore_vms (datastore_moid, position);
+"""
+
+
+def snapshot_enabled(snapshot=None):
+    """Resolve a library's snapshot argument; None defers to the VCENTER_SNAPSHOT environment variable"""
+    if snapshot is None:
+        snapshot = os.environ.get('VCENTER_SNAPSHOT', '')
+    if isinstance(snapshot, str):
+        return snapshot.strip().lower() in ('1', 'true', 'yes', 'on')
+    return bool(snapshot)
+
+
+def get_snapshot_file():
+    """Return the snapshot file, overridable with the VCENTER_SNAPSHOT_FILE environment variable"""
+    return os.environ.get('VCENTER_SNAPSHOT_FILE', DEFAULT_SNAPSHOT_FILE)
+
+
+def capture_snapshot(content, path=None, vcenter=None, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Collect the inventory in one bulk property retrieval and write it to a SQLite snapshot
+
+    Args:
+        content: vCenter ServiceContent
+        path: Snapshot file (default: get_snapshot_file())
+        vcenter: vCenter host the inventory came from, recorded so other hosts do not use it
+        page_size: Objects returned per round trip (default: 1000)
+
+    Returns:
+        dict: path, captured_at and the number of vms, hosts, clusters, datastores,
+              portgroups and devices written
+    """
+    path = path or get_snapshot_file()
+    objects = retrieve_properties(content, SNAPSHOT_PROPERTIES, page_size=page_size)
+
+    networks = {obj._moId: props.get('name') for obj, props in objects if isinstance(obj, vim.Network)}
+    rows = {table: [] for table in ('clusters', 'hosts', 'datastores', 'portgroups', 'vms', 'vm_devices',
+                                    'host_datastores', 'host_vms', 'vm_datastores', 'datastore_vms')}
+    for obj, props in objects:
+        moid = obj._moId
+        if isinstance(obj, vim.VirtualMachine):
+            rows['vms'].append(_vm_row(moid, props))
+            rows['vm_devices'].extend(_device_rows(moid, props.get('config.hardware.device') or [], networks))
+            rows['vm_datastores'].extend(_links(moid, props.get('datastore')))
+        elif isinstance(obj, vim.HostSystem):
+            parent = props.get('parent')
+            cluster_moid = parent._moId if isinstance(parent, vim.ClusterComputeResource) else None
+            rows['hosts'].append((moid, props.get('name'), cluster_moid))
+            rows['host_datastores'].extend(_links(moid, props.get('datastore')))
+            rows['host_vms'].extend(_links(moid, props.get('vm')))
+        elif isinstance(obj, vim.ClusterComputeResource):
+            rows['clusters'].append((moid, props.get('name')))
+        elif isinstance(obj, vim.Datastore):
+            accessible = props.get('summary.accessible')
+            rows['datastores'].append((
+                moid, props.get('name'), props.get('summary.type'), props.get('summary.capacity'),
+                props.get('summary.freeSpace'), None if accessible is None else int(accessible)
+            ))
+            rows['datastore_vms'].extend(_links(moid, props.get('vm')))
+        elif isinstance(obj, vim.Network):
+            rows['portgroups'].append((moid, props.get('name'), type(obj).__name__.split('.')[-1]))
+
+    captured_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    meta = {
+        'format_version': SNAPSHOT_FORMAT_VERSION,
+        'captured_at': captured_at,
+        'captured_at_epoch': time.time(),
+        'vcenter': (vcenter or '').strip().lower()
+    }
+    _write(path, meta, rows)
+
+    summary = {'path': path, 'captured_at': captured_at}
+    summary.update({table: len(rows[table]) for table in ('vms', 'hosts', 'clusters', 'datastores', 'portgroups')})
+    summary['devices'] = len(rows['vm_devices'])
+    return summary
+
+
+def _vm_row(moid, props):
+    """One vms row; hardware columns are NULL for VMs without a config (e.g. inaccessible VMs)"""
+    host = props.get('runtime.host')
+    power_state = props.get('runtime.powerState')
+    return (
+        moid, props.get('name'), props.get('guest.hostName'),
+        int(any(path.startswith('config.') for path in props)),
+        int(bool(props.get('config.template'))),
+        str(power_state) if power_state is not None else None,
+        host._moId if host is not None else None,
+        props.get('config.hardware.numCPU'), props.get('config.hardware.numCoresPerSocket'),
+        props.get('config.hardware.memoryMB'), props.get('config.version')
+    )
+
+
+def _device_rows(vm_moid, devices, networks):
+    """Network adapter and disk rows of one VM, reduced to the fields VCenterAPI reports"""
+    rows = []
+    for position, device in enumerate(devices):
+        if isinstance(device, vim.vm.device.VirtualEthernetCard):
+            network_name = 'Unknown'
+            backing = getattr(device, 'backing', None)
+            if getattr(backing, 'network', None):
+                network_name = networks.get(backing.network._moId, 'Unknown')
+            elif hasattr(getattr(backing, 'port', None), 'portgroupKey'):
+                # Distributed port group
+                network_name = backing.port.portgroupKey
+            rows.append((vm_moid, position, 'nic', device.deviceInfo.label, type(device).__name__.replace('Virtual', ''),
+                         network_name, device.macAddress if hasattr(device, 'macAddress') else 'N/A', None))
+        elif isinstance(device, vim.vm.device.VirtualDisk):
+            thin = getattr(device.backing, 'thinProvisioned', None)
+            disk_type = 'Unknown' if thin is None else 'Thin Provisioned' if thin else 'Thick Provisioned'
+            rows.append((vm_moid, position, 'disk', device.deviceInfo.label, disk_type, None, None,
+                         disk_capacity_bytes(device)))
+    return rows
+
+
+def _links(moid, targets):
+    """(moid, target moid, position) rows of a managed object reference list"""
+    return [(moid, target._moId, position) for position, target in enumerate(targets or [])]
+
+
+def _write(path, meta, rows):
+    """Write the snapshot to a temporary file in the target directory and rename it into place"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.sqlite.tmp')
+    os.close(fd)
+    try:
+        db = sqlite3.connect(tmp_path)
+        try:
+            db.executescript(SCHEMA)
+            db.executemany("INSERT INTO meta VALUES (?, ?)", [(key, str(value)) for key, value in meta.items()])
+            for table, table_rows in rows.items():
+                if table_rows:
+                    placeholders = ', '.join('?' * len(table_rows[0]))
+                    db.executemany(f"INSERT OR REPLACE INTO {table} VALUES ({placeholders})", table_rows)
+            db.commit()
+        finally:
+            db.close()
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def open_snapshot(path=None, vcenter=None, max_age=SNAPSHOT_MAX_AGE):
+    """
+    Open a snapshot if one usable for this vCenter exists
+
+    Args:
+        path: Snapshot file (default: get_snapshot_file())
+        vcenter: vCenter host the caller connects to; a snapshot of another host is not used
+        max_age: Seconds after capture the snapshot stays usable (default: 12 hours)
+
+    Returns:
+        tuple: (VCenterSnapshot or None, reason it was not used or None)
+    """
+    path = path or get_snapshot_file()
+    if not os.path.exists(path):
+        return None, f"no snapshot at {path}"
+    try:
+        snapshot = VCenterSnapshot(path)
+    except (sqlite3.Error, ValueError) as e:
+        return None, f"unreadable snapshot {path}: {str(e)}"
+
+    reason = None
+    if time.time() - snapshot.captured_at_epoch > float(max_age):
+        reason = f"snapshot {path} captured {snapshot.captured_at} is older than {int(float(max_age))}s"
+    elif vcenter and snapshot.vcenter and snapshot.vcenter != str(vcenter).strip().lower():
+        reason = f"snapshot {path} is of vCenter {snapshot.vcenter}, not {vcenter}"
+    if reason:
+        snapshot.close()
+        return None, reason
+    return snapshot, None
+
+
+class VCenterSnapshot:
+    """Read-only view of a snapshot file; lookups mirror the live InventoryIndex (exact name, then DNS or partial name)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.db = sqlite3.connect(f"file:{os.path.abspath(path)}?mode=ro", uri=True, check_same_thread=False)
+        meta = dict(self.db.execute("SELECT key, value FROM meta"))
+        if int(meta.get('format_version', 0)) != SNAPSHOT_FORMAT_VERSION:
+            self.db.close()
+            raise ValueError(f"snapshot format {meta.get('format_version')} is not {SNAPSHOT_FORMAT_VERSION}")
+        self.captured_at = meta.get('captured_at')
+        self.captured_at_epoch = float(meta.get('captured_at_epoch', 0))
+        self.vcenter = meta.get('vcenter') or None
+
+    def close(self):
+        self.db.close()
+
+    def counts(self):
+        """Number of rows per inventory table"""
+        return {table: self.db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ('vms', 'hosts', 'clusters', 'datastores', 'portgroups', 'vm_devices')}
+
+    def find_vm(self, name):
+        """moId of the VM with this name, else of the VM whose guest DNS name is name"""
+        row = self.db.execute("SELECT moid FROM vms WHERE name = ? ORDER BY rowid LIMIT 1", (name,)).fetchone()
+        if row is None:
+            row = self.db.execute("SELECT moid FROM vms WHERE dns_name = ? COLLATE NOCASE ORDER BY rowid LIMIT 1",
+                                  (name,)).fetchone()
+        return row[0] if row else None
+
+    def find_host(self, name):
+        """moId of the host with this name, else of the first host whose name contains name"""
+        row = self.db.execute("SELECT moid FROM hosts WHERE name = ? ORDER BY rowid LIMIT 1", (name,)).fetchone()
+        if row is None:
+            row = self.db.execute("SELECT moid FROM hosts WHERE instr(name, ?) > 0 ORDER BY rowid LIMIT 1",
+                                  (name,)).fetchone()
+        return row[0] if row else None
+
+    def cluster_host_names(self, cluster_name):
+        """Names of the hosts of a cluster, or None when there is no such cluster"""
+        row = self.db.execute("SELECT moid FROM clusters WHERE name = ? ORDER BY rowid LIMIT 1", (cluster_name,)).fetchone()
+        if row is None:
+            return None
+        return [name for name, in self.db.execute("SELECT name FROM hosts WHERE cluster_moid = ? ORDER BY rowid", row)]
+
+    def vm_details(self, moid):
+        """
+        Comprehensive details of a VM, in the layout of VCenterAPI.get_vm_comprehensive_details
+
+        Returns:
+            dict: name, cluster_placement, configuration, network_adapters and disk_configuration
+        """
+        vm = self.db.execute(
+            "SELECT v.name, v.cpu_count, v.cores_per_socket, v.memory_mb, v.hardware_version, h.name, c.moid, c.name "
+            "FROM vms v LEFT JOIN hosts h ON h.moid = v.host_moid LEFT JOIN clusters c ON c.moid = h.cluster_moid "
+            "WHERE v.moid = ?", (moid,)
+        ).fetchone()
+        name, cpu_count, cores_per_socket, memory_mb, hardware_version, host_name, cluster_id, cluster_name = vm
+        devices = self.db.execute(
+            "SELECT kind, label, type, network_name, mac_address, capacity_bytes FROM vm_devices "
+            "WHERE vm_moid = ? ORDER BY position", (moid,)
+        ).fetchall()
+        return {
+            'name': name,
+            'cluster_placement': {
+                'cluster_name': cluster_name if cluster_id else 'N/A',
+                'cluster_id': cluster_id or 'N/A',
+                'host_name': host_name or 'N/A'
+            },
+            'configuration': {
+                'cpu_count': cpu_count,
+                'cores_per_socket': cores_per_socket,
+                'memory_size_mb': memory_mb,
+                'memory_size_gb': round(memory_mb / 1024, 2) if memory_mb is not None else None,
+                'hardware_version': hardware_version
+            },
+            'network_adapters': [
+                {'label': label, 'type': device_type, 'network_name': network_name, 'mac_address': mac_address}
+                for kind, label, device_type, network_name, mac_address, _ in devices if kind == 'nic'
+            ],
+            'disk_configuration': [
+                {'label': label, 'capacity_gb': round(capacity_bytes / (1024**3), 2), 'type': device_type}
+                for kind, label, device_type, _, _, capacity_bytes in devices if kind == 'disk'
+            ]
+        }
+
+    def vm_inventory(self, include_templates=False):
+        """Every VM, in the layout of vcenter_inventory.collect_vm_inventory"""
+        disks = {}
+        for vm_moid, capacity_bytes in self.db.execute("SELECT vm_moid, capacity_bytes FROM vm_devices WHERE kind = 'disk'"):
+            count, total = disks.get(vm_moid, (0, 0))
+            disks[vm_moid] = (count + 1, total + capacity_bytes)
+
+        inventory = []
+        for moid, name, template, power_state, cpu_count, cores_per_socket, memory_mb, hardware_version, \
+                host_name, cluster_id, cluster_name in self.db.execute(
+                    "SELECT v.moid, v.name, v.template, v.power_state, v.cpu_count, v.cores_per_socket, v.memory_mb, "
+                    "v.hardware_version, h.name, c.moid, c.name FROM vms v LEFT JOIN hosts h ON h.moid = v.host_moid "
+                    "LEFT JOIN clusters c ON c.moid = h.cluster_moid ORDER BY v.rowid"):
+            if template and not include_templates:
+                continue
+            disk_count, disk_bytes = disks.get(moid, (0, 0))
+            inventory.append({
+                'name': name,
+                'moref': moid,
+                'power_state': power_state or 'N/A',
+                'cpu_count': cpu_count,
+                'cores_per_socket': cores_per_socket,
+                'memory_size_mb': memory_mb,
+                'memory_size_gb': round(memory_mb / 1024, 2) if memory_mb is not None else None,
+                'hardware_version': hardware_version or 'N/A',
+                'host_name': host_name or 'N/A',
+                'cluster_name': (cluster_name or 'N/A') if cluster_id else 'N/A',
+                'cluster_id': cluster_id or 'N/A',
+                'disk_count': disk_count,
+                'disk_capacity_gb': round(disk_bytes / (1024 ** 3), 2)
+            })
+        return inventory
+
+    def host_vm_datastores(self, host_name):
+        """
+        VMs of a host with their datastores, or None when the host is not found
+
+        Returns:
+            list: One dict per VM with a config: vm_name, datastores ([{name, type}]) and power_state
+        """
+        host_moid = self.find_host(host_name)
+        if host_moid is None:
+            return None
+        vms = self.db.execute(
+            "SELECT v.moid, v.name, v.power_state FROM host_vms hv JOIN vms v ON v.moid = hv.vm_moid "
+            "WHERE hv.host_moid = ? AND v.has_config ORDER BY hv.position", (host_moid,)
+        ).fetchall()
+        assignments = []
+        for moid, name, power_state in vms:
+            datastores = self.db.execute(
+                "SELECT d.name, d.type FROM vm_datastores vd JOIN datastores d ON d.moid = vd.datastore_moid "
+                "WHERE vd.vm_moid = ? ORDER BY vd.position", (moid,)
+            ).fetchall()
+            assignments.append({
+                'vm_name': name,
+                'datastores': [{'name': ds_name, 'type': ds_type or 'Unknown'} for ds_name, ds_type in datastores],
+                'power_state': power_state
+            })
+        return assignments
+
+    def host_datastores(self, host_name, provisioned=False):
+        """
+        Datastores of a host, or None when the host is not found
+
+        Args:
+            host_name: Host name, exact or partial
+            provisioned: Also return provisioned_gb, the disk capacity of every VM on each datastore
+
+        Returns:
+            list: One dict per datastore with name, type, capacity, free_space, accessible
+                  (and provisioned_gb)
+        """
+        host_moid = self.find_host(host_name)
+        if host_moid is None:
+            return None
+        datastores = []
+        for moid, name, ds_type, capacity, free_space, accessible in self.db.execute(
+                "SELECT d.moid, d.name, d.type, d.capacity, d.free_space, d.accessible FROM host_datastores hd "
+                "JOIN datastores d ON d.moid = hd.datastore_moid WHERE hd.host_moid = ? ORDER BY hd.position",
+                (host_moid,)).fetchall():
+            datastore = {
+                'name': name,
+                'type': ds_type,
+                'capacity': capacity or 0,
+                'free_space': free_space or 0,
+                'accessible': None if accessible is None else bool(accessible)
+            }
+            if provisioned:
+                provisioned_gb = 0
+                for capacity_bytes, in self.db.execute(
+                        "SELECT dev.capacity_bytes FROM datastore_vms dv JOIN vms v ON v.moid = dv.vm_moid "
+                        "JOIN vm_devices dev ON dev.vm_moid = dv.vm_moid AND dev.kind = 'disk' "
+                        "WHERE dv.datastore_moid = ? AND v.has_config ORDER BY dv.position, dev.position", (moid,)):
+                    provisioned_gb += round(capacity_bytes / (1024**3), 2)
+                datastore['provisioned_gb'] = provisioned_gb
+            datastores.append(datastore)
+        return datastores
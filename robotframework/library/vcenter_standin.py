@@ -0,0 +1,586 @@
+"""
+Offline vCenter Stand-in
+In-process vCenter emulation for regression-testing and benchmarking the pyVmomi libraries without a vCenter
+
+The stand-in replaces the SOAP adapter under a real pyVmomi ServiceInstance,
+so VCenterAPI and VCenterLibrary run unchanged: managed objects, lazy property
+reads ('Fetch'), container views, PropertyCollector.RetrievePropertiesEx with
+traversal specs and paging, SearchIndex.FindByDnsName and the session manager
+are answered from a generated inventory of any size. Every request still goes
+through the stub's InvokeMethod, so the round-trip counters of the connection
+manager see exactly the requests a real vCenter would receive.
+
+The connection manager knows nothing about the stand-in. install() (or the
+standin_installed() context manager) wraps vcenter_connection.smart_connect so
+that the vCenter host 'standin', optionally with inventory sizes, connects to
+the stand-in while every other host still connects to a real vCenter:
+
+    standin
+    standin:vms=5000,hosts=64,clusters=8,datastores=32,networks=16
+
+The benchmark, RoundTripListener and the unit tests install it; a normal
+library run never does.
+
+Usage:
+    python vcenter_standin.py --vms 5000 --hosts 64 [--output bench.json] [--baseline bench.json]
+    robot --pythonpath library --listener vcenter_standin.RoundTripListener:round_trips.json \\
+          -v VCENTER_SERVER:standin:vms=5000 tests/test4_vm_validation
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from pyVmomi import vim, vmodl
+from pyVmomi.SoapAdapter import StubAdapterAccessorMixin
+from pyVmomi.VmomiSupport import ManagedObject, newestVersions
+from robot.api.logger import info
+import vcenter_connection
+
+
+STANDIN_HOST = 'standin'
+
+DEFAULT_SIZES = {'vms': 1000, 'hosts': 32, 'clusters': 4, 'datastores': 16, 'networks': 8}
+
+# Keyword libraries whose round trips RoundTripListener records
+VCENTER_LIBRARIES = ('VCenterAPI', 'VCenterLibrary')
+
+# Inventories generated in this process, by size, so reconnects see the same objects
+_INVENTORIES = {}
+_INVENTORIES_LOCK = threading.Lock()
+
+# vcenter_connection.smart_connect as it was before install()
+_REAL_SMART_CONNECT = None
+
+
+def is_standin_host(host):
+    """True when a vCenter host names the stand-in"""
+    return str(host or '').strip().lower().split(':', 1)[0] == STANDIN_HOST
+
+
+def parse_standin_host(host):
+    """
+    Read the inventory sizes of a stand-in host such as 'standin:vms=5000,hosts=64'
+
+    Returns:
+        dict: vms, hosts, clusters, datastores and networks (DEFAULT_SIZES for the ones not given)
+    """
+    sizes = dict(DEFAULT_SIZES)
+    _, _, spec = str(host).strip().partition(':')
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        key, _, value = item.partition('=')
+        key = key.strip().lower()
+        if key not in sizes or not value.strip().isdigit() or int(value) < 1:
+            raise ValueError(f"Invalid stand-in size '{item}' - expected one of {', '.join(sizes)} with a positive count")
+        sizes[key] = int(value)
+    return sizes
+
+
+def connect(host=STANDIN_HOST, username='administrator@vsphere.local'):
+    """
+    Log in to the stand-in for a host such as 'standin:vms=5000'
+
+    Returns:
+        vim.ServiceInstance: Service instance on a new StandInStub; every connect is a new session
+    """
+    sizes = parse_standin_host(host)
+    key = tuple(sorted(sizes.items()))
+    with _INVENTORIES_LOCK:
+        inventory = _INVENTORIES.get(key)
+        if inventory is None:
+            inventory = _INVENTORIES[key] = StandInInventory(**sizes)
+    stub = StandInStub(inventory, username)
+    return vim.ServiceInstance('ServiceInstance', stub)
+
+
+def install():
+    """Route vcenter_connection connects to 'standin' hosts to the stand-in; other hosts are unaffected"""
+    global _REAL_SMART_CONNECT
+    if _REAL_SMART_CONNECT is None:
+        _REAL_SMART_CONNECT = vcenter_connection.smart_connect
+        vcenter_connection.smart_connect = _smart_connect
+
+
+def uninstall():
+    """Restore the original vcenter_connection.smart_connect"""
+    global _REAL_SMART_CONNECT
+    if _REAL_SMART_CONNECT is not None:
+        vcenter_connection.smart_connect = _REAL_SMART_CONNECT
+        _REAL_SMART_CONNECT = None
+
+
+@contextlib.contextmanager
+def standin_installed():
+    """Install the stand-in for the duration of a block, uninstalling it only if this block installed it"""
+    installed_here = _REAL_SMART_CONNECT is None
+    install()
+    try:
+        yield
+    finally:
+        if installed_here:
+            uninstall()
+
+
+def _smart_connect(host, username, password, port=443, ssl_context=None, session_cache=False):
+    """vcenter_connection.smart_connect replacement installed by install()"""
+    if is_standin_host(host):
+        info(f"Connecting to the offline vCenter stand-in {host}")
+        return connect(host, username), False
+    return _REAL_SMART_CONNECT(host, username, password, port=port, ssl_context=ssl_context, session_cache=session_cache)
+
+
+class StandInInventory:
+    """
+    Generated vCenter inventory: clusters with hosts, shared datastores, networks and VMs
+
+    Objects are stored as {moId: {property: value}}; nested properties
+    (config.hardware.numCPU, summary.capacity, ...) are read from real pyVmomi
+    data objects, so the libraries see the same types as from a vCenter. The
+    layout is deterministic for a given size and seed.
+    """
+
+    def __init__(self, vms=1000, hosts=32, clusters=4, datastores=16, networks=8, seed=0):
+        self.sizes = {'vms': vms, 'hosts': hosts, 'clusters': clusters, 'datastores': datastores, 'networks': networks}
+        self.objects = {}
+        self._dns_names = {}
+        self._generate(random.Random(seed))
+
+    def properties(self, moid):
+        return self.objects[moid]['props']
+
+    def type_of(self, moid):
+        return self.objects[moid]['type']
+
+    def find_by_dns_name(self, dns_name, vm_search):
+        """moId of the VM (guest.hostName) or host (management DNS name) with this DNS name"""
+        return self._dns_names.get((bool(vm_search), str(dns_name).lower()))
+
+    def _add(self, cls, moid, **props):
+        self.objects[moid] = {'type': cls, 'props': props}
+        return moid
+
+    def _generate(self, rng):
+        sizes = self.sizes
+        # References inside property values are stored unbound; StandInStub binds them to its session on read
+        ref = lambda cls, moid: cls(moid, None)  # noqa: E731
+
+        self._add(vim.Folder, 'group-d1', name='Datacenters')
+        clusters = [self._add(vim.ClusterComputeResource, f'domain-c{n + 1}', name=f'Cluster-{n + 1:02d}', host=[])
+                    for n in range(sizes['clusters'])]
+        pools = {cluster: self._add(vim.ResourcePool, f'resgroup-{n + 1}', name='Resources',
+                                    owner=ref(vim.ClusterComputeResource, cluster))
+                 for n, cluster in enumerate(clusters)}
+
+        tiers = [('ssd', 'VMFS'), ('vmfs', 'VMFS'), ('nfs', 'NFS'), ('archive', 'NFS'), ('vsan', 'vsan')]
+        datastores = []
+        for n in range(sizes['datastores']):
+            tier, ds_type = tiers[n % len(tiers)]
+            name = f'ds-{tier}-{n + 1:03d}'
+            capacity = rng.choice([2, 4, 8, 16]) * 1024 ** 4
+            summary = vim.Datastore.Summary(name=name, type=ds_type, capacity=capacity, accessible=True,
+                                            freeSpace=int(capacity * rng.uniform(0.1, 0.7)), url=f'ds:///vmfs/volumes/{n + 1}/')
+            datastores.append(self._add(vim.Datastore, f'datastore-{n + 1}', name=name, summary=summary, vm=[]))
+
+        networks = []
+        for n in range(sizes['networks']):
+            if n % 2:
+                networks.append(self._add(vim.dvs.DistributedVirtualPortgroup, f'dvportgroup-{n + 1}', name=f'DPG-VLAN-{100 + n}'))
+            else:
+                networks.append(self._add(vim.Network, f'network-{n + 1}', name=f'VLAN-{100 + n}'))
+
+        hosts = []
+        for n in range(sizes['hosts']):
+            cluster = clusters[n % len(clusters)]
+            # Every host of a cluster mounts the same datastores
+            cluster_datastores = [ds for i, ds in enumerate(datastores) if i % len(clusters) == clusters.index(cluster)] or datastores[:1]
+            name = f'esx{n + 1:03d}.standin.local'
+            host = self._add(vim.HostSystem, f'host-{n + 1}', name=name, parent=ref(vim.ClusterComputeResource, cluster),
+                             datastore=[ref(vim.Datastore, ds) for ds in cluster_datastores], vm=[])
+            self.properties(cluster)['host'].append(ref(vim.HostSystem, host))
+            self._dns_names[(False, f'esx{n + 1:03d}-mgmt.standin.local')] = host
+            hosts.append((host, cluster, cluster_datastores))
+
+        for n in range(sizes['vms']):
+            host, cluster, host_datastores = hosts[n % len(hosts)]
+            name = f'vm{n + 1:05d}'
+            network = networks[n % len(networks)]
+            vm_datastores = [host_datastores[n % len(host_datastores)]]
+            if n % 4 == 0 and len(host_datastores) > 1:
+                vm_datastores.append(host_datastores[(n + 1) % len(host_datastores)])
+            config = vim.vm.ConfigInfo(
+                name=name, version='vmx-19', template=n % 250 == 249, guestId='rhel8_64Guest',
+                hardware=vim.vm.VirtualHardware(
+                    numCPU=rng.choice([2, 4, 8]), numCoresPerSocket=rng.choice([1, 2]),
+                    memoryMB=rng.choice([4096, 8192, 16384, 32768]),
+                    device=[self._nic(n, network)] + [self._disk(n, d, rng) for d in range(1 + n % 3)]
+                )
+            )
+            vm = self._add(
+                vim.VirtualMachine, f'vm-{n + 1}', name=name, config=config,
+                guest=vim.vm.GuestInfo(hostName=f'{name}.standin.local'),
+                runtime=vim.vm.RuntimeInfo(host=ref(vim.HostSystem, host), connectionState='connected',
+                                           powerState='poweredOff' if n % 10 == 9 else 'poweredOn'),
+                resourcePool=ref(vim.ResourcePool, pools[cluster]),
+                network=[ref(self.type_of(network), network)],
+                datastore=[ref(vim.Datastore, ds) for ds in vm_datastores]
+            )
+            self.properties(host)['vm'].append(ref(vim.VirtualMachine, vm))
+            for ds in vm_datastores:
+                self.properties(ds)['vm'].append(ref(vim.VirtualMachine, vm))
+            self._dns_names[(True, f'{name}.standin.local')] = vm
+
+    def _nic(self, n, network):
+        """VMXNET3 adapter on a standard network or a distributed port group"""
+        if self.type_of(network) is vim.dvs.DistributedVirtualPortgroup:
+            backing = vim.vm.device.VirtualEthernetCard.DistributedVirtualPortBackingInfo(
+                port=vim.dvs.PortConnection(portgroupKey=network, switchUuid='50 00 00 00 00 00 00 01'))
+        else:
+            backing = vim.vm.device.VirtualEthernetCard.NetworkBackingInfo(
+                network=vim.Network(network, None), deviceName=self.properties(network)['name'])
+        return vim.vm.device.VirtualVmxnet3(
+            key=4000, deviceInfo=vim.Description(label='Network adapter 1', summary=''),
+            macAddress=f'00:50:56:{(n >> 16) & 0xff:02x}:{(n >> 8) & 0xff:02x}:{n & 0xff:02x}', backing=backing)
+
+    def _disk(self, n, number, rng):
+        """Flat VMDK of 40-500 GB, thin or thick"""
+        capacity_gb = rng.choice([40, 60, 100, 250, 500]) if number else 40
+        return vim.vm.device.VirtualDisk(
+            key=2000 + number, capacityInKB=capacity_gb * 1024 ** 2, capacityInBytes=capacity_gb * 1024 ** 3,
+            deviceInfo=vim.Description(label=f'Hard disk {number + 1}', summary=''),
+            backing=vim.vm.device.VirtualDisk.FlatVer2BackingInfo(
+                fileName=f'[standin] vm{n + 1:05d}/disk{number}.vmdk', diskMode='persistent', thinProvisioned=bool(number % 2)))
+
+
+class StandInStub(StubAdapterAccessorMixin):
+    """
+    SOAP adapter stand-in for one session: answers each pyVmomi request from a StandInInventory
+
+    Property collector results are plain namespaces with the attributes pyVmomi
+    callers read (objects / token, obj / propSet, name / val), since typed
+    DynamicProperty values would need typed arrays for every list.
+    """
+
+    version = newestVersions.GetName('vim')
+
+    def __init__(self, inventory, username='administrator@vsphere.local'):
+        self.inventory = inventory
+        self.username = username
+        self.session_key = f"standin-{os.urandom(8).hex()}"
+        self.session_active = True
+        self._views = {}
+        self._pages = {}
+        self._lock = threading.Lock()
+
+    def GetSessionId(self):
+        return self.session_key
+
+    def DropConnections(self):
+        pass
+
+    def expire_session(self):
+        """Behave like vCenter after its idle timeout: the session is no longer valid"""
+        self.session_active = False
+
+    def InvokeMethod(self, mo, info, args, outerStub=None):
+        method = getattr(self, f'_{info.wsdlName}', None)
+        if method is None:
+            raise vmodl.fault.NotSupported(msg=f"The vCenter stand-in does not implement {info.wsdlName}")
+        return method(mo, *args)
+
+    def _bind(self, value):
+        """Bind the managed object references inside a property value to this session"""
+        if isinstance(value, list):
+            return [self._bind(item) for item in value]
+        if isinstance(value, ManagedObject):
+            return type(value)(value._moId, self)
+        return value
+
+    def _get(self, moid, path):
+        """Value of a property path such as 'config.hardware.numCPU' (None when unset)"""
+        if moid in self._views:
+            return list(self._views[moid]) if path == 'view' else None
+        first, *rest = path.split('.')
+        value = self.inventory.properties(moid).get(first)
+        for part in rest:
+            value = getattr(value, part, None) if value is not None else None
+        return self._bind(value)
+
+    # ServiceInstance
+
+    def _RetrieveServiceContent(self, mo):
+        ref = lambda cls, moid: cls(moid, self)  # noqa: E731
+        return vim.ServiceContent(
+            rootFolder=ref(vim.Folder, 'group-d1'),
+            propertyCollector=ref(vim.PropertyCollector, 'propertyCollector'),
+            viewManager=ref(vim.view.ViewManager, 'ViewManager'),
+            searchIndex=ref(vim.SearchIndex, 'SearchIndex'),
+            sessionManager=ref(vim.SessionManager, 'SessionManager'),
+            about=vim.AboutInfo(name='VMware vCenter Server (stand-in)', fullName='VMware vCenter Server 8.0.3 stand-in',
+                                vendor='VMware, Inc.', version='8.0.3', build='0', apiType='VirtualCenter', apiVersion='8.0.3.0')
+        )
+
+    def _CurrentTime(self, mo):
+        return datetime.now(timezone.utc)
+
+    # Property reads
+
+    def _Fetch(self, mo, prop):
+        if isinstance(mo, vim.ServiceInstance):
+            return self._RetrieveServiceContent(mo) if prop == 'content' else None
+        if isinstance(mo, vim.SessionManager):
+            if prop != 'currentSession':
+                return None
+            if not self.session_active:
+                return None
+            return vim.UserSession(key=self.session_key, userName=self.username, fullName=self.username,
+                                   loginTime=datetime.now(timezone.utc), lastActiveTime=datetime.now(timezone.utc))
+        if not self.session_active:
+            raise vim.fault.NotAuthenticated(msg='The session is not authenticated.')
+        return self._get(mo._moId, prop)
+
+    def _Logout(self, mo):
+        self.session_active = False
+
+    # Views and search
+
+    def _CreateContainerView(self, mo, container, types, recursive):
+        self._check_session()
+        types = tuple(types or [vim.ManagedEntity])
+        with self._lock:
+            moid = f'session[{self.session_key}]view-{len(self._views) + 1}'
+            self._views[moid] = [
+                obj['type'](obj_moid, self) for obj_moid, obj in self.inventory.objects.items()
+                if issubclass(obj['type'], types)
+            ]
+        return vim.view.ContainerView(moid, self)
+
+    def _DestroyView(self, mo):
+        with self._lock:
+            self._views.pop(mo._moId, None)
+
+    def _FindByDnsName(self, mo, datacenter, dnsName, vmSearch):
+        self._check_session()
+        moid = self.inventory.find_by_dns_name(dnsName, vmSearch)
+        return self.inventory.type_of(moid)(moid, self) if moid else None
+
+    # Property collector
+
+    def _RetrievePropertiesEx(self, mo, specSet, options):
+        self._check_session()
+        objects = []
+        for filter_spec in specSet:
+            objects.extend(self._evaluate(filter_spec))
+        return self._page(objects, getattr(options, 'maxObjects', None))
+
+    def _ContinueRetrievePropertiesEx(self, mo, token):
+        self._check_session()
+        with self._lock:
+            remaining, page_size = self._pages.pop(token)
+        return self._page(remaining, page_size)
+
+    def _page(self, objects, page_size):
+        """Return the first page and keep the rest behind a continuation token"""
+        page_size = int(page_size or 100)
+        token = None
+        if len(objects) > page_size:
+            with self._lock:
+                token = f'token-{len(self._pages) + 1}-{time.monotonic_ns()}'
+                self._pages[token] = (objects[page_size:], page_size)
+        return SimpleNamespace(objects=objects[:page_size], token=token)
+
+    def _evaluate(self, filter_spec):
+        """Walk each ObjectSpec and its traversal specs, then read the PropertySpec paths of every object reached"""
+        PropertyCollector = vmodl.query.PropertyCollector
+        found, seen = [], set()
+
+        for object_spec in filter_spec.objectSet:
+            named = {}
+
+            def register(specs):
+                for spec in specs or []:
+                    if isinstance(spec, PropertyCollector.TraversalSpec) and spec.name not in named:
+                        named[spec.name] = spec
+                        register(spec.selectSet)
+
+            register(object_spec.selectSet)
+
+            def walk(obj, select_set, skip):
+                if not skip and obj._moId not in seen:
+                    seen.add(obj._moId)
+                    found.append(obj)
+                for selection in select_set or []:
+                    traversal = selection if isinstance(selection, PropertyCollector.TraversalSpec) else named.get(selection.name)
+                    if traversal is None or not isinstance(obj, traversal.type):
+                        continue
+                    value = self._get(obj._moId, traversal.path)
+                    for child in value if isinstance(value, list) else [value] if value is not None else []:
+                        walk(child, traversal.selectSet, traversal.skip)
+
+            walk(object_spec.obj, object_spec.selectSet, object_spec.skip)
+
+        results = []
+        for obj in found:
+            prop_set = []
+            for prop_spec in filter_spec.propSet:
+                if isinstance(obj, prop_spec.type):
+                    for path in prop_spec.pathSet or []:
+                        value = self._get(obj._moId, path)
+                        if value is not None:
+                            prop_set.append(SimpleNamespace(name=path, val=value))
+            if prop_set:
+                results.append(SimpleNamespace(obj=obj, propSet=prop_set))
+        return results
+
+    def _check_session(self):
+        if not self.session_active:
+            raise vim.fault.NotAuthenticated(msg='The session is not authenticated.')
+
+
+class RoundTripListener:
+    """
+    Robot Framework listener recording the vCenter round trips and time of every VCenterAPI / VCenterLibrary keyword
+
+    Works against the stand-in and a real vCenter alike; loading the listener installs the
+    stand-in so suites can point VCENTER_SERVER at 'standin'. The report is written when the run ends.
+
+        robot --pythonpath library --listener vcenter_standin.RoundTripListener:round_trips.json tests/...
+    """
+
+    ROBOT_LISTENER_API_VERSION = 2
+
+    def __init__(self, report_file='vcenter_round_trips.json'):
+        # Not 'output_file': that name is a listener method Robot calls with its output.xml path
+        self.report_file = report_file
+        self.keywords = {}
+        self._started = []
+        install()
+
+    def start_keyword(self, name, attrs):
+        if attrs.get('libname') in VCENTER_LIBRARIES:
+            self._started.append((sum(vcenter_connection.API_CALLS.values()), time.perf_counter()))
+
+    def end_keyword(self, name, attrs):
+        if attrs.get('libname') in VCENTER_LIBRARIES and self._started:
+            calls_before, start = self._started.pop()
+            entry = self.keywords.setdefault(name, {'calls': 0, 'round_trips': 0, 'elapsed_ms': 0.0})
+            entry['calls'] += 1
+            entry['round_trips'] += sum(vcenter_connection.API_CALLS.values()) - calls_before
+            entry['elapsed_ms'] = round(entry['elapsed_ms'] + (time.perf_counter() - start) * 1000, 2)
+
+    def close(self):
+        with open(self.report_file, 'w', encoding='utf-8') as f:
+            json.dump({'keywords': self.keywords}, f, indent=2, sort_keys=True)
+
+
+def run_benchmark(sizes, sample=50):
+    """
+    Run the vCenter library keywords against a stand-in inventory and count their round trips
+
+    Args:
+        sizes: Inventory sizes, as returned by parse_standin_host
+        sample: VMs fetched by the batched details keyword (default: 50)
+
+    Returns:
+        dict: sizes and keywords ({keyword: {'round_trips', 'elapsed_ms'}})
+    """
+    from VCenterAPI import VCenterAPI
+    from VCenterLibrary import VCenterLibrary
+
+    host = f"{STANDIN_HOST}:" + ','.join(f"{key}={value}" for key, value in sizes.items())
+
+    # Build the inventory first, so keyword timings exclude it
+    inventory_start = time.perf_counter()
+    connect(host)
+    inventory_ms = round((time.perf_counter() - inventory_start) * 1000, 2)
+
+    vm_names = [f'vm{n + 1:05d}' for n in range(0, sizes['vms'], max(1, sizes['vms'] // sample))][:sample]
+    host_name = 'esx001'
+    api, library = VCenterAPI(session_cache=False), VCenterLibrary(session_cache=False)
+    snapshot_file = os.path.join(tempfile.mkdtemp(prefix='vcenter-standin-'), 'snapshot.sqlite')
+    connection = {}
+
+    steps = [
+        ('Connect To vCenter', lambda: api.connect_to_vcenter(host, 'administrator@vsphere.local', 'standin')),
+        ('VCenter Connect', lambda: connection.update(library.vcenter_connect(host, 'administrator@vsphere.local', 'standin'))),
+        ('Get VM Comprehensive Details', lambda: api.get_vm_comprehensive_details(vm_names[-1])),
+        ('Get VM Comprehensive Details (DNS name)', lambda: api.get_vm_comprehensive_details(f'{vm_names[0]}.standin.local')),
+        ('Get VMs Comprehensive Details', lambda: api.get_vms_comprehensive_details(vm_names)),
+        ('VCenter Find Host In Cluster', lambda: library.vcenter_find_host_in_cluster(connection, 'Cluster-01', host_name)),
+        ('VCenter Get VM Datastore Assignments', lambda: library.vcenter_get_vm_datastore_assignments(connection, host_name)),
+        ('VCenter Get Datastore Capacity', lambda: library.vcenter_get_datastore_capacity(connection, host_name)),
+        ('VCenter Get Datastore Performance Tiers', lambda: library.vcenter_get_datastore_performance_tiers(connection, host_name)),
+        ('VCenter Get Datastore Subscription Levels', lambda: library.vcenter_get_datastore_subscription_levels(connection, host_name)),
+        ('Capture vCenter Snapshot', lambda: api.capture_vcenter_snapshot(snapshot_file)),
+        ('Get VMs Comprehensive Details (snapshot)', lambda: api.get_vms_comprehensive_details(vm_names)),
+    ]
+
+    keywords = {}
+    with standin_installed():
+        try:
+            for name, step in steps:
+                calls_before = sum(vcenter_connection.API_CALLS.values())
+                start = time.perf_counter()
+                step()
+                keywords[name] = {
+                    'round_trips': sum(vcenter_connection.API_CALLS.values()) - calls_before,
+                    'elapsed_ms': round((time.perf_counter() - start) * 1000, 2)
+                }
+        finally:
+            api.disconnect_from_vcenter(logout=True)
+            library.vcenter_disconnect(connection, logout=True)
+            if os.path.exists(snapshot_file):
+                os.unlink(snapshot_file)
+            os.rmdir(os.path.dirname(snapshot_file))
+
+    return {'sizes': sizes, 'inventory_ms': inventory_ms, 'keywords': keywords}
+
+
+def compare_to_baseline(results, baseline):
+    """Keywords whose round trips grew compared with a baseline run: [(keyword, baseline, now)]"""
+    regressions = []
+    for name, entry in results['keywords'].items():
+        before = baseline.get('keywords', {}).get(name, {}).get('round_trips')
+        if before is not None and entry['round_trips'] > before:
+            regressions.append((name, before, entry['round_trips']))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the vCenter libraries against an offline vCenter stand-in')
+    for key, value in DEFAULT_SIZES.items():
+        parser.add_argument(f'--{key}', type=int, default=value, help=f'Stand-in {key} (default: {value})')
+    parser.add_argument('--sample', type=int, default=50, help='VMs fetched by the batched details keyword (default: 50)')
+    parser.add_argument('--output', help='Write the results to this JSON file')
+    parser.add_argument('--baseline', help='Fail when a keyword needs more round trips than in this earlier JSON result')
+    args = parser.parse_args()
+
+    sizes = {key: getattr(args, key) for key in DEFAULT_SIZES}
+    results = run_benchmark(sizes, args.sample)
+
+    print(f"Stand-in inventory: {', '.join(f'{value} {key}' for key, value in sizes.items())}")
+    print(f"{'Keyword':<45} {'Round trips':>12} {'Time (ms)':>12}")
+    for name, entry in results['keywords'].items():
+        print(f"{name:<45} {entry['round_trips']:>12} {entry['elapsed_ms']:>12}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare_to_baseline(results, json.load(f))
+        for name, before, now in regressions:
+            print(f"REGRESSION: {name} needs {now} round trips (baseline {before})")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,342 @@
+"""
+EDS Lookup Benchmark
+Measures how EDSLookup load time, lookup latency and memory scale with workbook size
+
+Synthetic "Server Requirements" workbooks are generated from the column schema of
+excel_generate.create_server_requirements_data(). Each size is measured in fresh
+Python processes so load times and peak RSS are not skewed by earlier runs:
+
+    cold:  empty EDS cache, the workbook is parsed from xlsx
+    warm:  compiled EDS cache present, plus single and batch lookups
+
+Results are written as JSON so runs can be compared between commits:
+
+    python scripts/eds_benchmark.py --output results/eds_benchmark_new.json
+    python scripts/eds_benchmark.py --sizes 100,10000 --compare results/eds_benchmark_old.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROBOTFRAMEWORK_ROOT = os.path.dirname(SCRIPTS_DIR)
+LIBRARY_DIR = os.path.join(ROBOTFRAMEWORK_ROOT, 'library')
+
+DEFAULT_SIZES = [100, 10000, 100000]
+DEFAULT_WORK_DIR = os.path.join(tempfile.gettempdir(), 'eds_benchmark')
+SHEET_NAME = 'Server Requirements'
+
+# Every Nth host gets a second storage row with a blank Server Name, like real EDS sheets
+EXTRA_STORAGE_EVERY = 3
+
+
+def generate_workbook(path, rows, seed=0):
+    """
+    Write a synthetic EDS workbook with the Server Requirements schema
+
+    Hostnames and IPs are unique per host; every other value is copied from
+    the template servers of excel_generate, so the generated sheet has the
+    same columns and value types as a real EDS.
+
+    Args:
+        path: Output xlsx path
+        rows: Number of data rows to write
+        seed: Seed for the template order, so a size always produces the same workbook
+    """
+    from openpyxl import Workbook
+    from excel_generate import create_server_requirements_data
+
+    template = create_server_requirements_data()
+    columns = list(template)
+    servers = [{col: template[col][i] for col in columns} for i in range(len(template[columns[0]]))]
+    random.Random(seed).shuffle(servers)
+
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet(SHEET_NAME)
+    worksheet.append(columns)
+
+    written = 0
+    host = 0
+    while written < rows:
+        server = dict(servers[host % len(servers)])
+        server['Server Name'] = f"{server['Server Name'][:-2]}{host:06d}"
+        server['CNAME'] = server['Server Name']
+        server['IP Assignment'] = f"10.{100 + host // 65536 % 100}.{host // 256 % 256}.{host % 256}"
+        worksheet.append([server[col] for col in columns])
+        written += 1
+
+        if host % EXTRA_STORAGE_EVERY == 0 and written < rows:
+            extra = {col: '' for col in columns}
+            extra.update({
+                'Drive or Volume Group': 'datavg:',
+                'Files System': '/dev/mapper/datavg-optlv',
+                'Logical Volume Name/Partition (Mounted On)': '/opt',
+                'Storage Allocation (GB)': 50,
+                'Recommended Storage Allocation (GB)': 50,
+                'Drive Purpose': 'Application'
+            })
+            worksheet.append([extra[col] for col in columns])
+            written += 1
+        host += 1
+
+    workbook.save(path)
+
+
+def get_workbook(work_dir, rows, seed):
+    """Return the synthetic workbook for one size, generating it on first use"""
+    path = os.path.join(work_dir, f"eds_benchmark_{rows}_seed{seed}.xlsx")
+    if not os.path.exists(path):
+        print(f"Generating {rows} row workbook: {path}")
+        start = time.perf_counter()
+        generate_workbook(path, rows, seed)
+        print(f"  generated in {time.perf_counter() - start:.2f}s")
+    return path
+
+
+def peak_rss_mb():
+    """Return the peak resident set size of this process in MB, or None if unavailable"""
+    # VmHWM is reset by exec, unlike ru_maxrss which can report the forking parent's peak
+    if os.path.exists('/proc/self/status'):
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return round(int(line.split()[1]) / 1024, 1)
+
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+            return round(psutil.Process().memory_info().peak_wset / 1024 / 1024, 1)
+        except Exception:
+            return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KB on Linux
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(peak / divisor, 1)
+
+
+def percentile(values, fraction):
+    """Return the nearest-rank percentile of a list of values"""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+def run_worker(phase, workbook, lookups, batch, seed):
+    """
+    Measure one phase inside a fresh process and return its metrics
+
+    Args:
+        phase: 'cold' (load only) or 'warm' (load, store reuse, single and batch lookups)
+        workbook: Path to the synthetic workbook
+        lookups: Number of single lookups to time
+        batch: Number of hostnames in the batch lookup
+        seed: Seed for picking the looked-up hostnames
+
+    Returns:
+        dict: Metrics of the phase, times in seconds
+    """
+    sys.path.insert(0, LIBRARY_DIR)
+
+    start = time.perf_counter()
+    import EDSLookup as eds_module
+    import_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    eds = eds_module.EDSLookup(eds_files=workbook)
+    load_s = time.perf_counter() - start
+
+    metrics = {
+        'import_s': round(import_s, 4),
+        'load_s': round(load_s, 4),
+        'hosts': len(eds.hostname_index),
+        'rows': len(eds.server_data)
+    }
+
+    if phase == 'warm':
+        start = time.perf_counter()
+        eds_module.EDSLookup(eds_files=workbook)
+        metrics['store_reuse_s'] = round(time.perf_counter() - start, 6)
+
+        hostnames = sorted(eds.hostname_index)
+        picker = random.Random(seed)
+
+        latencies = []
+        for hostname in picker.choices(hostnames, k=lookups):
+            start = time.perf_counter()
+            eds.lookup_server_config(hostname)
+            latencies.append(time.perf_counter() - start)
+        metrics['single_lookup'] = {
+            'count': lookups,
+            'mean_us': round(statistics.mean(latencies) * 1e6, 1),
+            'p50_us': round(percentile(latencies, 0.50) * 1e6, 1),
+            'p95_us': round(percentile(latencies, 0.95) * 1e6, 1),
+            'max_us': round(max(latencies) * 1e6, 1)
+        }
+
+        batch_hosts = picker.sample(hostnames, min(batch, len(hostnames)))
+        start = time.perf_counter()
+        eds.lookup_server_configs(batch_hosts)
+        batch_s = time.perf_counter() - start
+        metrics['batch_lookup'] = {
+            'count': len(batch_hosts),
+            'total_s': round(batch_s, 4),
+            'per_host_us': round(batch_s / len(batch_hosts) * 1e6, 1)
+        }
+
+    metrics['peak_rss_mb'] = peak_rss_mb()
+    return metrics
+
+
+def run_phase(phase, workbook, cache_dir, args):
+    """Run one measurement phase in a child process and return its metrics"""
+    env = dict(os.environ, EDS_CACHE_DIR=cache_dir)
+    env.pop('EDS_FILES', None)
+    command = [
+        sys.executable, os.path.abspath(__file__), '--worker', phase,
+        '--workbook', workbook, '--lookups', str(args.lookups),
+        '--batch', str(args.batch), '--seed', str(args.seed)
+    ]
+    result = subprocess.run(command, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"{phase} phase failed for {workbook}:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def benchmark_size(rows, args):
+    """Measure cold and warm phases for one workbook size"""
+    workbook = get_workbook(args.work_dir, rows, args.seed)
+    cache_dir = os.path.join(args.work_dir, f"cache_{rows}")
+
+    cold_runs = []
+    warm_runs = []
+    for _ in range(args.repeat):
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        cold_runs.append(run_phase('cold', workbook, cache_dir, args))
+        warm_runs.append(run_phase('warm', workbook, cache_dir, args))
+    shutil.rmtree(cache_dir, ignore_errors=True)
+
+    # Keep the fastest run of each phase; slower repeats are noise from the machine
+    cold = min(cold_runs, key=lambda run: run['load_s'])
+    warm = min(warm_runs, key=lambda run: run['load_s'])
+    return {
+        'rows': rows,
+        'workbook_bytes': os.path.getsize(workbook),
+        'cold': cold,
+        'warm': warm
+    }
+
+
+def git_revision():
+    """Return (commit, dirty) of the working tree, or (None, None) outside git"""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROBOTFRAMEWORK_ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+        status = subprocess.run(
+            ['git', 'status', '--porcelain', '--', 'library'], cwd=ROBOTFRAMEWORK_ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+        return commit, bool(status)
+    except Exception:
+        return None, None
+
+
+def compare_results(baseline, current):
+    """Print the change of each headline metric against a baseline result file"""
+    metrics = [
+        ('cold load s', lambda r: r['cold']['load_s']),
+        ('warm load s', lambda r: r['warm']['load_s']),
+        ('lookup p50 us', lambda r: r['warm']['single_lookup']['p50_us']),
+        ('batch per host us', lambda r: r['warm']['batch_lookup']['per_host_us']),
+        ('peak rss MB', lambda r: r['warm']['peak_rss_mb'])
+    ]
+    base_by_rows = {result['rows']: result for result in baseline['results']}
+
+    print(f"\nComparison with {baseline.get('commit')} ({baseline.get('timestamp')})")
+    for result in current['results']:
+        base = base_by_rows.get(result['rows'])
+        if base is None:
+            continue
+        print(f"  {result['rows']} rows")
+        for label, getter in metrics:
+            old, new = getter(base), getter(result)
+            if not old or new is None:
+                continue
+            print(f"    {label:<18} {old:>12} -> {new:<12} ({(new - old) / old * 100:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark EDSLookup against synthetic EDS workbooks')
+    parser.add_argument('--sizes', default=','.join(str(size) for size in DEFAULT_SIZES),
+                        help='Comma-separated workbook row counts (default: 100,10000,100000)')
+    parser.add_argument('--lookups', type=int, default=1000, help='Single lookups timed per size')
+    parser.add_argument('--batch', type=int, default=1000, help='Hostnames in the batch lookup')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per phase; the fastest is kept')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for workbook generation and lookups')
+    parser.add_argument('--work-dir', default=DEFAULT_WORK_DIR,
+                        help='Directory for generated workbooks and caches (reused between runs)')
+    parser.add_argument('--output', help='JSON results file (default: results/eds_benchmark_<commit>.json)')
+    parser.add_argument('--compare', help='Baseline JSON results file to compare against')
+    parser.add_argument('--worker', choices=['cold', 'warm'], help=argparse.SUPPRESS)
+    parser.add_argument('--workbook', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, args.workbook, args.lookups, args.batch, args.seed)))
+        return
+
+    os.makedirs(args.work_dir, exist_ok=True)
+    commit, dirty = git_revision()
+    report = {
+        'commit': commit,
+        'dirty': dirty,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'settings': {
+            'lookups': args.lookups,
+            'batch': args.batch,
+            'repeat': args.repeat,
+            'seed': args.seed
+        },
+        'results': []
+    }
+
+    for rows in [int(size) for size in args.sizes.split(',') if size.strip()]:
+        result = benchmark_size(rows, args)
+        report['results'].append(result)
+        print(f"{rows:>7} rows  cold {result['cold']['load_s']:.3f}s  warm {result['warm']['load_s']:.3f}s  "
+              f"lookup p50 {result['warm']['single_lookup']['p50_us']}us  "
+              f"batch {result['warm']['batch_lookup']['per_host_us']}us/host  "
+              f"rss {result['warm']['peak_rss_mb']}MB")
+
+    output = args.output or os.path.join(
+        ROBOTFRAMEWORK_ROOT, 'results', f"eds_benchmark_{commit or 'nogit'}{'-dirty' if dirty else ''}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare_results(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,26 @@
+import argparse
+import random
 import pandas as pd
 from openpyxl import Workbook
 from openpyxl.utils.dataframe import dataframe_to_rows
 from datetime import datetime
 
+SERVER_REQUIREMENTS_COLUMNS = [
+    'Host Description', 'Cluster Name', 'Container Type', 'Server Name', 'Type', 'Purpose',
+    'Classification', 'Site', 'Environment', 'Trust Level', 'OS Type',
+    'Number of CPU Cores (recom)', 'RAM', 'Storage Type', 'Storage Total TB',
+    'Drive or Volume Group', 'Files System', 'Logical Volume Name/Partition (Mounted On)',
+    'Storage Allocation (GB)', 'Recommended Storage Allocation (GB)', 'Drive Purpose',
+    'VLAN Number', 'VLAN ID (Description of VLAN)', 'Subnet', 'Mask', 'Gateway',
+    'Teaming Bonding (Y/N)', 'Description', 'CNAME', 'DOMAIN', 'IP Assignment'
+]
+
+F5_GTM_LTM_COLUMNS = [
+    'GTM Alias', 'GTM', 'Cname', 'Port', 'LTM', 'VIP', 'VIPs Name', 'Node Members',
+    'HealthCheck', 'iRules', 'Environment', 'Load Balancing', 'Persistence', 'SNAT',
+    'Acceleration', 'Optimization', 'Compression', 'Purpose', 'Release', 'Comment'
+]
+
 def create_itential_xlsx(output_filename='CBS_Itential_DRAFT_recreated.xlsx'):
     """
     Creates an Excel file with Itential infrastructure data matching the attached template
@@ -144,39 +162,7 @@ def create_server_requirements_data():
     ]
     
     # Build the data structure
-    data = {
-        'Host Description': [],
-        'Cluster Name': [],
-        'Container Type': [],
-        'Server Name': [],
-        'Type': [],
-        'Purpose': [],
-        'Classification': [],
-        'Site': [],
-        'Environment': [],
-        'Trust Level': [],
-        'OS Type': [],
-        'Number of CPU Cores (recom)': [],
-        'RAM': [],
-        'Storage Type': [],
-        'Storage Total TB': [],
-        'Drive or Volume Group': [],
-        'Files System': [],
-        'Logical Volume Name/Partition (Mounted On)': [],
-        'Storage Allocation (GB)': [],
-        'Recommended Storage Allocation (GB)': [],
-        'Drive Purpose': [],
-        'VLAN Number': [],
-        'VLAN ID (Description of VLAN)': [],
-        'Subnet': [],
-        'Mask': [],
-        'Gateway': [],
-        'Teaming Bonding (Y/N)': [],
-        'Description': [],
-        'CNAME': [],
-        'DOMAIN': [],
-        'IP Assignment': []
-    }
+    data = {col: [] for col in SERVER_REQUIREMENTS_COLUMNS}
     
     # Populate data for each server
     for server in servers:
@@ -246,14 +232,257 @@ def create_f5_gtm_ltm_data():
     
     return data
 
+# Synthetic fleet layout used by create_fleet_xlsx
+FLEET_SITES = [
+    {'site': 'GDCA', 'prefix': 'alh', 'code': 'ALH', 'octet': 26},
+    {'site': 'IRVINE', 'prefix': 'irv', 'code': 'IRV', 'octet': 27},
+]
+
+FLEET_ENVIRONMENTS = [
+    {'env': 'Dev within QA', 'code': 'dv', 'lan': 'QAS', 'vlan_base': 200, 'domain': 'gnscet.com', 'weight': 1},
+    {'env': 'QA (Staging)', 'code': 'qa', 'lan': 'QAS', 'vlan_base': 400, 'domain': 'gnscet.com', 'weight': 3},
+    {'env': 'PROD', 'code': 'pr', 'lan': 'NERC', 'vlan_base': 600, 'domain': 'gnsce.com', 'weight': 6},
+]
+
+# Role code -> purpose, CPU / RAM choices and the role-specific mounts added after the OS layout
+FLEET_ROLES = {
+    'itiap': {'type': 'Itential Automation Platform', 'cpu': [8, 16], 'ram': [32, 64], 'weight': 4,
+              'mounts': [('appvg:', '/dev/mapper/appvg-optlv', '/opt/itential', [50, 100], 'Application')]},
+    'itag': {'type': 'Itential Automation Gateway', 'cpu': [4, 8], 'ram': [16, 32], 'weight': 2,
+             'mounts': [('appvg:', '/dev/mapper/appvg-optlv', '/opt/automation-gateway', [20, 50], 'Application')]},
+    'itred': {'type': 'Itential Redis', 'cpu': [4], 'ram': [4, 8], 'weight': 2,
+              'mounts': [('datavg:', '/dev/mapper/datavg-redislv', '/var/lib/redis', [20, 50], 'Redis Data')]},
+    'itmdb': {'type': 'Itential MongoDB', 'cpu': [8, 16], 'ram': [64, 128], 'weight': 2,
+              'mounts': [('datavg:', '/dev/mapper/datavg-mongolv', '/var/lib/mongo', [250, 500, 1000], 'MongoDB Data'),
+                         ('datavg:', '/dev/mapper/datavg-mongologlv', '/var/log/mongodb', [20, 50], 'MongoDB Logs')]},
+}
+
+# OS mounts every host gets; the optional ones are added at random
+FLEET_OS_MOUNTS = [
+    ('rootvg:', '/dev/mapper/rootvg-rootlv', '/', [20], 'OS', True),
+    ('rootvg:', '/dev/mapper/rootvg-varlv', '/var', [10, 20], 'OS', True),
+    ('rootvg:', '/dev/mapper/rootvg-tmplv', '/tmp', [5, 10], 'OS', False),
+    ('rootvg:', '/dev/mapper/rootvg-homelv', '/home', [5, 10], 'OS', False),
+    ('rootvg:', '/dev/mapper/rootvg-swaplv', '[SWAP]', [4, 8], 'Swap', True),
+]
+
+# Usable host addresses in each /24 subnet; .4 is the gateway as in the Itential EDS
+FLEET_FIRST_HOST_OCTET = 10
+FLEET_HOSTS_PER_SUBNET = 245
+FLEET_POOL_SIZES = [2, 2, 3, 4]
+
+
+def generate_fleet_servers(host_count, seed=0):
+    """
+    Yield a deterministic synthetic fleet of servers, one dict per host
+
+    Hosts are generated one at a time from a seeded random generator, so the
+    same (host_count, seed) always yields the same fleet and memory stays
+    bounded by the number of sites, environments and roles, not hosts.
+    """
+    rng = random.Random(seed)
+    environments = [env for env in FLEET_ENVIRONMENTS for _ in range(env['weight'])]
+    roles = [role for role, spec in FLEET_ROLES.items() for _ in range(spec['weight'])]
+    host_numbers = {}
+    segment_hosts = {}
+
+    for _ in range(host_count):
+        site_index = rng.randrange(len(FLEET_SITES))
+        site = FLEET_SITES[site_index]
+        env = rng.choice(environments)
+        env_index = FLEET_ENVIRONMENTS.index(env)
+        role = rng.choice(roles)
+        spec = FLEET_ROLES[role]
+
+        name_key = (site['prefix'], env['code'], role)
+        host_numbers[name_key] = host_numbers.get(name_key, 0) + 1
+        name = f"{site['prefix']}xv{env['code']}{role}{host_numbers[name_key]:05d}"
+
+        # Each site/environment fills one /24 VLAN after the other
+        segment = (site_index, env_index)
+        position = segment_hosts.get(segment, 0)
+        segment_hosts[segment] = position + 1
+        vlan_index, host_offset = divmod(position, FLEET_HOSTS_PER_SUBNET)
+        block = vlan_index * len(FLEET_ENVIRONMENTS) + env_index
+        second_octet = site['octet'] + block // 256 * 2
+        network = f"10.{second_octet}.{block % 256}"
+
+        mounts = []
+        for vg, fs, mount, sizes, purpose, required in FLEET_OS_MOUNTS:
+            if required or rng.random() < 0.5:
+                mounts.append((vg, fs, mount, rng.choice(sizes), purpose))
+        for vg, fs, mount, sizes, purpose in spec['mounts']:
+            mounts.append((vg, fs, mount, rng.choice(sizes), purpose))
+
+        yield {
+            'name': name,
+            'role': role,
+            'type': spec['type'],
+            'env': env['env'],
+            'site': site['site'],
+            'site_code': site['code'],
+            'cpu': rng.choice(spec['cpu']),
+            'ram': rng.choice(spec['ram']),
+            'storage': round(sum(mount[3] for mount in mounts) / 1024, 3),
+            'mounts': mounts,
+            'vlan': env['vlan_base'] + vlan_index,
+            'vlan_name': f"{site['code']} {env['lan']} MGMT TOOLS LAN {vlan_index + 1}",
+            'subnet': f"{network}.0/24",
+            'gateway': f"{network}.4",
+            'ip': f"{network}.{FLEET_FIRST_HOST_OCTET + host_offset}",
+            'domain': env['domain'],
+            'nerc': env['env'] == 'PROD',
+            'segment': segment
+        }
+
+
+def iter_server_requirements_rows(server):
+    """Yield the Server Requirements rows of one fleet server: the host row, then one row per extra mount"""
+    for position, (vg, fs, mount, size, purpose) in enumerate(server['mounts']):
+        row = dict.fromkeys(SERVER_REQUIREMENTS_COLUMNS)
+        row.update({
+            'Drive or Volume Group': vg,
+            'Files System': fs,
+            'Logical Volume Name/Partition (Mounted On)': mount,
+            'Storage Allocation (GB)': size,
+            'Recommended Storage Allocation (GB)': size,
+            'Drive Purpose': purpose
+        })
+
+        # Like the real EDS, only the first row of a host carries the host columns
+        if position == 0:
+            classification = 'NERC' if server['nerc'] else 'Non-NERC'
+            row.update({
+                'Host Description': f"VxRail {server['site_code']} {classification} Common Services Linux",
+                'Cluster Name': f"{server['site_code'].lower()}{'pr' if server['nerc'] else 'qa'}nncc03 (Linux)",
+                'Server Name': server['name'],
+                'Type': 'VM',
+                'Purpose': server['type'],
+                'Classification': classification,
+                'Site': server['site'],
+                'Environment': server['env'],
+                'Trust Level': 'TL3',
+                'OS Type': 'RHEL 9.6',
+                'Number of CPU Cores (recom)': server['cpu'],
+                'RAM': server['ram'],
+                'Storage Type': 'VSAN',
+                'Storage Total TB': server['storage'],
+                'VLAN Number': server['vlan'],
+                'VLAN ID (Description of VLAN)': server['vlan_name'],
+                'Subnet': server['subnet'],
+                'Mask': '255.255.255.0',
+                'Gateway': server['gateway'],
+                'Description': f"{server['site']} {server['env']} {server['type']}",
+                'CNAME': server['name'],
+                'DOMAIN': server['domain'],
+                'IP Assignment': server['ip']
+            })
+        yield [row[col] for col in SERVER_REQUIREMENTS_COLUMNS]
+
+
+def iter_f5_gtm_ltm_rows(host_count, seed=0):
+    """
+    Yield F5 GTM-LTM rows pooling the fleet's Automation Platform hosts behind VIPs
+
+    The fleet is regenerated from its seed instead of kept in memory; only the
+    members of the pools that are still filling up are held at any time.
+    """
+    rng = random.Random(f"{seed}-f5")
+    pending = {}
+    pool_sizes = {}
+    pool_numbers = {}
+
+    for server in generate_fleet_servers(host_count, seed):
+        if server['role'] != 'itiap':
+            continue
+        segment = server['segment']
+        pending.setdefault(segment, []).append(server['name'])
+        if len(pending[segment]) == pool_sizes.setdefault(segment, rng.choice(FLEET_POOL_SIZES)):
+            pool_numbers[segment] = pool_numbers.get(segment, 0) + 1
+            yield from _f5_pool_rows(segment, pool_numbers[segment], pending.pop(segment))
+            del pool_sizes[segment]
+
+    # Flush partly filled pools so every Automation Platform host is a member
+    for segment in sorted(pending):
+        pool_numbers[segment] = pool_numbers.get(segment, 0) + 1
+        yield from _f5_pool_rows(segment, pool_numbers[segment], pending[segment])
+
+
+def _f5_pool_rows(segment, number, members):
+    """Yield the F5 GTM-LTM rows of one pool: the VIP row with the first member, then one row per member"""
+    site_index, env_index = segment
+    site = FLEET_SITES[site_index]
+    env = FLEET_ENVIRONMENTS[env_index]
+    nerc = env['env'] == 'PROD'
+    domain = 'gcsce.com' if nerc else 'gcscet.com'
+    name = f"iap{env['code']}{number:04d}"
+    vip_block = (number - 1) // 250 * len(FLEET_ENVIRONMENTS) + env_index
+
+    for position, member in enumerate(members):
+        row = dict.fromkeys(F5_GTM_LTM_COLUMNS, '')
+        row.update({
+            'Port': '3443/https\n3000/http',
+            'Node Members': member,
+            'Environment': 'Prod' if nerc else 'QA'
+        })
+        if position == 0:
+            row.update({
+                'GTM Alias': f"{name}-vip.{site['prefix']}.{domain}",
+                'Cname': f"itential-{name}.{site['prefix']}.{domain}",
+                'LTM': f"{name}-vip-adc.{site['prefix']}.{domain}",
+                'VIP': f"10.{site['octet'] + 124}.{vip_block}.{(number - 1) % 250 + 5}",
+                'Load Balancing': 'Round Robin'
+            })
+        yield [row[col] for col in F5_GTM_LTM_COLUMNS]
+
+
+def create_fleet_xlsx(output_filename='EDS_synthetic_fleet.xlsx', host_count=50000, seed=0):
+    """
+    Streams a synthetic EDS for load testing with openpyxl's write-only mode
+
+    Writes a Server Requirements sheet with multi-row storage layouts per host
+    and an F5 GTM-LTM sheet pooling the Automation Platform hosts. Rows are
+    generated on the fly, so memory stays flat even for 50k+ hosts, and the
+    same host_count and seed always produce the same fleet.
+    """
+    workbook = Workbook(write_only=True)
+
+    servers_sheet = workbook.create_sheet('Server Requirements')
+    servers_sheet.append(SERVER_REQUIREMENTS_COLUMNS)
+    row_count = 0
+    for server in generate_fleet_servers(host_count, seed):
+        for row in iter_server_requirements_rows(server):
+            servers_sheet.append(row)
+            row_count += 1
+
+    f5_sheet = workbook.create_sheet('F5 GTM-LTM (Optional)')
+    f5_sheet.append(F5_GTM_LTM_COLUMNS)
+    for row in iter_f5_gtm_ltm_rows(host_count, seed):
+        f5_sheet.append(row)
+
+    workbook.save(output_filename)
+    print(f"Synthetic fleet '{output_filename}' created: {host_count} hosts, {row_count} server rows (seed {seed})")
+    return output_filename
+
 # Main execution
 if __name__ == "__main__":
-    # Create the Excel file
-    output_file = create_itential_xlsx()
-    print(f"\nFile created: {output_file}")
-    print("\nThis script recreates the Itential infrastructure spreadsheet with:")
-    print("- Change History tracking")
-    print("- Hardware Requirements (virtualized environment)")
-    print("- Server Requirements for Dev, QA, and Prod environments")
-    print("- F5 Load Balancer configurations")
-    print("- Client and Database considerations")
+    parser = argparse.ArgumentParser(description='Create the Itential EDS workbook or a synthetic fleet EDS')
+    parser.add_argument('--fleet', type=int, metavar='HOSTS',
+                        help='Stream a synthetic fleet EDS with this many hosts instead')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the synthetic fleet (default: 0)')
+    parser.add_argument('--output', help='Output workbook path')
+    args = parser.parse_args()
+
+    if args.fleet:
+        output_file = create_fleet_xlsx(args.output or 'EDS_synthetic_fleet.xlsx', args.fleet, args.seed)
+        print(f"\nFile created: {output_file}")
+    else:
+        # Create the Excel file
+        output_file = create_itential_xlsx(args.output or 'CBS_Itential_DRAFT_recreated.xlsx')
+        print(f"\nFile created: {output_file}")
+        print("\nThis script recreates the Itential infrastructure spreadsheet with:")
+        print("- Change History tracking")
+        print("- Hardware Requirements (virtualized environment)")
+        print("- Server Requirements for Dev, QA, and Prod environments")
+        print("- F5 Load Balancer configurations")
+        print("- Client and Database considerations")
@@ -0,0 +1,259 @@
+"""
+Shared fixtures for the Python unit tests of the Robot libraries
+
+Run from the robotframework directory with: python -m pytest tests/unit
+"""
+
+import asyncio
+import http.server
+import os
+import re
+import socket
+import sys
+import threading
+import pytest
+
+LIBRARY_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'library')
+if LIBRARY_DIR not in sys.path:
+    sys.path.insert(0, LIBRARY_DIR)
+
+
+@pytest.fixture(autouse=True)
+def eds_cache_dir(tmp_path, monkeypatch):
+    """Keep the compiled EDS cache of each test in its own temporary directory"""
+    cache_dir = tmp_path / 'eds_cache'
+    monkeypatch.setenv('EDS_CACHE_DIR', str(cache_dir))
+    return cache_dir
+
+
+class HealthHandler(http.server.BaseHTTPRequestHandler):
+    """Serves 'Alive' on /health, 'Degraded' on /degraded and 404 elsewhere"""
+
+    def do_GET(self):
+        pages = {'/health': b'Alive', '/degraded': b'Degraded'}
+        body = pages.get(self.path)
+        self.send_response(200 if body else 404)
+        self.send_header('Content-Length', str(len(body or b'')))
+        self.end_headers()
+        self.wfile.write(body or b'')
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def http_port():
+    """Port of a local http.server health page"""
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), HealthHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def asyncio_ports():
+    """
+    Ports of two asyncio.start_server listeners on a background loop
+
+    Returns:
+        dict: 'open' accepts and closes connections, 'silent' accepts and never answers
+    """
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    async def close_at_once(reader, writer):
+        writer.close()
+
+    async def never_answer(reader, writer):
+        await reader.read()
+        writer.close()
+
+    async def start():
+        return [await asyncio.start_server(handler, '127.0.0.1', 0) for handler in (close_at_once, never_answer)]
+
+    servers = asyncio.run_coroutine_threadsafe(start(), loop).result(5)
+    yield {
+        'open': servers[0].sockets[0].getsockname()[1],
+        'silent': servers[1].sockets[0].getsockname()[1]
+    }
+
+    async def stop():
+        for server in servers:
+            server.close()
+
+    asyncio.run_coroutine_threadsafe(stop(), loop).result(5)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+    loop.close()
+
+
+@pytest.fixture
+def closed_port():
+    """A local port nothing listens on (connects are refused)"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def blackhole_port():
+    """A local port whose listen backlog is full, so new TCP connects hang until they time out"""
+    listener = socket.socket()
+    listener.bind(('127.0.0.1', 0))
+    listener.listen(0)
+    port = listener.getsockname()[1]
+
+    clients = []
+    for _ in range(64):
+        client = socket.socket()
+        client.settimeout(0.2)
+        clients.append(client)
+        try:
+            client.connect(('127.0.0.1', port))
+        except socket.timeout:
+            break
+        except OSError:
+            pass
+    else:
+        pytest.skip("Cannot fill the listen backlog on this platform")
+
+    yield port
+    for client in clients:
+        client.close()
+    listener.close()
+
+
+@pytest.fixture
+def make_workbook(tmp_path):
+    """
+    Write an xlsx workbook from {sheet name: list of rows} and return its path
+
+    Rows are written as given, so a sheet can have title rows above its header.
+    """
+    from openpyxl import Workbook
+
+    def make(sheets, name='eds.xlsx'):
+        workbook = Workbook()
+        workbook.remove(workbook.active)
+        for sheet_name, rows in sheets.items():
+            worksheet = workbook.create_sheet(sheet_name)
+            for row in rows:
+                worksheet.append(list(row))
+        path = tmp_path / name
+        workbook.save(path)
+        return str(path)
+
+    return make
+
+
+def sheet_row(columns, cells):
+    """Build a sheet row from cells keyed by snake_case column name ('Service Account(s)' -> service_accounts)"""
+    return [cells.get(re.sub(r'\W+', '_', column.replace('(s)', 's')).strip('_').lower()) for column in columns]
+
+
+def server_sheet(app02_ip='127.0.0.1'):
+    """Server Requirements rows for the pool members app01 and app02"""
+    return [
+        ['Server Name', 'IP Assignment'],
+        ['app01', '127.0.0.1'],
+        ['app02', app02_ip]
+    ]
+
+
+@pytest.fixture
+def make_eds_workbook(make_workbook):
+    """
+    Write an EDS workbook with one Server Requirements sheet and return its path
+
+    Rows are lists of Server Name, IP Assignment, Environment, Purpose and
+    Drive or Volume Group; a row without a Server Name continues the host above.
+    """
+    def make(*rows, name='eds.xlsx'):
+        header = ['Server Name', 'IP Assignment', 'Environment', 'Purpose', 'Drive or Volume Group']
+        return make_workbook({'Server Requirements': [header, *rows]}, name=name)
+
+    return make
+
+
+@pytest.fixture
+def make_f5_workbook(make_workbook, http_port, closed_port, asyncio_ports):
+    """
+    Write an EDS workbook whose F5 pools point at the local listeners and return its path
+
+    Pools: app_pool (healthy, members app01 by IP, app02 from the EDS, localhost by DNS),
+    degraded_pool (wrong health text), db_pool (closed port) and silent_pool (no answer).
+    Call again with another app02_ip to rewrite the same workbook; with_f5_sheet=False
+    leaves only the Server Requirements sheet.
+    """
+    from F5PoolValidator import F5_COLUMNS, F5_SHEET_NAME
+
+    def row(**cells):
+        return sheet_row(F5_COLUMNS, cells)
+
+    def make(app02_ip='127.0.0.1', with_f5_sheet=True):
+        sheets = {'Server Requirements': server_sheet(app02_ip)}
+        if with_f5_sheet:
+            sheets[F5_SHEET_NAME] = [
+                F5_COLUMNS,
+                row(gtm_alias='app.example.com', ltm='app_pool', vip='10.0.0.10', port=f"{http_port}/http",
+                    healthcheck='HTTP GET /health\nResponse String: Alive', node_members='app01 127.0.0.1'),
+                row(node_members='app02'),
+                row(node_members='localhost'),
+                row(ltm='degraded_pool', vip='10.0.0.20', port=f"{http_port}/http",
+                    healthcheck='HTTP GET /degraded\nResponse String: Alive', node_members='app01 127.0.0.1'),
+                row(ltm='db_pool', vip='10.0.0.30', port=f"{closed_port}/tcp", node_members='app01 127.0.0.1'),
+                row(ltm='silent_pool', vip='10.0.0.40', port=f"{asyncio_ports['silent']}/http",
+                    node_members='app01 127.0.0.1')
+            ]
+        return make_workbook(sheets)
+
+    return make
+
+
+@pytest.fixture
+def make_db_workbook(make_workbook, asyncio_ports, closed_port, blackhole_port):
+    """
+    Write an EDS workbook whose Database Considerations sheet points at the local listeners and return its path
+
+    Instances: mongo (open port) and redis (closed port) of Itential, pg of Reports with a
+    'TBD' CNAME and slow of Archive (port that never answers). The sheet has a title row and
+    a blank row above its header. Extra rows are given as dicts of snake_case column cells.
+    """
+    from DatabasePortValidator import DB_COLUMNS, DB_SHEET_NAME
+
+    def row(**cells):
+        return sheet_row(DB_COLUMNS, cells)
+
+    def make(*extra_rows):
+        return make_workbook({
+            'Server Requirements': [['Server Name', 'IP Assignment'], ['db01', '127.0.0.1']],
+            DB_SHEET_NAME: [
+                ['Database Considerations'],
+                [],
+                DB_COLUMNS,
+                row(component_name='Itential', type='MongoDB', named_instance='mongo',
+                    cname_for_db='127.0.0.1', db_ports_assignment=str(asyncio_ports['open'])),
+                row(named_instance='redis', cname_for_db='127.0.0.1', db_ports_assignment=f"{closed_port}/tcp"),
+                row(component_name='Reports', named_instance='pg', cname_for_db='TBD', db_ports_assignment='5432'),
+                row(component_name='Archive', named_instance='slow',
+                    cname_for_db='127.0.0.1', db_ports_assignment=str(blackhole_port)),
+                *(row(**cells) for cells in extra_rows)
+            ]
+        })
+
+    return make
+
+
+@pytest.fixture
+def f5_workbook(make_f5_workbook):
+    """Path of the default F5 test workbook (see make_f5_workbook)"""
+    return make_f5_workbook()
+
+
+@pytest.fixture
+def db_workbook(make_db_workbook):
+    """Path of the default database test workbook (see make_db_workbook)"""
+    return make_db_workbook()
@@ -0,0 +1,62 @@
+"""Tests of the asyncio TCP / HTTP probes against local listeners"""
+
+from async_probe import latency_summary, run_probe_series, run_probes
+
+
+def probe(port, kind='tcp', **fields):
+    return dict({'host': '127.0.0.1', 'port': port, 'kind': kind}, **fields)
+
+
+def test_tcp_probe_open_closed_and_timed_out_ports(asyncio_ports, closed_port, blackhole_port):
+    results = run_probes([probe(asyncio_ports['open']), probe(closed_port), probe(blackhole_port)], timeout=0.5)
+
+    open_result, closed_result, timed_out_result = results
+    assert open_result['ok'] and open_result['error'] is None and open_result['latency_ms'] >= 0
+    assert not closed_result['ok'] and closed_result['latency_ms'] is None
+    assert not timed_out_result['ok'] and timed_out_result['error'] == "Timed out after 0.5s"
+
+
+def test_http_probe_status_and_expected_text(http_port):
+    results = run_probes([
+        probe(http_port, 'http', path='/health', expect='Alive'),
+        probe(http_port, 'http', path='/degraded', expect='Alive'),
+        probe(http_port, 'http', path='/missing')
+    ], timeout=2)
+
+    assert results[0]['ok'] and results[0]['status'] == 200
+    assert not results[1]['ok'] and results[1]['error'] == "Response does not contain 'Alive'"
+    assert not results[2]['ok'] and results[2]['status'] == 404 and results[2]['error'] == 'HTTP 404'
+
+
+def test_http_probe_times_out_on_a_silent_listener(asyncio_ports):
+    result, = run_probes([probe(asyncio_ports['silent'], 'http', path='/health')], timeout=0.3)
+
+    assert not result['ok'] and result['status'] is None and result['error'] == "Timed out after 0.3s"
+
+
+def test_results_keep_probe_order_and_extra_fields(asyncio_ports, closed_port):
+    probes = [probe(port, member=f"m{number}") for number, port in
+              enumerate([closed_port, asyncio_ports['open']] * 5)]
+
+    results = run_probes(probes, concurrency=3, timeout=1)
+
+    assert [result['member'] for result in results] == [p['member'] for p in probes]
+    assert [result['ok'] for result in results] == [False, True] * 5
+
+
+def test_probe_series_counts_attempts(asyncio_ports, closed_port):
+    reachable, refused = run_probe_series([probe(asyncio_ports['open']), probe(closed_port)], attempts=4, timeout=1)
+
+    assert reachable['ok'] and reachable['attempts'] == 4 and reachable['successes'] == 4
+    assert reachable['latency']['count'] == 4
+    assert not refused['ok'] and refused['successes'] == 0 and refused['latency']['count'] == 0
+
+
+def test_latency_summary_percentiles():
+    results = [{'ok': True, 'latency_ms': float(ms)} for ms in range(100, 0, -1)]
+    results.append({'ok': False, 'latency_ms': None})
+
+    summary = latency_summary(results)
+
+    assert summary == {'count': 100, 'min_ms': 1.0, 'p50_ms': 50.0, 'p95_ms': 95.0, 'p99_ms': 99.0, 'max_ms': 100.0}
+    assert latency_summary([])['p50_ms'] is None
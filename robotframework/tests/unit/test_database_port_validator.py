@@ -0,0 +1,77 @@
+"""Tests of the Database Considerations port checks against local listeners"""
+
+import pytest
+import DatabasePortValidator as db_module
+from DatabasePortValidator import DatabasePortValidator
+
+
+def test_instances_are_indexed_by_cname_instance_and_component(db_workbook, asyncio_ports):
+    validator = DatabasePortValidator(eds_files=db_workbook, use_cache=False)
+
+    assert [instance['named_instance'] for instance in validator.get_database_instances('itential')] == ['mongo', 'redis']
+    assert validator.get_database_instance('MONGO')['ports'] == [asyncio_ports['open']]
+    assert validator.get_database_instance('redis')['component'] == 'Itential'
+
+
+def test_check_database_ports_reports_status_and_percentiles(db_workbook, closed_port, blackhole_port):
+    validator = DatabasePortValidator(eds_files=db_workbook)
+
+    summary = validator.check_database_ports(attempts=5, timeout=0.5)
+
+    statuses = {endpoint['named_instance']: endpoint['status'] for endpoint in summary['endpoints']}
+    assert statuses == {'mongo': 'reachable', 'redis': 'unreachable', 'slow': 'unreachable'}
+    assert summary['total_endpoints'] == 3 and summary['reachable_count'] == 1
+
+    mongo = summary['endpoints'][0]
+    latency = mongo['latency']
+    assert mongo['attempts'] == 5 and mongo['successes'] == 5 and latency['count'] == 5
+    assert latency['min_ms'] <= latency['p50_ms'] <= latency['p95_ms'] <= latency['p99_ms'] <= latency['max_ms']
+    assert summary['endpoints'][1]['latency']['p50_ms'] is None
+
+    violations = {(violation['named_instance'], violation['check'], violation['port']): violation['severity']
+                  for violation in summary['violations']}
+    assert violations == {
+        ('pg', 'unassigned', None): 'warning',
+        ('redis', 'unreachable', closed_port): 'critical',
+        ('slow', 'unreachable', blackhole_port): 'critical'
+    }
+    slow, = [v for v in summary['violations'] if v['named_instance'] == 'slow']
+    assert slow['reason'] == 'Timed out after 0.5s'
+
+
+def test_check_selected_instances_and_fail_on_unreachable(db_workbook):
+    validator = DatabasePortValidator(eds_files=db_workbook, use_cache=False)
+
+    assert validator.check_database_ports('mongo', attempts=2, timeout=1)['violations_count'] == 0
+    with pytest.raises(ValueError, match='CRITICAL: Database endpoints unreachable'):
+        validator.check_database_ports('mongo, redis', attempts=1, timeout=1, fail_on_unreachable=True)
+
+
+def test_workbook_without_database_sheet_has_no_instances(make_eds_workbook):
+    validator = DatabasePortValidator(eds_files=make_eds_workbook(['db01', '127.0.0.1']))
+
+    assert validator.get_database_instances() == []
+
+
+def test_unreadable_database_sheet_fails_instead_of_loading_no_instances(db_workbook, monkeypatch):
+    def read_sheet(path, sheet_name, columns=None, **options):
+        raise ValueError("Bad cell data")
+    monkeypatch.setattr(db_module, 'read_sheet', read_sheet)
+
+    with pytest.raises(RuntimeError, match='Failed to load database sheet'):
+        DatabasePortValidator(eds_files=db_workbook, use_cache=False)
+
+
+def test_only_whole_placeholder_cnames_are_unassigned(make_db_workbook):
+    workbook = make_db_workbook(
+        dict(component_name='Vault', named_instance='vault', cname_for_db='vaultxx01.invalid', db_ports_assignment='8200'),
+        dict(named_instance='tbdb', cname_for_db='tbdb-pending.invalid', db_ports_assignment='5432'),
+        dict(named_instance='queue', cname_for_db='???', db_ports_assignment='5672'),
+        dict(named_instance='cache', cname_for_db='(Pending)', db_ports_assignment='6379')
+    )
+    validator = DatabasePortValidator(eds_files=workbook, use_cache=False)
+
+    summary = validator.check_database_ports('vault, tbdb, queue, cache', attempts=1, timeout=0.5)
+
+    checks = {violation['named_instance']: violation['check'] for violation in summary['violations']}
+    assert checks == {'vault': 'unreachable', 'tbdb': 'unreachable', 'queue': 'unassigned', 'cache': 'unassigned'}
@@ -0,0 +1,40 @@
+"""Tests of the compiled EDS cache and its ownership checks"""
+
+import os
+import pytest
+from eds_cache import cache_path_for, cached_payload, load_sheet
+
+pytestmark = pytest.mark.skipif(os.name != 'posix', reason="cache permissions are only checked on POSIX")
+
+
+def parse(path, sheet_name, columns):
+    return {'columns': ['Server Name'], 'data': {'Server Name': ['app01']}}
+
+
+@pytest.fixture
+def cached_workbook(make_workbook, eds_cache_dir):
+    workbook = make_workbook({'Server Requirements': [['Server Name'], ['app01']]})
+    load_sheet(workbook, 'Server Requirements', parse)
+    assert cached_payload(workbook, 'Server Requirements') == parse(workbook, None, None)
+    return workbook
+
+
+def test_cache_directory_and_file_are_created_private(cached_workbook, eds_cache_dir):
+    cache_file = cache_path_for(cached_workbook, 'Server Requirements')
+
+    assert os.stat(eds_cache_dir).st_mode & 0o777 == 0o700
+    assert os.stat(cache_file).st_mode & 0o777 == 0o600
+
+
+@pytest.mark.parametrize('mode', [0o620, 0o602, 0o640], ids=oct)
+def test_cache_file_open_to_other_users_is_ignored(cached_workbook, mode):
+    os.chmod(cache_path_for(cached_workbook, 'Server Requirements'), mode)
+
+    assert cached_payload(cached_workbook, 'Server Requirements') is None
+
+
+@pytest.mark.parametrize('mode', [0o770, 0o707, 0o750], ids=oct)
+def test_cache_directory_open_to_other_users_is_ignored(cached_workbook, eds_cache_dir, mode):
+    os.chmod(eds_cache_dir, mode)
+
+    assert cached_payload(cached_workbook, 'Server Requirements') is None
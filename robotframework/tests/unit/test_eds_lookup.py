@@ -0,0 +1,82 @@
+"""Tests of EDS workbook loading, merging and host queries"""
+
+import os
+import pytest
+from EDSLookup import EDSLookup
+
+
+def touch_later(path):
+    """Move a workbook's mtime forward so the change is seen on filesystems with coarse timestamps"""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000_000))
+
+
+def test_changed_workbook_mtime_reloads_the_shared_data(make_eds_workbook):
+    workbook = make_eds_workbook(['app01', '10.0.0.1', 'QA', 'Web', 'vg_root'])
+    lookup = EDSLookup(eds_files=workbook)
+    assert lookup.lookup_server_config('app01')['ip'] == '10.0.0.1'
+
+    make_eds_workbook(['app01', '10.0.0.2', 'QA', 'Web', 'vg_root'])
+    touch_later(workbook)
+
+    assert lookup.eds_data_is_stale()
+    assert lookup.lookup_server_config('app01')['ip'] == '10.0.0.2'
+    assert EDSLookup(eds_files=workbook, use_cache=False).lookup_server_config('app01')['ip'] == '10.0.0.2'
+
+
+def test_touched_but_unchanged_workbook_is_served_from_the_cache(make_eds_workbook):
+    workbook = make_eds_workbook(['app01', '10.0.0.1', 'QA', 'Web', 'vg_root'])
+    EDSLookup(eds_files=workbook)
+
+    touch_later(workbook)
+    lookup = EDSLookup(eds_files=workbook)
+
+    assert lookup.lookup_server_config('app01')['ip'] == '10.0.0.1'
+    assert not lookup.eds_data_is_stale()
+
+
+def test_host_in_several_workbooks_is_kept_from_the_first(make_eds_workbook):
+    first = make_eds_workbook(
+        ['app01', '10.0.0.1', 'QA', 'Web', 'vg_root'],
+        [None, None, None, None, 'vg_data'],
+        name='first.xlsx'
+    )
+    second = make_eds_workbook(
+        ['app01', '10.9.9.9', 'PROD', 'Web', 'vg_other'],
+        ['app02', '10.0.0.2', 'PROD', 'Web', 'vg_root'],
+        name='second.xlsx'
+    )
+
+    lookup = EDSLookup(eds_files=f"{first},{second}", use_cache=False)
+
+    assert lookup.lookup_server_config('app01')['ip'] == '10.0.0.1'
+    assert [mount['drive_volume_group'] for mount in lookup.get_server_storage_layout('app01')] == ['vg_root', 'vg_data']
+    assert lookup.get_eds_host_source('app01') == {'file': first, 'row': 2}
+    assert lookup.get_eds_host_source('app02') == {'file': second, 'row': 3}
+
+
+@pytest.mark.parametrize('predicates, hosts', [
+    ({'Environment': 'qa'}, ['app01', 'redis01']),
+    ({'environment': 'QA|PROD'}, ['app01', 'app02', 'redis01']),
+    ({'Environment': ['prod', 'dev']}, ['app02', 'db01']),
+    ({'server_name': 'app*'}, ['app01', 'app02']),
+    ({'Purpose': '!Web'}, ['redis01', 'db01']),
+    ({'Environment': 'QA', 'Purpose': 'Cache'}, ['redis01']),
+    ({'Environment': 'Staging'}, [])
+])
+def test_query_eds_hosts_predicates(make_eds_workbook, predicates, hosts):
+    workbook = make_eds_workbook(
+        ['app01', '10.0.0.1', 'QA', 'Web', 'vg_root'],
+        ['app02', '10.0.0.2', 'PROD', 'Web', 'vg_root'],
+        ['redis01', '10.0.0.3', 'QA', 'Cache', 'vg_root'],
+        ['db01', '10.0.0.4', 'DEV', None, 'vg_root']
+    )
+
+    assert EDSLookup(eds_files=workbook, use_cache=False).query_eds_hosts(**predicates) == hosts
+
+
+def test_query_eds_hosts_rejects_unknown_columns(make_eds_workbook):
+    workbook = make_eds_workbook(['app01', '10.0.0.1', 'QA', 'Web', 'vg_root'])
+
+    with pytest.raises(ValueError, match="Unknown EDS column 'Colour'"):
+        EDSLookup(eds_files=workbook, use_cache=False).query_eds_hosts(Colour='red')
@@ -0,0 +1,72 @@
+"""Tests of F5 pool loading and member probing against local listeners"""
+
+import pytest
+import F5PoolValidator as f5_module
+from F5PoolValidator import F5PoolValidator
+
+
+def test_pools_are_indexed_by_vip_ltm_and_alias(f5_workbook):
+    validator = F5PoolValidator(eds_files=f5_workbook, use_cache=False)
+
+    assert [pool['name'] for pool in validator.get_f5_pools()] == ['app_pool', 'degraded_pool', 'db_pool', 'silent_pool']
+    assert [member['name'] for member in validator.get_f5_pool_members('APP.example.com')] == ['app01', 'app02', 'localhost']
+    assert validator.get_f5_pool_members('10.0.0.10') == validator.get_f5_pool_members('app_pool')
+    assert validator.get_f5_vips_for_member('app01') == ['app_pool', 'degraded_pool', 'db_pool', 'silent_pool']
+
+
+def test_healthy_pool_members_resolve_from_sheet_eds_and_dns(f5_workbook):
+    validator = F5PoolValidator(eds_files=f5_workbook, use_cache=False)
+
+    summary = validator.probe_f5_pool_members('app_pool', timeout=2)
+
+    assert summary['violations_count'] == 0 and summary['total_probes'] == 3
+    sources = {probe['member']: (probe['host'], probe['address_source']) for probe in summary['probes']}
+    assert sources == {
+        'app01': ('127.0.0.1', 'f5_sheet'),
+        'app02': ('127.0.0.1', 'eds'),
+        'localhost': ('localhost', 'dns')
+    }
+    assert all(probe['status'] == 200 for probe in summary['probes'])
+    assert summary['latency']['count'] == 3
+
+
+def test_unhealthy_members_are_reported(f5_workbook):
+    validator = F5PoolValidator(eds_files=f5_workbook, use_cache=False)
+
+    reasons = {
+        vip: validator.probe_f5_pool_members(vip, timeout=0.5)['violations'][0]['reason']
+        for vip in ('degraded_pool', 'silent_pool')
+    }
+
+    assert reasons == {'degraded_pool': "Response does not contain 'Alive'", 'silent_pool': 'Timed out after 0.5s'}
+    with pytest.raises(ValueError, match='CRITICAL: F5 pool members unhealthy'):
+        validator.probe_f5_pool_members('db_pool', timeout=0.5, fail_on_unhealthy=True)
+
+
+def test_member_addresses_follow_workbook_changes(f5_workbook, make_f5_workbook):
+    validator = F5PoolValidator(eds_files=f5_workbook, use_cache=False)
+    validator.probe_f5_pool_members('app_pool', timeout=2)
+
+    make_f5_workbook(app02_ip='127.0.0.2')
+    summary = validator.probe_f5_pool_members('app_pool', http_checks=False, timeout=2)
+
+    app02, = [probe for probe in summary['probes'] if probe['member'] == 'app02']
+    assert (app02['host'], app02['address_source'], app02['kind']) == ('127.0.0.2', 'eds', 'tcp')
+
+
+def test_workbook_without_f5_sheet_has_no_pools(make_f5_workbook):
+    workbook = make_f5_workbook(with_f5_sheet=False)
+
+    validator = F5PoolValidator(eds_files=workbook)
+
+    assert validator.get_f5_pools() == []
+    assert validator.probe_f5_pool_members()['total_probes'] == 0
+
+
+def test_unreadable_f5_sheet_fails_instead_of_loading_no_pools(f5_workbook, monkeypatch):
+    def read_sheet(path, sheet_name, columns=None, **options):
+        raise ValueError("Bad cell data")
+    monkeypatch.setattr(f5_module, 'read_sheet', read_sheet)
+
+    with pytest.raises(RuntimeError, match='Failed to load F5 sheet'):
+        F5PoolValidator(eds_files=f5_workbook, use_cache=False)
@@ -0,0 +1,132 @@
+"""Round-trip tests of the vCenter libraries against the offline vCenter stand-in"""
+
+import time
+import pytest
+import vcenter_connection
+import vcenter_inventory
+import vcenter_standin
+from VCenterAPI import VCenterAPI
+from VCenterLibrary import VCenterLibrary
+
+STANDIN = 'standin:vms=200,hosts=4,clusters=2'
+
+
+@pytest.fixture
+def api(monkeypatch):
+    monkeypatch.delenv('VCENTER_SNAPSHOT', raising=False)
+    with vcenter_standin.standin_installed():
+        api = VCenterAPI(session_cache=False)
+        api.connect_to_vcenter(STANDIN, 'administrator@vsphere.local', 'standin')
+        api.reset_vcenter_api_call_counts()
+        yield api
+        api.disconnect_from_vcenter(logout=True)
+
+
+@pytest.fixture
+def library(api):
+    library = VCenterLibrary(session_cache=False)
+    connection = library.vcenter_connect(STANDIN, 'administrator@vsphere.local', 'standin')
+    yield library, connection
+    library.vcenter_disconnect(connection, logout=True)
+
+
+def round_trips(api):
+    total = api.get_vcenter_api_call_counts()['total']
+    api.reset_vcenter_api_call_counts()
+    return total
+
+
+def test_vm_details_round_trips(api):
+    details = api.get_vm_comprehensive_details('vm00010')
+
+    assert details['name'] == 'vm00010'
+    # Build the VM name index (view, retrieval, destroy) and one retrieval for the VM and its placement
+    assert round_trips(api) == 4
+
+    assert api.get_vm_comprehensive_details('vm00011')['name'] == 'vm00011'
+    assert round_trips(api) == 1
+
+
+def test_batched_vm_details_take_one_round_trip(api):
+    details = api.get_vms_comprehensive_details(['vm00001', 'vm00002', 'vm00150'])
+
+    assert [(vm['vm_name'], vm['success'], vm['details']['name']) for vm in details] == [
+        ('vm00001', True, 'vm00001'), ('vm00002', True, 'vm00002'), ('vm00150', True, 'vm00150')
+    ]
+    assert round_trips(api) == 4
+
+    assert all(vm['success'] for vm in api.get_vms_comprehensive_details([f'vm{n:05d}' for n in range(20, 70)]))
+    assert round_trips(api) == 1
+
+
+def test_host_datastore_keywords_take_one_round_trip(api, library):
+    library, connection = library
+
+    subscription = library.vcenter_get_datastore_subscription_levels(connection, 'esx001')
+    assert subscription and any(ds['provisioned_gb'] > 0 for ds in subscription)
+    # Build the host name index, then one retrieval for the datastores and the disks on them
+    assert round_trips(api) == 4
+
+    assignments = library.vcenter_get_vm_datastore_assignments(connection, 'esx001')
+    assert assignments and all(vm['datastores'] for vm in assignments)
+    assert round_trips(api) == 1
+
+
+def test_standin_is_only_reachable_while_installed():
+    real_smart_connect = vcenter_connection.smart_connect
+
+    with vcenter_standin.standin_installed():
+        assert vcenter_connection.smart_connect is not real_smart_connect
+        with vcenter_standin.standin_installed():
+            pass
+        assert vcenter_connection.smart_connect is not real_smart_connect
+
+    assert vcenter_connection.smart_connect is real_smart_connect
+
+
+def test_compare_to_baseline_reports_round_trip_growth():
+    baseline = {'keywords': {'Connect': {'round_trips': 3}, 'Details': {'round_trips': 4}}}
+    results = {'keywords': {'Connect': {'round_trips': 3}, 'Details': {'round_trips': 9}, 'New': {'round_trips': 1}}}
+
+    assert vcenter_standin.compare_to_baseline(results, baseline) == [('Details', 4, 9)]
+
+
+def test_repeated_misses_do_not_rebuild_a_fresh_index(api, monkeypatch):
+    for _ in range(3):
+        with pytest.raises(RuntimeError, match="VM 'vm99999' not found"):
+            api.get_vm_comprehensive_details('vm99999')
+    # Build the VM name index once, then one DNS name search per miss
+    assert round_trips(api) == 3 + 3
+
+    monkeypatch.setattr(vcenter_inventory, 'MISS_REFRESH_INTERVAL', 0)
+    with pytest.raises(RuntimeError, match="VM 'vm99999' not found"):
+        api.get_vm_comprehensive_details('vm99999')
+    # An index older than the interval is rebuilt once, in case the VM was created since
+    assert round_trips(api) == 1 + 3
+
+
+def test_verified_connect_does_not_share_an_unverified_session(api):
+    verified = vcenter_connection.connect(STANDIN, 'administrator@vsphere.local', 'standin', verify_ssl='True')
+    try:
+        assert verified is not api.connection and verified.verify_ssl and not api.connection.verify_ssl
+        assert vcenter_connection.get_connection(verified.handle()) is verified
+        assert vcenter_connection.get_connection(api.connection.handle()) is api.connection
+    finally:
+        vcenter_connection.release(verified, logout=True)
+
+
+class UnreachableContent:
+    @property
+    def sessionManager(self):
+        raise ConnectionError("vCenter unreachable")
+
+
+def test_keep_alive_checks_idle_sessions_without_robot_logging(api, monkeypatch):
+    connection = api.connection
+    monkeypatch.setattr(vcenter_connection, 'warn', lambda message: pytest.fail(f"warn() called: {message}"))
+    monkeypatch.setattr(connection, 'content', UnreachableContent())
+    connection.last_used -= vcenter_connection.KEEPALIVE_INTERVAL
+
+    connection.keep_alive()
+
+    assert time.monotonic() - connection.last_used >= vcenter_connection.KEEPALIVE_INTERVAL
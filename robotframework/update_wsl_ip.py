@@ -1,10 +1,14 @@
 """
 Update EDS Excel sheet with WSL IP address for local testing
+
+Thin wrapper around eds_bulk_update, which edits the cell in place so the
+other EDS sheets and the formatting are kept.
 """
-import pandas as pd
 import sys
 import os
 
+from eds_bulk_update import apply_updates, print_summary
+
 # Set UTF-8 encoding for Windows console
 if os.name == 'nt':
     import codecs
@@ -16,59 +20,26 @@ EDS_FILE = "EDS_Itential_DRAFT_v0.01.xlsx"
 HOSTNAME = "alhxvdvitap01"
 WSL_IP = "172.30.16.186"
 
-try:
-    # Read the Excel file
-    print(f"📖 Reading {EDS_FILE}...")
-    df = pd.read_excel(EDS_FILE, sheet_name="Server Requirements")
-
-    print(f"📊 Available columns: {list(df.columns)}")
-    print(f"\n🔍 Looking for hostname: {HOSTNAME}")
-
-    # Check if hostname exists
-    if 'Server Name' in df.columns:
-        mask = df['Server Name'].astype(str) == HOSTNAME
+# Fields of the entry added when the hostname is not in the EDS yet
+NEW_HOST_DEFAULTS = {
+    'Subnet': '172.30.16.0/20',
+    'Mask': '255.255.240.0',
+    'Gateway': '172.30.16.1',
+    'CNAME': HOSTNAME,
+    'DOMAIN': 'local',
+    'OS Type': 'Linux'
+}
 
-        if mask.any():
-            # Update existing row
-            print(f"✅ Found existing entry for {HOSTNAME}")
-            current_ip = df.loc[mask, 'IP Assignment'].values[0] if 'IP Assignment' in df.columns else 'N/A'
-            print(f"📍 Current IP: {current_ip}")
-            print(f"📍 New IP: {WSL_IP}")
-
-            if 'IP Assignment' in df.columns:
-                df.loc[mask, 'IP Assignment'] = WSL_IP
-                print(f"✅ Updated IP to {WSL_IP}")
-            else:
-                print("❌ 'IP Assignment' column not found")
-                sys.exit(1)
-        else:
-            # Add new row for WSL testing
-            print(f"⚠️  Hostname {HOSTNAME} not found. Adding new entry...")
-            new_row = {
-                'Server Name': HOSTNAME,
-                'IP Assignment': WSL_IP,
-                'Subnet': '172.30.16.0/20',
-                'Mask': '255.255.240.0',
-                'Gateway': '172.30.16.1',
-                'CNAME': HOSTNAME,
-                'DOMAIN': 'local',
-                'OS Type': 'Linux'
-            }
-            # Add missing columns with empty values
-            for col in df.columns:
-                if col not in new_row:
-                    new_row[col] = ''
-
-            df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
-            print(f"✅ Added new entry for {HOSTNAME}")
-    else:
-        print("❌ 'Server Name' column not found in Excel sheet")
-        sys.exit(1)
-
-    # Save the updated Excel file
-    print(f"\n💾 Saving updated file...")
-    df.to_excel(EDS_FILE, sheet_name="Server Requirements", index=False)
-    print(f"✅ Successfully updated {EDS_FILE}")
+try:
+    print(f"🔍 Updating {HOSTNAME} in {EDS_FILE}")
+    print(f"📍 New IP: {WSL_IP}")
+    summary = apply_updates(
+        EDS_FILE,
+        {HOSTNAME: {'IP Assignment': WSL_IP}},
+        add_missing=True,
+        new_row_defaults=NEW_HOST_DEFAULTS
+    )
+    print_summary(summary)
     print(f"\n📋 Updated configuration for {HOSTNAME}:")
     print(f"   IP: {WSL_IP}")
 